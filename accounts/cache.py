@@ -0,0 +1,39 @@
+"""
+Cached lookups for accounts app.
+"""
+from django.db import transaction
+
+from qrcs_project.cache import LocalRegistry, cached_queryset, invalidate
+from .models import User
+
+ROLE_USERS_NAMESPACE = 'accounts:role_users'
+
+# The fields callers read; the rest, password hashes included, stay out of the cache.
+# Rows are cached as plain dicts: the registry shares them between threads, and
+# model instances would pick up per-request state (deferred loads, relations).
+ROLE_USER_FIELDS = ('id', 'username', 'email', 'role', 'is_available')
+
+
+def cached_role_users(role):
+    """Active users with `role` as ROLE_USER_FIELDS dicts, ordered by username, from the shared cache."""
+    return cached_queryset(
+        ROLE_USERS_NAMESPACE,
+        User.objects.filter(role=role, is_active=True).values(*ROLE_USER_FIELDS).order_by('username'),
+        role
+    )
+
+
+role_user_registry = LocalRegistry(cached_role_users)
+
+
+def get_role_users(role):
+    """Active users with `role` as ROLE_USER_FIELDS dicts, ordered by username, from the in-process registry."""
+    return role_user_registry.get(role)
+
+
+def invalidate_role_users():
+    """Drop cached role user lists after a user changes."""
+    invalidate(ROLE_USERS_NAMESPACE)
+    role_user_registry.clear()
+    # Clear again once committed, in case a concurrent read reloaded old rows
+    transaction.on_commit(role_user_registry.clear)
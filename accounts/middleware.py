@@ -0,0 +1,104 @@
+"""
+WebSocket authentication middleware for accounts app.
+"""
+import time
+from urllib.parse import parse_qs
+
+from channels.auth import AuthMiddlewareStack
+from channels.db import database_sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+User = get_user_model()
+
+# Subprotocol clients send as ['bearer', '<access token>'] when they cannot
+# put the token in the query string
+TOKEN_SUBPROTOCOL = 'bearer'
+
+# user id -> (expires_at, user), shared by all connections in this process
+_user_cache = {}
+
+
+def get_token_from_scope(scope):
+    """
+    Extract a JWT access token from a WebSocket scope.
+    
+    Returns:
+        (token, subprotocol) where subprotocol must be echoed back on accept,
+        or (None, None) if the client sent no token
+    """
+    subprotocols = scope.get('subprotocols') or []
+    if len(subprotocols) >= 2 and subprotocols[0] == TOKEN_SUBPROTOCOL:
+        return subprotocols[1], TOKEN_SUBPROTOCOL
+    
+    query = parse_qs(scope.get('query_string', b'').decode())
+    token = query.get('token')
+    if token:
+        return token[0], None
+    return None, None
+
+
+@database_sync_to_async
+def fetch_active_user(user_id):
+    """Load an active user by primary key."""
+    return User.objects.filter(pk=user_id, is_active=True).first()
+
+
+async def get_user_for_token(raw_token):
+    """
+    Resolve a JWT access token to a user.
+    
+    The signature and expiry are checked locally; the user row is cached for
+    WEBSOCKET_AUTH_CACHE_TTL seconds so reconnect storms do not hit the database.
+    """
+    try:
+        token = AccessToken(raw_token)
+    except TokenError:
+        return AnonymousUser()
+    
+    user_id = token.get(api_settings.USER_ID_CLAIM)
+    now = time.monotonic()
+    cached = _user_cache.get(user_id)
+    if cached and cached[0] > now:
+        return cached[1]
+    
+    user = await fetch_active_user(user_id)
+    if user is None:
+        return AnonymousUser()
+    
+    if len(_user_cache) >= settings.WEBSOCKET_AUTH_CACHE_SIZE:
+        for key, (expires_at, _) in list(_user_cache.items()):
+            if expires_at <= now:
+                del _user_cache[key]
+        if len(_user_cache) >= settings.WEBSOCKET_AUTH_CACHE_SIZE:
+            _user_cache.clear()
+    _user_cache[user_id] = (now + settings.WEBSOCKET_AUTH_CACHE_TTL, user)
+    return user
+
+
+class JWTAuthMiddleware:
+    """
+    Populate scope['user'] from a JWT access token.
+    
+    The token is read from the `token` query parameter or a
+    ['bearer', '<token>'] subprotocol pair. Connections without a token fall
+    back to Django session authentication.
+    """
+    
+    def __init__(self, inner):
+        self.inner = inner
+        self.session_inner = AuthMiddlewareStack(inner)
+    
+    async def __call__(self, scope, receive, send):
+        raw_token, subprotocol = get_token_from_scope(scope)
+        if raw_token is None:
+            return await self.session_inner(scope, receive, send)
+        
+        scope = dict(scope)
+        scope['user'] = await get_user_for_token(raw_token)
+        scope['auth_subprotocol'] = subprotocol
+        return await self.inner(scope, receive, send)
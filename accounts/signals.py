@@ -0,0 +1,24 @@
+"""
+Signals for accounts app.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .cache import invalidate_role_users
+from .models import User
+
+# Saves touching only these fields cannot change role membership
+IGNORED_FIELDS = {'last_login'}
+
+
+@receiver(post_save, sender=User)
+def invalidate_role_users_on_save(sender, instance, update_fields=None, **kwargs):
+    """Drop cached role lists when a user is created or changed."""
+    if update_fields and set(update_fields) <= IGNORED_FIELDS:
+        return
+    invalidate_role_users()
+
+
+@receiver(post_delete, sender=User)
+def invalidate_role_users_on_delete(sender, instance, **kwargs):
+    """Drop cached role lists when a user is deleted."""
+    invalidate_role_users()
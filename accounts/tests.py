@@ -3,6 +3,8 @@ Tests for accounts app.
 """
 from django.test import TestCase
 from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.tokens import AccessToken
+from .middleware import JWTAuthMiddleware, _user_cache
 
 User = get_user_model()
 
@@ -31,3 +33,57 @@ class UserModelTest(TestCase):
         self.assertIn('Reporter', str(self.user))
 
 
+
+
+class JWTAuthMiddlewareTest(TestCase):
+    """Test cases for WebSocket JWT authentication."""
+    
+    def setUp(self):
+        """Set up test data."""
+        _user_cache.clear()
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123',
+            role='responder'
+        )
+        self.token = str(AccessToken.for_user(self.user))
+        self.scopes = []
+        
+        async def inner(scope, receive, send):
+            self.scopes.append(scope)
+        
+        self.middleware = JWTAuthMiddleware(inner)
+    
+    async def connect(self, query_string=b'', subprotocols=None):
+        """Run the middleware for a WebSocket scope and return the inner scope."""
+        await self.middleware({
+            'type': 'websocket',
+            'query_string': query_string,
+            'subprotocols': subprotocols or [],
+            'headers': [],
+        }, None, None)
+        return self.scopes[-1]
+    
+    async def test_query_string_token(self):
+        """Test a valid token in the query string authenticates the user."""
+        scope = await self.connect(query_string=f'token={self.token}'.encode())
+        self.assertEqual(scope['user'].pk, self.user.pk)
+        self.assertIsNone(scope['auth_subprotocol'])
+    
+    async def test_subprotocol_token(self):
+        """Test a bearer subprotocol token authenticates the user."""
+        scope = await self.connect(subprotocols=['bearer', self.token])
+        self.assertEqual(scope['user'].pk, self.user.pk)
+        self.assertEqual(scope['auth_subprotocol'], 'bearer')
+    
+    async def test_invalid_token(self):
+        """Test a tampered token is rejected."""
+        scope = await self.connect(query_string=f'token={self.token}x'.encode())
+        self.assertFalse(scope['user'].is_authenticated)
+    
+    async def test_user_lookup_is_cached(self):
+        """Test reconnects reuse the cached user instead of querying."""
+        await self.connect(query_string=f'token={self.token}'.encode())
+        await User.objects.filter(pk=self.user.pk).adelete()
+        scope = await self.connect(query_string=f'token={self.token}'.encode())
+        self.assertEqual(scope['user'].pk, self.user.pk)
@@ -16,6 +16,7 @@ class UserViewSet(viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
+    read_replica = True
     
     def get_queryset(self):
         """Filter queryset based on user role."""
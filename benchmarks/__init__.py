@@ -0,0 +1,3 @@
+"""
+Load and micro benchmarks for QRCS. Run modules with `python -m benchmarks.<name>`.
+"""
@@ -0,0 +1,105 @@
+"""
+Concurrency benchmark: DRF read endpoints versus their native async versions.
+
+Drives a running ASGI server (daphne, with data from
+`manage.py generate_synthetic_data`) with each sync/async endpoint pair at
+increasing concurrency and reports throughput, p50/p99 latency and errors
+side by side. Under ASGI a sync view occupies a thread of its own for the
+whole request, including authentication, serialization and rendering; an
+async view only hands work to a thread while an ORM query or filter
+validation runs, so the gap
+grows with concurrency.
+
+    daphne qrcs_project.asgi:application
+    python -m benchmarks.async_views --base-url http://127.0.0.1:8000 \\
+        --username syn_admin_0 --password benchmark123 --requests 400 --concurrency 1,8,32,64
+"""
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.http_load import Client, percentile
+
+PAIRS = {
+    # name: (sync path, async path)
+    'list': ('/api/incidents/', '/api/async/incidents/'),
+    'detail': ('/api/incidents/{incident}/', '/api/async/incidents/{incident}/'),
+    'nearby': (
+        '/api/incidents/nearby/?lat={lat}&lng={lng}&radius=2',
+        '/api/async/incidents/nearby/?lat={lat}&lng={lng}&radius=2',
+    ),
+    'unread_count': ('/api/notifications/unread_count/', '/api/async/notifications/unread_count/'),
+    'dashboard': ('/api/dashboard/stats/', '/api/async/dashboard/stats/'),
+}
+
+
+def run(client, path, requests, concurrency):
+    """GET `path` `requests` times with `concurrency` workers and summarise."""
+    def call(_):
+        started = time.perf_counter()
+        status, _ = client.request('GET', path)
+        return time.perf_counter() - started, status
+    
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(call, range(requests)))
+    elapsed = time.perf_counter() - started
+    latencies = [seconds for seconds, _ in results]
+    return {
+        'throughput': len(results) / elapsed,
+        'p50_ms': percentile(latencies, 0.5) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'errors': sum(1 for _, status in results if status >= 400),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+    parser.add_argument('--username', default='syn_admin_0')
+    parser.add_argument('--password', default='benchmark123')
+    parser.add_argument('--requests', type=int, default=400, help='Requests per endpoint and concurrency level')
+    parser.add_argument('--concurrency', default='1,8,32,64', help='Comma-separated concurrency levels')
+    parser.add_argument('--pairs', default=','.join(PAIRS), help='Comma-separated endpoint pairs')
+    parser.add_argument('--lat', type=float, default=40.7128, help='Latitude for the nearby pair')
+    parser.add_argument('--lng', type=float, default=-74.0060, help='Longitude for the nearby pair')
+    parser.add_argument('--save', help='Write results to this JSON file')
+    args = parser.parse_args(argv)
+    
+    names = [name.strip() for name in args.pairs.split(',') if name.strip()]
+    unknown = set(names) - set(PAIRS)
+    if unknown:
+        parser.error(f"unknown pairs: {', '.join(sorted(unknown))}")
+    levels = [int(level) for level in args.concurrency.split(',') if level.strip()]
+    
+    client = Client(args.base_url)
+    client.login(args.username, args.password)
+    status, body = client.request('GET', '/api/incidents/')
+    rows = json.loads(body).get('results', []) if status == 200 else []
+    if not rows:
+        raise SystemExit('No incidents visible to this user; run generate_synthetic_data first')
+    params = {'incident': rows[0]['id'], 'lat': args.lat, 'lng': args.lng}
+    
+    results = {}
+    print(f"{'pair':<14}{'conc':>6}{'sync req/s':>12}{'async req/s':>13}{'speedup':>9}"
+          f"{'sync p99':>10}{'async p99':>11}{'errors':>9}")
+    for name in names:
+        sync_path, async_path = (path.format(**params) for path in PAIRS[name])
+        for level in levels:
+            sync = run(client, sync_path, args.requests, level)
+            native = run(client, async_path, args.requests, level)
+            results[f'{name}@{level}'] = {'sync': sync, 'async': native}
+            print(
+                f"{name:<14}{level:>6}{sync['throughput']:>12.1f}{native['throughput']:>13.1f}"
+                f"{native['throughput'] / sync['throughput']:>8.2f}x"
+                f"{sync['p99_ms']:>10.1f}{native['p99_ms']:>11.1f}"
+                f"{sync['errors'] + native['errors']:>9}"
+            )
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
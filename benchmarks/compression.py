@@ -0,0 +1,77 @@
+"""
+Response compression benchmark: sizes, compression cost and transfer time.
+
+Takes real API payloads (see benchmarks.json_rendering) and the HTML
+incident pages from the local database (fill it with
+`manage.py generate_synthetic_data` first) and reports, per payload and
+coding, the body size, the time CompressionMiddleware spends compressing
+it, and the estimated time to deliver it over a slow link, e.g. a
+responder's cellular connection. brotli is included when installed.
+
+    python -m benchmarks.compression --kbps 1000
+"""
+import argparse
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import Client
+
+from benchmarks.json_rendering import payloads  # sets up Django
+from qrcs_project.compression import ENCODINGS, compress
+from qrcs_project.renderers import JSONRenderer
+
+User = get_user_model()
+
+
+def bodies(username):
+    """Uncompressed response bodies, by name."""
+    renderer = JSONRenderer()
+    result = {name: renderer.render(data) for name, data in payloads(username).items()}
+    client = Client(HTTP_HOST='localhost')
+    client.force_login(User.objects.get(username=username))
+    for name, path in [('home page (html)', '/'), ('my incidents (html)', '/my-incidents/')]:
+        response = client.get(path)
+        assert response.status_code == 200, (path, response.status_code)
+        result[name] = response.content
+    return result
+
+
+def per_call(function, repeat):
+    """Best-of-five mean seconds per call of `function` over `repeat` calls."""
+    best = float('inf')
+    for _ in range(5):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            function()
+        best = min(best, (time.perf_counter() - started) / repeat)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--username', default='syn_admin_0')
+    parser.add_argument('--kbps', type=float, default=1000, help='Link speed in kilobits per second')
+    parser.add_argument('--repeat', type=int, default=50, help='Calls per timing run')
+    args = parser.parse_args(argv)
+    
+    def transfer_ms(size):
+        return size * 8 / args.kbps
+    
+    print(f'Link: {args.kbps:g} kbit/s; brotli quality {settings.COMPRESSION_BROTLI_QUALITY}')
+    print(f"{'payload':<21}{'coding':>8}{'KiB':>8}{'ratio':>7}{'cpu ms':>8}{'transfer ms':>13}{'x':>6}")
+    for name, body in bodies(args.username).items():
+        plain_ms = transfer_ms(len(body))
+        print(f"{name:<21}{'none':>8}{len(body) / 1024:>8.1f}{1:>7.1f}{0:>8.2f}{plain_ms:>13.1f}{1:>6.1f}")
+        for coding in ENCODINGS:
+            size = len(compress(body, coding, settings.COMPRESSION_BROTLI_QUALITY))
+            cpu_ms = per_call(lambda: compress(body, coding, settings.COMPRESSION_BROTLI_QUALITY), args.repeat) * 1000
+            total_ms = transfer_ms(size) + cpu_ms
+            print(
+                f'{"":<21}{coding:>8}{size / 1024:>8.1f}{len(body) / size:>7.1f}{cpu_ms:>8.2f}'
+                f'{total_ms:>13.1f}{plain_ms / total_ms:>6.1f}'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+"""
+Connection-setup benchmark: per-request connections versus persistent ones.
+
+Each simulated request sends request_started, runs a few queries and sends
+request_finished, exactly as Django's handlers do, so connections are
+closed or kept according to CONN_MAX_AGE. Requests run under two execution
+models:
+
+- threads: a fixed pool of ASGI_THREADS workers, as in WSGI workers,
+  Celery and Channels consumers;
+- asgi: one ThreadSensitiveContext per request, as Django's ASGI handler
+  does, which gives every request a fresh thread.
+
+Reports throughput, latency and how many connections were opened. Point it
+at PostgreSQL (DB_ENGINE=postgresql ...) to see realistic setup costs;
+SQLite connections are nearly free to open. Run it once against PostgreSQL
+and once against PgBouncer (DB_HOST=pgbouncer DB_PORT=6432 DB_PGBOUNCER=1)
+to compare the asgi per-request mode, which is what the web service uses,
+with and without the pool.
+
+    python -m benchmarks.db_connections --requests 2000 --threads 16 --queries 3
+"""
+import argparse
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import django
+from asgiref.sync import ThreadSensitiveContext, sync_to_async
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'qrcs_project.settings')
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.core.signals import request_finished, request_started  # noqa: E402
+from django.db import connection, connections  # noqa: E402
+from django.db.backends.signals import connection_created  # noqa: E402
+
+
+class ConnectionCounter:
+    """Count connections opened through Django, from any thread."""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.count = 0
+    
+    def __call__(self, sender, connection, **kwargs):
+        with self.lock:
+            self.count += 1
+
+
+def handle_request(queries):
+    """Run one simulated request and return its latency in seconds."""
+    started = time.perf_counter()
+    request_started.send(sender=None)
+    try:
+        with connection.cursor() as cursor:
+            for _ in range(queries):
+                cursor.execute('SELECT 1')
+                cursor.fetchone()
+    finally:
+        request_finished.send(sender=None)
+    return time.perf_counter() - started
+
+
+def close_thread_connection(barrier):
+    """Close the calling thread's connection once every worker has one call."""
+    connection.close()
+    try:
+        barrier.wait(timeout=5)
+    except threading.BrokenBarrierError:
+        pass
+
+
+def run_threads(requests, threads, queries):
+    """Serve requests from a fixed thread pool; return latencies."""
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        latencies = list(pool.map(lambda _: handle_request(queries), range(requests)))
+        barrier = threading.Barrier(threads)
+        list(pool.map(close_thread_connection, [barrier] * threads))
+    return latencies
+
+
+def run_asgi(requests, threads, queries):
+    """Serve requests the way Django's ASGI handler does; return latencies."""
+    async def serve(semaphore):
+        async with semaphore, ThreadSensitiveContext():
+            return await sync_to_async(handle_request)(queries)
+    
+    async def serve_all():
+        semaphore = asyncio.Semaphore(threads)
+        return await asyncio.gather(*(serve(semaphore) for _ in range(requests)))
+    
+    return asyncio.run(serve_all())
+
+
+MODELS = {'threads': run_threads, 'asgi': run_asgi}
+
+
+def run_mode(model, max_age, health_checks, requests, threads, queries):
+    """Run `requests` simulated requests with the given connection settings."""
+    database = connections.settings['default']
+    database['CONN_MAX_AGE'] = max_age
+    database['CONN_HEALTH_CHECKS'] = health_checks
+    counter = ConnectionCounter()
+    connection_created.connect(counter)
+    try:
+        started = time.perf_counter()
+        latencies = sorted(MODELS[model](requests, threads, queries))
+        elapsed = time.perf_counter() - started
+    finally:
+        connection_created.disconnect(counter)
+    return {
+        'throughput': requests / elapsed,
+        'p50_ms': latencies[len(latencies) // 2] * 1000,
+        'p99_ms': latencies[min(int(len(latencies) * 0.99), len(latencies) - 1)] * 1000,
+        'connections': counter.count,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--threads', type=int, default=settings.ASGI_THREADS,
+                        help='Worker threads, or concurrent ASGI requests; defaults to ASGI_THREADS')
+    parser.add_argument('--queries', type=int, default=3, help='Queries per request')
+    parser.add_argument('--max-age', type=int, default=settings.DB_CONN_MAX_AGE or 60,
+                        help='CONN_MAX_AGE for the persistent modes')
+    parser.add_argument('--models', default=','.join(MODELS), help='Comma-separated execution models')
+    args = parser.parse_args(argv)
+    
+    models = [name.strip() for name in args.models.split(',') if name.strip()]
+    unknown = set(models) - set(MODELS)
+    if unknown:
+        parser.error(f"unknown models: {', '.join(sorted(unknown))}")
+    
+    print(f"{connections.settings['default']['ENGINE']}: "
+          f"{args.requests} requests, {args.threads} threads, {args.queries} queries each")
+    print(f"{'model':<10}{'mode':<20}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'connections':>14}")
+    modes = [
+        ('per-request', 0, False),
+        ('persistent', args.max_age, False),
+        ('persistent+health', args.max_age, True),
+    ]
+    for model in models:
+        for label, max_age, health_checks in modes:
+            result = run_mode(model, max_age, health_checks, args.requests, args.threads, args.queries)
+            print(
+                f"{model:<10}{label:<20}{result['throughput']:>10.1f}{result['p50_ms']:>10.2f}"
+                f"{result['p99_ms']:>10.2f}{result['connections']:>14}"
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,199 @@
+"""
+HTTP load benchmark for the main QRCS endpoints.
+
+Drives a running server (e.g. after `manage.py generate_synthetic_data`)
+and reports throughput, p50/p99 latency and average DB queries per request
+for each scenario. Query counts come from the server's /metrics endpoint,
+so run the benchmark from an address in METRICS_ALLOWED_IPS.
+
+    python -m benchmarks.http_load --base-url http://127.0.0.1:8000 \\
+        --username syn_admin_0 --password benchmark123 --requests 200 --concurrency 8 \\
+        --save baseline.json
+    python -m benchmarks.http_load ... --compare baseline.json
+"""
+import argparse
+import json
+import random
+import re
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+SCENARIOS = {
+    # name: (method, path, metrics view label)
+    'list': ('GET', '/api/incidents/', 'incident-list'),
+    'search': ('GET', '/api/incidents/?search=fire', 'incident-list'),
+    'nearby': ('GET', '/api/incidents/nearby/?lat={lat}&lng={lng}&radius=2', 'incident-nearby'),
+    'dashboard': ('GET', '/api/dashboard/stats/', 'dashboard-stats'),
+    'notifications': ('GET', '/api/notifications/', 'notification-list'),
+    'assign': ('POST', '/api/response-teams/', 'response-team-list'),
+}
+
+METRIC_LINE = re.compile(r'^qrcs_request_db_queries_(sum|count)\{view="([^"]*)",method="([^"]*)"\} (\S+)$')
+
+
+class Client:
+    """Minimal JSON client authenticated with a JWT access token."""
+    
+    def __init__(self, base_url, timeout=30):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.token = None
+    
+    def request(self, method, path, data=None):
+        """Send a request and return (status, body bytes)."""
+        body = json.dumps(data).encode() if data is not None else None
+        request = urllib.request.Request(self.base_url + path, data=body, method=method)
+        request.add_header('Content-Type', 'application/json')
+        if self.token:
+            request.add_header('Authorization', f'Bearer {self.token}')
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read()
+    
+    def login(self, username, password):
+        """Obtain an access token, exiting if the credentials are rejected."""
+        status, body = self.request('POST', '/api/auth/login/', {'username': username, 'password': password})
+        if status != 200:
+            sys.exit(f'Login failed ({status}): {body[:200]!r}')
+        self.token = json.loads(body)['access']
+    
+    def query_totals(self):
+        """Return {(view, method): [query_sum, request_count]} from /metrics, or None."""
+        status, body = self.request('GET', '/metrics')
+        if status != 200:
+            return None
+        totals = {}
+        for line in body.decode().splitlines():
+            match = METRIC_LINE.match(line)
+            if match:
+                kind, view, method, value = match.groups()
+                totals.setdefault((view, method), [0.0, 0.0])[0 if kind == 'sum' else 1] = float(value)
+        return totals
+
+
+def assignment_payloads(client, count):
+    """Build distinct (incident, responder) pairs from reported incidents and active responders."""
+    status, body = client.request('GET', '/api/incidents/?status=reported')
+    incidents = [row['id'] for row in json.loads(body).get('results', [])] if status == 200 else []
+    status, body = client.request('GET', '/api/response-teams/')
+    teams = json.loads(body).get('results', []) if status == 200 else []
+    responders = sorted({row['responder'] for row in teams})
+    pairs = [{'incident': i, 'responder': r} for i in incidents for r in responders]
+    random.shuffle(pairs)
+    return pairs[:count]
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+def run_scenario(client, name, requests, concurrency, lat, lng):
+    """Run one scenario and return its summary, or None if it could not run."""
+    method, path, view = SCENARIOS[name]
+    path = path.format(lat=lat, lng=lng)
+    payloads = [None] * requests
+    if name == 'assign':
+        payloads = assignment_payloads(client, requests)
+        if not payloads:
+            return None
+    
+    def call(payload):
+        started = time.perf_counter()
+        status, _ = client.request(method, path, payload)
+        return time.perf_counter() - started, status
+    
+    before = client.query_totals()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(call, payloads))
+    elapsed = time.perf_counter() - started
+    after = client.query_totals()
+    
+    latencies = [seconds for seconds, _ in results]
+    errors = sum(1 for _, status in results if status >= 400)
+    queries = None
+    if before is not None and after is not None:
+        sum_after, count_after = after.get((view, method), (0, 0))
+        sum_before, count_before = before.get((view, method), (0, 0))
+        if count_after > count_before:
+            queries = (sum_after - sum_before) / (count_after - count_before)
+    return {
+        'requests': len(results),
+        'errors': errors,
+        'throughput': len(results) / elapsed,
+        'p50_ms': percentile(latencies, 0.5) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'queries': queries,
+    }
+
+
+def format_change(current, baseline, key):
+    """Format the relative change of `key` against a baseline result."""
+    if baseline is None or baseline.get(key) in (None, 0) or current.get(key) is None:
+        return ''
+    return f' ({(current[key] - baseline[key]) / baseline[key] * 100:+.0f}%)'
+
+
+def report(results, baseline):
+    """Print a results table, with changes against the baseline if given."""
+    print(f"{'scenario':<14}{'reqs':>6}{'errors':>8}{'req/s':>16}{'p50 ms':>16}{'p99 ms':>16}{'queries':>14}")
+    for name, result in results.items():
+        if result is None:
+            print(f'{name:<14}  skipped (no reported incidents or responders to assign)')
+            continue
+        base = (baseline or {}).get(name)
+        queries = f"{result['queries']:.1f}" if result['queries'] is not None else 'n/a'
+        print(
+            f"{name:<14}{result['requests']:>6}{result['errors']:>8}"
+            f"{result['throughput']:>9.1f}{format_change(result, base, 'throughput'):>7}"
+            f"{result['p50_ms']:>9.1f}{format_change(result, base, 'p50_ms'):>7}"
+            f"{result['p99_ms']:>9.1f}{format_change(result, base, 'p99_ms'):>7}"
+            f"{queries:>7}{format_change(result, base, 'queries'):>7}"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+    parser.add_argument('--username', default='syn_admin_0')
+    parser.add_argument('--password', default='benchmark123')
+    parser.add_argument('--requests', type=int, default=200, help='Requests per scenario')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS), help='Comma-separated scenario names')
+    parser.add_argument('--lat', type=float, default=40.7128, help='Latitude for the nearby scenario')
+    parser.add_argument('--lng', type=float, default=-74.0060, help='Longitude for the nearby scenario')
+    parser.add_argument('--save', help='Write results to this JSON file')
+    parser.add_argument('--compare', help='Show changes against results saved with --save')
+    args = parser.parse_args(argv)
+    
+    names = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    unknown = set(names) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    
+    client = Client(args.base_url)
+    client.login(args.username, args.password)
+    results = {
+        name: run_scenario(client, name, args.requests, args.concurrency, args.lat, args.lng)
+        for name in names
+    }
+    
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    report(results, baseline)
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
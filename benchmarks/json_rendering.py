@@ -0,0 +1,108 @@
+"""
+JSON rendering and parsing benchmark: DRF's stdlib json versus orjson.
+
+Builds real API payloads from the local database (fill it with
+`manage.py generate_synthetic_data` first): an incident list page, an
+incident detail, a notification page and the dashboard stats, all for an
+admin. Each payload is rendered and parsed with DRF's JSONRenderer and
+JSONParser and with qrcs_project's orjson-backed ones, checking both
+produce the same bytes, and the per-call times are reported side by side.
+
+    python manage.py generate_synthetic_data --incidents 20000
+    python -m benchmarks.json_rendering --page-size 100 --repeat 200
+"""
+import argparse
+import os
+import time
+from io import BytesIO
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'qrcs_project.settings')
+django.setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from rest_framework import parsers, renderers  # noqa: E402
+from rest_framework.pagination import PageNumberPagination  # noqa: E402
+from rest_framework.test import APIRequestFactory, force_authenticate  # noqa: E402
+
+from dashboard.views import DashboardStatsView  # noqa: E402
+from incidents.views import IncidentViewSet  # noqa: E402
+from notifications.models import Notification  # noqa: E402
+from notifications.views import NotificationViewSet  # noqa: E402
+from qrcs_project.parsers import JSONParser  # noqa: E402
+from qrcs_project.renderers import JSONRenderer, orjson  # noqa: E402
+
+User = get_user_model()
+
+
+def response_data(view, user, path, **kwargs):
+    """Run `view` for a GET of `path` as `user` and return the unrendered data."""
+    request = APIRequestFactory().get(path, HTTP_HOST='localhost')
+    force_authenticate(request, user)
+    response = view(request, **kwargs)
+    assert response.status_code == 200, (path, response.status_code)
+    return response.data
+
+
+def payloads(username):
+    """Real API payloads, by name."""
+    admin = User.objects.get(username=username)
+    incident = IncidentViewSet.queryset.order_by('-created_at').values_list('pk', flat=True).first()
+    recipient = User.objects.get(pk=Notification.objects.values_list('recipient', flat=True).first())
+    return {
+        'incident list': response_data(IncidentViewSet.as_view({'get': 'list'}), admin, '/api/incidents/'),
+        'incident detail': response_data(
+            IncidentViewSet.as_view({'get': 'retrieve'}), admin, f'/api/incidents/{incident}/', pk=incident
+        ),
+        'notification list': response_data(
+            NotificationViewSet.as_view({'get': 'list'}), recipient, '/api/notifications/'
+        ),
+        'dashboard stats': response_data(DashboardStatsView.as_view(), admin, '/api/dashboard/stats/'),
+    }
+
+
+def per_call(function, repeat):
+    """Best-of-five mean seconds per call of `function` over `repeat` calls."""
+    best = float('inf')
+    for _ in range(5):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            function()
+        best = min(best, (time.perf_counter() - started) / repeat)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--username', default='syn_admin_0')
+    parser.add_argument('--page-size', type=int, default=100, help='Items per list page')
+    parser.add_argument('--repeat', type=int, default=200, help='Calls per timing run')
+    args = parser.parse_args(argv)
+    
+    if orjson is None:
+        print('orjson is not installed; both columns use the stdlib json module')
+    PageNumberPagination.page_size = args.page_size
+    stdlib_renderer, fast_renderer = renderers.JSONRenderer(), JSONRenderer()
+    stdlib_parser, fast_parser = parsers.JSONParser(), JSONParser()
+    
+    print(f"{'payload':<19}{'KiB':>7}{'render us':>11}{'orjson us':>11}{'x':>6}"
+          f"{'parse us':>10}{'orjson us':>11}{'x':>6}")
+    for name, data in payloads(args.username).items():
+        body = stdlib_renderer.render(data)
+        assert fast_renderer.render(data) == body, f'{name}: renderers disagree'
+        timings = [
+            per_call(lambda: stdlib_renderer.render(data), args.repeat),
+            per_call(lambda: fast_renderer.render(data), args.repeat),
+            per_call(lambda: stdlib_parser.parse(BytesIO(body)), args.repeat),
+            per_call(lambda: fast_parser.parse(BytesIO(body)), args.repeat),
+        ]
+        render, fast_render, parse, fast_parse = (seconds * 1e6 for seconds in timings)
+        print(
+            f'{name:<19}{len(body) / 1024:>7.1f}{render:>11.1f}{fast_render:>11.1f}{render / fast_render:>6.1f}'
+            f'{parse:>10.1f}{fast_parse:>11.1f}{parse / fast_parse:>6.1f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+"""
+SQLite write-concurrency benchmark: Django's stock backend versus the tuned one.
+
+Runs writer threads that each commit transactions which read and then write,
+like creating an incident or a response log, while reader threads query the
+same table. Every mode uses a fresh database file, and reports committed
+transactions per second, lock errors, p50/p99 commit latency and reader
+throughput. With the stock backend, deferred transactions fail their lock
+upgrade with "database is locked" as soon as writers overlap; the tuned
+backend queues them instead.
+
+    python -m benchmarks.sqlite_writes --writers 8 --transactions 200 --readers 2
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+import django
+from django.conf import settings
+
+from qrcs_project.settings import sqlite_database
+
+MODES = ['stock', 'tuned']
+
+
+def configure(directory):
+    """Configure Django with one database per mode inside `directory`."""
+    settings.configure(
+        DATABASES={
+            'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': os.path.join(directory, 'default.sqlite3')},
+            'stock': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': os.path.join(directory, 'stock.sqlite3')},
+            'tuned': sqlite_database(os.path.join(directory, 'tuned.sqlite3')),
+        },
+        USE_TZ=True,
+    )
+    django.setup()
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile, or 0 for an empty list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+def writer(alias, transactions, results):
+    """Commit `transactions` read-then-write transactions, recording latencies and errors."""
+    from django.db import OperationalError, connections, transaction
+    
+    latencies, errors = [], 0
+    name = threading.current_thread().name
+    for n in range(transactions):
+        started = time.perf_counter()
+        try:
+            with transaction.atomic(using=alias):
+                with connections[alias].cursor() as cursor:
+                    cursor.execute('SELECT COUNT(*) FROM events WHERE source = %s', [name])
+                    cursor.fetchone()
+                    cursor.execute('INSERT INTO events (source, seq, body) VALUES (%s, %s, %s)', [name, n, 'x' * 200])
+            latencies.append(time.perf_counter() - started)
+        except OperationalError:
+            errors += 1
+    connections[alias].close()
+    results.append((latencies, errors))
+
+
+def reader(alias, stop, counts):
+    """Run small queries until `stop` is set, counting them."""
+    from django.db import OperationalError, connections
+    
+    done = 0
+    while not stop.is_set():
+        try:
+            with connections[alias].cursor() as cursor:
+                cursor.execute('SELECT source, COUNT(*) FROM events GROUP BY source')
+                cursor.fetchall()
+            done += 1
+        except OperationalError:
+            pass
+    connections[alias].close()
+    counts.append(done)
+
+
+def run_mode(alias, writers, transactions, readers):
+    """Run the workload against `alias` and summarise it."""
+    from django.db import connections
+    
+    with connections[alias].cursor() as cursor:
+        cursor.execute(
+            'CREATE TABLE events (id INTEGER PRIMARY KEY, source TEXT, seq INTEGER, body TEXT)'
+        )
+        cursor.execute('CREATE INDEX events_source ON events (source)')
+        cursor.execute('PRAGMA journal_mode')
+        journal_mode = cursor.fetchone()[0]
+    connections[alias].close()
+    
+    results, reads, stop = [], [], threading.Event()
+    reader_threads = [threading.Thread(target=reader, args=(alias, stop, reads)) for _ in range(readers)]
+    writer_threads = [
+        threading.Thread(target=writer, args=(alias, transactions, results), name=f'writer-{i}')
+        for i in range(writers)
+    ]
+    for thread in reader_threads:
+        thread.start()
+    started = time.perf_counter()
+    for thread in writer_threads:
+        thread.start()
+    for thread in writer_threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    stop.set()
+    for thread in reader_threads:
+        thread.join()
+    
+    latencies = [seconds for thread_latencies, _ in results for seconds in thread_latencies]
+    return {
+        'journal_mode': journal_mode,
+        'committed': len(latencies),
+        'errors': sum(errors for _, errors in results),
+        'throughput': len(latencies) / elapsed,
+        'p50_ms': percentile(latencies, 0.5) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'reads': sum(reads) / elapsed,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--writers', type=int, default=8)
+    parser.add_argument('--transactions', type=int, default=200, help='Transactions per writer')
+    parser.add_argument('--readers', type=int, default=2)
+    args = parser.parse_args(argv)
+    
+    with tempfile.TemporaryDirectory() as directory:
+        configure(directory)
+        print(f'{args.writers} writers x {args.transactions} transactions, {args.readers} readers')
+        print(f"{'mode':<8}{'journal':>9}{'committed':>11}{'errors':>8}{'tx/s':>9}"
+              f"{'p50 ms':>9}{'p99 ms':>9}{'reads/s':>10}")
+        for alias in MODES:
+            result = run_mode(alias, args.writers, args.transactions, args.readers)
+            print(
+                f"{alias:<8}{result['journal_mode']:>9}{result['committed']:>11}{result['errors']:>8}"
+                f"{result['throughput']:>9.1f}{result['p50_ms']:>9.2f}{result['p99_ms']:>9.2f}"
+                f"{result['reads']:>10.1f}"
+            )
+
+
+if __name__ == '__main__':
+    main()
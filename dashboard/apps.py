@@ -4,5 +4,9 @@ from django.apps import AppConfig
 class DashboardConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'dashboard'
+    
+    def ready(self):
+        """Import signals when app is ready."""
+        import dashboard.signals  # noqa
 
 
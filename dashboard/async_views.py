@@ -0,0 +1,33 @@
+"""
+Async read views for dashboard app.
+"""
+from asgiref.sync import sync_to_async
+from django.db.models import Count, Q
+
+from notifications.models import Notification
+from qrcs_project.async_api import async_api_view, render
+from .cache import acached_notification_stats, acached_stats
+from .views import DashboardStatsView
+
+
+@async_api_view
+async def dashboard_stats(request):
+    """
+    Get dashboard statistics, as GET /api/dashboard/stats/ does.
+    
+    Entries are shared with the sync view. Cache hits and notification
+    counts are served asynchronously; a stats miss runs the sync
+    computation, which spans several rollup helpers, in a thread.
+    """
+    user = request.user
+    stats = await acached_stats(
+        'stats', user, [], lambda: sync_to_async(DashboardStatsView().get_scope_stats)(user)
+    )
+    stats['notifications'] = await acached_notification_stats(
+        user,
+        lambda: Notification.objects.filter(recipient=user).aaggregate(
+            unread_count=Count('id', filter=Q(is_read=False)),
+            total_count=Count('id'),
+        )
+    )
+    return render(stats)
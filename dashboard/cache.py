@@ -0,0 +1,70 @@
+"""
+Response caching for dashboard app.
+
+Cached statistics live in versioned namespaces (see qrcs_project.cache) that
+signal handlers bump on every incident, response or notification write.
+Recomputation is single-flight: when an entry is missing, one request
+computes it while concurrent requests wait for the result.
+"""
+from django.conf import settings
+
+from qrcs_project import cache as shared_cache
+from qrcs_project.cache import aversioned_key, versioned_key
+
+STATS_NAMESPACE = 'dashboard'
+NOTIFICATIONS_NAMESPACE = 'dashboard:notifications:{user_id}'
+
+
+def bump_stats_version():
+    """Invalidate cached incident and response statistics."""
+    shared_cache.invalidate(STATS_NAMESPACE)
+
+
+def bump_notifications_version(user_id):
+    """Invalidate cached notification counts for a user."""
+    shared_cache.invalidate(NOTIFICATIONS_NAMESPACE.format(user_id=user_id))
+
+
+def scope_key(user):
+    """Cache scope for a user: admins share one scope, others are per user."""
+    if user.role == 'admin':
+        return 'admin'
+    return f'{user.role}:{user.id}'
+
+
+def get_or_compute(key, compute):
+    """
+    Return the cached value for `key`, computing it at most once across concurrent callers.
+    
+    DASHBOARD_CACHE_TIMEOUT of 0 disables caching.
+    """
+    return shared_cache.get_or_compute(
+        key, compute, settings.DASHBOARD_CACHE_TIMEOUT, settings.DASHBOARD_CACHE_WAIT
+    )
+
+
+def cached_stats(name, user, params, compute):
+    """Cache incident/response statistics for a user's scope and request parameters."""
+    return get_or_compute(versioned_key(STATS_NAMESPACE, name, scope_key(user), *params), compute)
+
+
+def cached_notification_stats(user, compute):
+    """Cache notification counts for a single user."""
+    return get_or_compute(versioned_key(NOTIFICATIONS_NAMESPACE.format(user_id=user.id)), compute)
+
+
+async def aget_or_compute(key, compute):
+    """Async get_or_compute(); `compute` returns an awaitable."""
+    return await shared_cache.aget_or_compute(
+        key, compute, settings.DASHBOARD_CACHE_TIMEOUT, settings.DASHBOARD_CACHE_WAIT
+    )
+
+
+async def acached_stats(name, user, params, compute):
+    """Async cached_stats(), sharing entries with the sync views."""
+    return await aget_or_compute(await aversioned_key(STATS_NAMESPACE, name, scope_key(user), *params), compute)
+
+
+async def acached_notification_stats(user, compute):
+    """Async cached_notification_stats(), sharing entries with the sync views."""
+    return await aget_or_compute(await aversioned_key(NOTIFICATIONS_NAMESPACE.format(user_id=user.id)), compute)
@@ -0,0 +1,82 @@
+"""
+WebSocket consumers for dashboard app.
+"""
+import asyncio
+import json
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncWebsocketConsumer
+from django.core.serializers.json import DjangoJSONEncoder
+
+from notifications.consumers import BufferedSendMixin
+from .utils import DASHBOARD_GROUP, adelta_sequence, advertise_viewers, keep_advertising_viewers
+from .views import get_dashboard_stats
+
+
+class DashboardConsumer(BufferedSendMixin, AsyncWebsocketConsumer):
+    """
+    WebSocket consumer for live admin dashboards.
+    
+    Sends a 'snapshot' frame with the dashboard statistics on connect (or when
+    the client sends {"type": "snapshot"}), then 'delta' frames such as
+    {"by_status.reported": 1, "overview.total_incidents": 1} as incidents change.
+    
+    Snapshots carry the sequence number of the latest delta they include
+    as 'version'; deltas up to it are dropped, so none is counted twice.
+    """
+    single_message_type = 'delta'
+    batch_message_type = 'delta'
+    snapshot_seq = 0
+    advertise_task = None
+    
+    async def connect(self):
+        """Handle WebSocket connection."""
+        self.init_send_buffer()
+        self.user = self.scope["user"]
+        if self.user.is_authenticated and self.user.role == 'admin':
+            # Start receiving deltas before the snapshot, so none falls between them
+            await advertise_viewers()
+            self.advertise_task = asyncio.ensure_future(keep_advertising_viewers())
+            await self.channel_layer.group_add(DASHBOARD_GROUP, self.channel_name)
+            await self.accept(self.scope.get('auth_subprotocol'))
+            await self.send_snapshot()
+        else:
+            await self.close()
+    
+    async def disconnect(self, close_code):
+        """Handle WebSocket disconnection."""
+        self.cancel_send_buffer()
+        if self.advertise_task is not None:
+            self.advertise_task.cancel()
+        await self.channel_layer.group_discard(DASHBOARD_GROUP, self.channel_name)
+    
+    async def receive(self, text_data):
+        """Handle incoming WebSocket messages."""
+        try:
+            data = json.loads(text_data)
+        except json.JSONDecodeError:
+            return
+        
+        message_type = data.get('type')
+        if message_type == 'ping':
+            await self.send(text_data=json.dumps({'type': 'pong'}))
+        elif message_type == 'snapshot':
+            await self.send_snapshot()
+    
+    async def send_snapshot(self):
+        """Send the full dashboard statistics, superseding any delta received so far."""
+        # Every delta received so far was numbered before this read
+        self.snapshot_seq = await adelta_sequence()
+        self.send_buffer.pop('changes', None)
+        stats = await database_sync_to_async(get_dashboard_stats)(self.user)
+        await self.send(text_data=json.dumps(
+            {'type': 'snapshot', 'version': self.snapshot_seq, 'data': stats}, cls=DjangoJSONEncoder
+        ))
+    
+    async def dashboard_delta(self, event):
+        """Merge counter changes into the pending delta frame, unless the last snapshot has them."""
+        if event['seq'] <= self.snapshot_seq:
+            return
+        changes = dict(self.send_buffer.get('changes', {}))
+        for path, delta in event['changes'].items():
+            changes[path] = changes.get(path, 0) + delta
+        await self.buffer_event('changes', {path: delta for path, delta in changes.items() if delta})
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.1 on 2026-10-19 12:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('incidents', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IncidentDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('severity', models.CharField(choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High'), ('critical', 'Critical')], max_length=20)),
+                ('status', models.CharField(choices=[('reported', 'Reported'), ('assigned', 'Assigned'), ('in_progress', 'In Progress'), ('resolved', 'Resolved'), ('closed', 'Closed')], max_length=20)),
+                ('created', models.IntegerField(default=0)),
+                ('resolved', models.IntegerField(default=0)),
+                ('resolve_seconds', models.FloatField(default=0)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to='incidents.incidentcategory')),
+            ],
+            options={
+                'db_table': 'incident_daily_rollup',
+                'ordering': ['day'],
+                'unique_together': {('day', 'category', 'severity', 'status')},
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.0.1 on 2026-10-19 12:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0001_initial'),
+        ('incidents', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResponseTimeRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('severity', models.CharField(choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High'), ('critical', 'Critical')], max_length=20)),
+                ('metric', models.CharField(choices=[('time_to_assign', 'Time to Assign'), ('time_to_first_log', 'Time to First Log'), ('time_to_resolve', 'Time to Resolve')], max_length=30)),
+                ('sketch', models.JSONField(default=dict)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='response_time_rollups', to='incidents.incidentcategory')),
+            ],
+            options={
+                'db_table': 'response_time_rollup',
+                'ordering': ['day'],
+                'unique_together': {('day', 'category', 'severity', 'metric')},
+            },
+        ),
+    ]
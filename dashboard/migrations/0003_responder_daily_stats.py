@@ -0,0 +1,35 @@
+# Generated by Django 5.0.1 on 2026-10-19 12:23
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0002_response_time_rollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResponderDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('assignments', models.IntegerField(default=0)),
+                ('logs', models.IntegerField(default=0)),
+                ('first_logs', models.IntegerField(default=0)),
+                ('first_log_seconds', models.FloatField(default=0)),
+                ('resolved', models.IntegerField(default=0)),
+                ('resolve_seconds', models.FloatField(default=0)),
+                ('responder', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'responder_daily_stats',
+                'ordering': ['day'],
+                'unique_together': {('responder', 'day')},
+            },
+        ),
+    ]
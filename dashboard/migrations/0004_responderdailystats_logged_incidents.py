@@ -0,0 +1,37 @@
+# Generated by Django 5.0.1 on 2026-10-19 15:02
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def backfill_logged_incidents(apps, schema_editor):
+    ResponseLog = apps.get_model('responses', 'ResponseLog')
+    ResponderDailyStats = apps.get_model('dashboard', 'ResponderDailyStats')
+    rows = (
+        ResponseLog.objects.annotate(day=TruncDate('timestamp'))
+        .values('responder_id', 'day')
+        .annotate(incidents=Count('incident', distinct=True))
+        .order_by()
+    )
+    for row in rows.iterator(chunk_size=1000):
+        ResponderDailyStats.objects.filter(responder_id=row['responder_id'], day=row['day']).update(
+            logged_incidents=row['incidents']
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0003_responder_daily_stats'),
+        ('responses', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='responderdailystats',
+            name='logged_incidents',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_logged_incidents, migrations.RunPython.noop),
+    ]
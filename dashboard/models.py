@@ -0,0 +1,95 @@
+"""
+Models for dashboard app.
+"""
+from django.db import models
+from django.contrib.auth import get_user_model
+from incidents.models import Incident, IncidentCategory
+
+User = get_user_model()
+
+
+class IncidentDailyRollup(models.Model):
+    """
+    Daily incident counts by category, severity and current status.
+    
+    `created` counts incidents created on `day`; `resolved` and
+    `resolve_seconds` cover incidents resolved on `day`. Maintained
+    incrementally by dashboard.signals and rebuilt with the
+    rebuild_incident_rollups management command.
+    """
+    day = models.DateField()
+    category = models.ForeignKey(IncidentCategory, on_delete=models.CASCADE, related_name='daily_rollups')
+    severity = models.CharField(max_length=20, choices=Incident.SEVERITY_CHOICES)
+    status = models.CharField(max_length=20, choices=Incident.STATUS_CHOICES)
+    
+    created = models.IntegerField(default=0)
+    resolved = models.IntegerField(default=0)
+    resolve_seconds = models.FloatField(default=0)
+    
+    class Meta:
+        db_table = 'incident_daily_rollup'
+        unique_together = ['day', 'category', 'severity', 'status']
+        ordering = ['day']
+    
+    def __str__(self):
+        return f"{self.day} {self.category_id}/{self.severity}/{self.status}: {self.created}"
+
+
+class ResponseTimeRollup(models.Model):
+    """
+    Response-time distribution for incidents created on `day`, by category and severity.
+    
+    `sketch` holds a serialized dashboard.sketches.DDSketch of durations in
+    seconds, so percentiles over any date range come from merging a few rows.
+    """
+    TIME_TO_ASSIGN = 'time_to_assign'
+    TIME_TO_FIRST_LOG = 'time_to_first_log'
+    TIME_TO_RESOLVE = 'time_to_resolve'
+    METRIC_CHOICES = [
+        (TIME_TO_ASSIGN, 'Time to Assign'),
+        (TIME_TO_FIRST_LOG, 'Time to First Log'),
+        (TIME_TO_RESOLVE, 'Time to Resolve'),
+    ]
+    
+    day = models.DateField()
+    category = models.ForeignKey(IncidentCategory, on_delete=models.CASCADE, related_name='response_time_rollups')
+    severity = models.CharField(max_length=20, choices=Incident.SEVERITY_CHOICES)
+    metric = models.CharField(max_length=30, choices=METRIC_CHOICES)
+    sketch = models.JSONField(default=dict)
+    
+    class Meta:
+        db_table = 'response_time_rollup'
+        unique_together = ['day', 'category', 'severity', 'metric']
+        ordering = ['day']
+    
+    def __str__(self):
+        return f"{self.day} {self.category_id}/{self.severity} {self.metric}"
+
+
+class ResponderDailyStats(models.Model):
+    """
+    Per-responder activity for one day, summed over a window for analytics.
+    
+    `logged_incidents` counts the distinct incidents logged on that day.
+    `first_logs`/`first_log_seconds` cover the time from assignment to the
+    responder's first log on an incident; `resolved`/`resolve_seconds` the
+    time from assignment to resolution, counted on the day each happened.
+    """
+    responder = models.ForeignKey(User, on_delete=models.CASCADE, related_name='daily_stats')
+    day = models.DateField()
+    
+    assignments = models.IntegerField(default=0)
+    logs = models.IntegerField(default=0)
+    logged_incidents = models.IntegerField(default=0)
+    first_logs = models.IntegerField(default=0)
+    first_log_seconds = models.FloatField(default=0)
+    resolved = models.IntegerField(default=0)
+    resolve_seconds = models.FloatField(default=0)
+    
+    class Meta:
+        db_table = 'responder_daily_stats'
+        unique_together = ['responder', 'day']
+        ordering = ['day']
+    
+    def __str__(self):
+        return f"{self.responder_id} {self.day}"
@@ -0,0 +1,641 @@
+"""
+Incident rollup maintenance and trend queries for dashboard app.
+"""
+from datetime import datetime, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DurationField, ExpressionWrapper, F, Min, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce, TruncDate, TruncHour, TruncWeek
+from django.utils import timezone
+
+from incidents.models import Incident
+from responses.models import ResponseLog, ResponseTeam
+from .models import IncidentDailyRollup, ResponderDailyStats, ResponseTimeRollup
+from .sketches import DDSketch
+
+ROLLUP_FIELDS = ('category_id', 'severity', 'status', 'created_at', 'resolved_at')
+
+TREND_BUCKETS = ('hour', 'day', 'week')
+
+# Most buckets one trend may span, so a long hourly window cannot exhaust memory
+MAX_TREND_BUCKETS = 24 * 31
+
+PERCENTILES = (('p50', 0.5), ('p90', 0.9), ('p99', 0.99))
+
+PERCENTILE_GROUPS = ('category', 'severity', 'day')
+
+# Response-time metrics measured to an incident's first assignment or log:
+# {metric: (model, timestamp field)}
+FIRST_EVENTS = {
+    ResponseTimeRollup.TIME_TO_ASSIGN: (ResponseTeam, 'assigned_at'),
+    ResponseTimeRollup.TIME_TO_FIRST_LOG: (ResponseLog, 'timestamp'),
+}
+
+RESPONDER_COUNTERS = (
+    'assignments', 'logs', 'logged_incidents', 'first_logs', 'first_log_seconds', 'resolved', 'resolve_seconds'
+)
+
+User = get_user_model()
+
+
+def rollup_state(incident):
+    """Snapshot the fields of an incident that determine its rollup rows."""
+    return tuple(getattr(incident, field) for field in ROLLUP_FIELDS)
+
+
+def rollup_contributions(state):
+    """Return {(day, category_id, severity, status): {field: delta}} for an incident state."""
+    category_id, severity, status, created_at, resolved_at = state
+    contributions = {}
+    if created_at is None:
+        return contributions
+    
+    key = (timezone.localdate(created_at), category_id, severity, status)
+    contributions[key] = {'created': 1}
+    if resolved_at is not None:
+        key = (timezone.localdate(resolved_at), category_id, severity, status)
+        row = contributions.setdefault(key, {})
+        row['resolved'] = 1
+        row['resolve_seconds'] = (resolved_at - created_at).total_seconds()
+    return contributions
+
+
+def apply_rollup_change(old_state, new_state):
+    """Move an incident's contributions from its old state to its new one."""
+    deltas = {}
+    for sign, state in ((-1, old_state), (1, new_state)):
+        if state is None:
+            continue
+        for key, fields in rollup_contributions(state).items():
+            row = deltas.setdefault(key, {})
+            for field, value in fields.items():
+                row[field] = row.get(field, 0) + sign * value
+    
+    for key, fields in deltas.items():
+        fields = {field: value for field, value in fields.items() if value}
+        if fields:
+            add_to_rollup(key, fields)
+
+
+def add_to_rollup(key, fields):
+    """Add deltas to one rollup row, creating the row if needed."""
+    day, category_id, severity, status = key
+    add_to_row(
+        IncidentDailyRollup,
+        {'day': day, 'category_id': category_id, 'severity': severity, 'status': status},
+        fields
+    )
+
+
+def add_to_row(model, lookup, fields):
+    """Add deltas to the counter fields of the row matching `lookup`, creating it if needed."""
+    updates = {field: F(field) + value for field, value in fields.items()}
+    if model.objects.filter(**lookup).update(**updates):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**lookup, **fields)
+    except IntegrityError:
+        # Created concurrently - apply the delta to that row instead
+        model.objects.filter(**lookup).update(**updates)
+
+
+def add_to_responder_stats(responder_id, timestamp, **fields):
+    """Add deltas to a responder's stats for the day of `timestamp`."""
+    lookup = {'responder_id': responder_id, 'day': timezone.localdate(timestamp)}
+    if all(value <= 0 for value in fields.values()):
+        # Withdrawals only touch existing rows: when a responder is deleted
+        # their rows may already be gone, and must not be recreated
+        ResponderDailyStats.objects.filter(**lookup).update(
+            **{field: F(field) + value for field, value in fields.items()}
+        )
+        return
+    add_to_row(ResponderDailyStats, lookup, fields)
+
+
+def responder_first_log_at(incident_id, responder_id, exclude_pk=None):
+    """When a responder first logged on an incident, or None."""
+    logs = ResponseLog.objects.filter(incident_id=incident_id, responder_id=responder_id)
+    if exclude_pk is not None:
+        logs = logs.exclude(pk=exclude_pk)
+    return logs.aggregate(first=Min('timestamp'))['first']
+
+
+def logged_on_day(incident_id, responder_id, timestamp, exclude_pk=None):
+    """Whether a responder logged on an incident on the local day of `timestamp`."""
+    day = timezone.localdate(timestamp)
+    logs = ResponseLog.objects.filter(
+        incident_id=incident_id, responder_id=responder_id,
+        timestamp__gte=timezone.make_aware(datetime.combine(day, time.min)),
+        timestamp__lt=timezone.make_aware(datetime.combine(day + timedelta(days=1), time.min))
+    )
+    if exclude_pk is not None:
+        logs = logs.exclude(pk=exclude_pk)
+    return logs.exists()
+
+
+def add_first_log_credit(responder_id, assigned_at, first_log_at, sign=1):
+    """Credit (or with sign=-1 withdraw) the time from an assignment to the responder's first log."""
+    if assigned_at is None or first_log_at is None:
+        return
+    add_to_responder_stats(
+        responder_id, first_log_at,
+        first_logs=sign,
+        first_log_seconds=sign * max((first_log_at - assigned_at).total_seconds(), 0)
+    )
+
+
+def add_resolve_credit(responder_id, assigned_at, resolved_at, sign=1):
+    """Credit (or with sign=-1 withdraw) an assigned responder with an incident's resolution."""
+    if resolved_at is None:
+        return
+    add_to_responder_stats(
+        responder_id, resolved_at,
+        resolved=sign,
+        resolve_seconds=sign * max((resolved_at - assigned_at).total_seconds(), 0)
+    )
+
+
+def apply_responder_assignment(team, sign=1):
+    """
+    Add (or with sign=-1 remove) everything an assignment contributes to its responder's stats.
+    
+    Like rebuild_responder_stats(), an assignment earns its first-log and
+    resolve credits whenever the log or resolution exists, whichever came first.
+    """
+    add_to_responder_stats(team.responder_id, team.assigned_at, assignments=sign)
+    add_first_log_credit(
+        team.responder_id, team.assigned_at, responder_first_log_at(team.incident_id, team.responder_id), sign
+    )
+    resolved_at = Incident.objects.filter(pk=team.incident_id).values_list('resolved_at', flat=True).first()
+    add_resolve_credit(team.responder_id, team.assigned_at, resolved_at, sign)
+
+
+def apply_responder_first_log_change(incident_id, responder_id, old_first_log_at, new_first_log_at):
+    """Move an assigned responder's first-log credit as their first log on an incident changes."""
+    if old_first_log_at == new_first_log_at:
+        return
+    assigned_at = ResponseTeam.objects.filter(
+        incident_id=incident_id, responder_id=responder_id
+    ).values_list('assigned_at', flat=True).first()
+    add_first_log_credit(responder_id, assigned_at, old_first_log_at, -1)
+    add_first_log_credit(responder_id, assigned_at, new_first_log_at)
+
+
+def record_responder_log(log):
+    """Count a new response log, and move the first-log credit if it is the responder's earliest."""
+    logged_before = logged_on_day(log.incident_id, log.responder_id, log.timestamp, exclude_pk=log.pk)
+    add_to_responder_stats(log.responder_id, log.timestamp, logs=1, logged_incidents=0 if logged_before else 1)
+    old_first_log_at = responder_first_log_at(log.incident_id, log.responder_id, exclude_pk=log.pk)
+    new_first_log_at = log.timestamp if old_first_log_at is None else min(old_first_log_at, log.timestamp)
+    apply_responder_first_log_change(log.incident_id, log.responder_id, old_first_log_at, new_first_log_at)
+
+
+def apply_responder_resolve_change(incident_id, old_resolved_at, new_resolved_at):
+    """Credit (or on reopening, un-credit) assigned responders with a resolution."""
+    if old_resolved_at == new_resolved_at:
+        return
+    assignments = ResponseTeam.objects.filter(incident_id=incident_id).values_list('responder_id', 'assigned_at')
+    for responder_id, assigned_at in assignments:
+        add_resolve_credit(responder_id, assigned_at, old_resolved_at, -1)
+        add_resolve_credit(responder_id, assigned_at, new_resolved_at)
+
+
+def rebuild_rollups(batch_size=1000):
+    """Recompute every rollup row from the incidents table."""
+    rows = {}
+    
+    created = (
+        Incident.objects.annotate(day=TruncDate('created_at'))
+        .values('day', 'category_id', 'severity', 'status')
+        .annotate(count=Count('id'))
+        .order_by()
+    )
+    for row in created:
+        key = (row['day'], row['category_id'], row['severity'], row['status'])
+        rows.setdefault(key, {})['created'] = row['count']
+    
+    resolved = (
+        Incident.objects.filter(resolved_at__isnull=False)
+        .annotate(
+            day=TruncDate('resolved_at'),
+            duration=ExpressionWrapper(F('resolved_at') - F('created_at'), output_field=DurationField())
+        )
+        .values('day', 'category_id', 'severity', 'status')
+        .annotate(count=Count('id'), seconds=Sum('duration'))
+        .order_by()
+    )
+    for row in resolved:
+        key = (row['day'], row['category_id'], row['severity'], row['status'])
+        values = rows.setdefault(key, {})
+        values['resolved'] = row['count']
+        values['resolve_seconds'] = row['seconds'].total_seconds() if row['seconds'] else 0
+    
+    with transaction.atomic():
+        IncidentDailyRollup.objects.all().delete()
+        IncidentDailyRollup.objects.bulk_create(
+            [
+                IncidentDailyRollup(
+                    day=day, category_id=category_id, severity=severity, status=status, **values
+                )
+                for (day, category_id, severity, status), values in rows.items()
+            ],
+            batch_size=batch_size
+        )
+    return len(rows)
+
+
+def stats_deltas(old_state, new_state, now=None):
+    """
+    Changes to the admin dashboard counters when an incident moves between states.
+    
+    Returns {'section.key': delta} using the paths of DashboardStatsView's
+    output, e.g. {'by_status.reported': -1, 'by_status.assigned': 1}.
+    """
+    if now is None:
+        now = timezone.now()
+    today = timezone.localdate(now)
+    last_7_days = now - timedelta(days=7)
+    
+    changes = {}
+    for sign, state in ((-1, old_state), (1, new_state)):
+        if state is None:
+            continue
+        category_id, severity, status, created_at, resolved_at = state
+        paths = ['overview.total_incidents', f'by_status.{status}', f'by_severity.{severity}']
+        if status in Incident.ACTIVE_STATUSES:
+            paths.append('overview.active_incidents')
+        if resolved_at is not None:
+            if timezone.localdate(resolved_at) == today:
+                paths.append('overview.resolved_today')
+            if resolved_at >= last_7_days:
+                paths.append('overview.resolved_this_week')
+        for path in paths:
+            changes[path] = changes.get(path, 0) + sign
+    return {path: delta for path, delta in changes.items() if delta}
+
+
+def record_response_time(created_at, category_id, severity, metric, seconds, weight=1):
+    """Add (or with weight=-1 remove) one duration in a response-time sketch row."""
+    with transaction.atomic():
+        row, _ = ResponseTimeRollup.objects.select_for_update().get_or_create(
+            day=timezone.localdate(created_at),
+            category_id=category_id,
+            severity=severity,
+            metric=metric
+        )
+        sketch = DDSketch.from_dict(row.sketch)
+        sketch.add(max(seconds, 0), weight)
+        row.sketch = sketch.to_dict()
+        row.save(update_fields=['sketch'])
+
+
+def resolve_time_entry(state):
+    """Return the time-to-resolve sketch entry for an incident state, if resolved."""
+    if state is None:
+        return None
+    category_id, severity, status, created_at, resolved_at = state
+    if created_at is None or resolved_at is None:
+        return None
+    return (created_at, category_id, severity, (resolved_at - created_at).total_seconds())
+
+
+def apply_resolve_time_change(old_state, new_state):
+    """Move an incident's time-to-resolve between sketch rows as it changes."""
+    old_entry = resolve_time_entry(old_state)
+    new_entry = resolve_time_entry(new_state)
+    if old_entry == new_entry:
+        return
+    if old_entry:
+        created_at, category_id, severity, seconds = old_entry
+        record_response_time(created_at, category_id, severity, ResponseTimeRollup.TIME_TO_RESOLVE, seconds, -1)
+    if new_entry:
+        created_at, category_id, severity, seconds = new_entry
+        record_response_time(created_at, category_id, severity, ResponseTimeRollup.TIME_TO_RESOLVE, seconds)
+
+
+def first_event_at(metric, incident_id, exclude_pk=None):
+    """When an incident's first assignment or log (per `metric`) happened, or None."""
+    model, field = FIRST_EVENTS[metric]
+    rows = model.objects.filter(incident_id=incident_id)
+    if exclude_pk is not None:
+        rows = rows.exclude(pk=exclude_pk)
+    return rows.aggregate(first=Min(field))['first']
+
+
+def record_first_event_time(incident_key, metric, first_at, weight=1):
+    """Add (or remove) the duration from an incident being reported to `first_at`."""
+    created_at, category_id, severity = incident_key
+    record_response_time(
+        created_at, category_id, severity, metric, (first_at - created_at).total_seconds(), weight
+    )
+
+
+def apply_first_event_change(incident_id, metric, old_first_at, new_first_at):
+    """
+    Replace an incident's first-assignment or first-log duration as that event changes.
+    
+    Called with the first event's time before and after an assignment or
+    log is added or deleted, so the sketches always hold the same duration
+    rebuild_response_time_rollups() would compute.
+    """
+    if old_first_at == new_first_at:
+        return
+    incident_key = Incident.objects.filter(pk=incident_id).values_list(
+        'created_at', 'category_id', 'severity'
+    ).first()
+    if incident_key is None:
+        return
+    if old_first_at is not None:
+        record_first_event_time(incident_key, metric, old_first_at, -1)
+    if new_first_at is not None:
+        record_first_event_time(incident_key, metric, new_first_at)
+
+
+def apply_first_event_move(incident_id, old_state, new_state):
+    """Move an incident's first-event durations when its category, severity or creation time changes."""
+    if old_state is None:
+        return
+    old_key = (old_state[3], old_state[0], old_state[1])
+    new_key = (new_state[3], new_state[0], new_state[1])
+    if old_key == new_key or old_key[0] is None:
+        return
+    for metric in FIRST_EVENTS:
+        first_at = first_event_at(metric, incident_id)
+        if first_at is not None:
+            record_first_event_time(old_key, metric, first_at, -1)
+            record_first_event_time(new_key, metric, first_at)
+
+
+def rebuild_response_time_rollups(batch_size=1000):
+    """Recompute every response-time sketch from incidents, assignments and logs."""
+    first_assigned = ResponseTeam.objects.filter(incident=OuterRef('pk')).order_by('assigned_at')
+    first_log = ResponseLog.objects.filter(incident=OuterRef('pk')).order_by('timestamp')
+    incidents = Incident.objects.annotate(
+        first_assigned_at=Subquery(first_assigned.values('assigned_at')[:1]),
+        first_log_at=Subquery(first_log.values('timestamp')[:1]),
+    ).values_list(
+        'created_at', 'category_id', 'severity', 'resolved_at', 'first_assigned_at', 'first_log_at'
+    ).order_by()
+    
+    sketches = {}
+    for created_at, category_id, severity, resolved_at, first_assigned_at, first_log_at in incidents.iterator(chunk_size=batch_size):
+        day = timezone.localdate(created_at)
+        for metric, timestamp in (
+            (ResponseTimeRollup.TIME_TO_ASSIGN, first_assigned_at),
+            (ResponseTimeRollup.TIME_TO_FIRST_LOG, first_log_at),
+            (ResponseTimeRollup.TIME_TO_RESOLVE, resolved_at),
+        ):
+            if timestamp is None:
+                continue
+            sketch = sketches.setdefault((day, category_id, severity, metric), DDSketch())
+            sketch.add(max((timestamp - created_at).total_seconds(), 0))
+    
+    with transaction.atomic():
+        ResponseTimeRollup.objects.all().delete()
+        ResponseTimeRollup.objects.bulk_create(
+            [
+                ResponseTimeRollup(
+                    day=day, category_id=category_id, severity=severity, metric=metric,
+                    sketch=sketch.to_dict()
+                )
+                for (day, category_id, severity, metric), sketch in sketches.items()
+            ],
+            batch_size=batch_size
+        )
+    return len(sketches)
+
+
+def rebuild_responder_stats(batch_size=1000):
+    """Recompute every responder's daily stats from assignments, logs and incidents."""
+    rows = {}
+    
+    def add(responder_id, day, **fields):
+        row = rows.setdefault((responder_id, day), {})
+        for field, value in fields.items():
+            row[field] = row.get(field, 0) + value
+    
+    assignments = (
+        ResponseTeam.objects.annotate(day=TruncDate('assigned_at'))
+        .values('responder_id', 'day').annotate(count=Count('id')).order_by()
+    )
+    for row in assignments:
+        add(row['responder_id'], row['day'], assignments=row['count'])
+    
+    logs = (
+        ResponseLog.objects.annotate(day=TruncDate('timestamp'))
+        .values('responder_id', 'day')
+        .annotate(count=Count('id'), incidents=Count('incident', distinct=True))
+        .order_by()
+    )
+    for row in logs:
+        add(row['responder_id'], row['day'], logs=row['count'], logged_incidents=row['incidents'])
+    
+    first_log = ResponseLog.objects.filter(
+        incident=OuterRef('incident'), responder=OuterRef('responder')
+    ).order_by('timestamp')
+    teams = ResponseTeam.objects.annotate(
+        first_log_at=Subquery(first_log.values('timestamp')[:1])
+    ).values_list('responder_id', 'assigned_at', 'first_log_at', 'incident__resolved_at').order_by()
+    for responder_id, assigned_at, first_log_at, resolved_at in teams.iterator(chunk_size=batch_size):
+        if first_log_at is not None:
+            add(
+                responder_id, timezone.localdate(first_log_at),
+                first_logs=1,
+                first_log_seconds=max((first_log_at - assigned_at).total_seconds(), 0)
+            )
+        if resolved_at is not None:
+            add(
+                responder_id, timezone.localdate(resolved_at),
+                resolved=1,
+                resolve_seconds=max((resolved_at - assigned_at).total_seconds(), 0)
+            )
+    
+    with transaction.atomic():
+        ResponderDailyStats.objects.all().delete()
+        ResponderDailyStats.objects.bulk_create(
+            [
+                ResponderDailyStats(responder_id=responder_id, day=day, **fields)
+                for (responder_id, day), fields in rows.items()
+            ],
+            batch_size=batch_size
+        )
+    return len(rows)
+
+
+def responder_performance(start_day, end_day):
+    """
+    Per-responder metrics over [start_day, end_day] in a single query.
+    
+    Windowed totals are summed from responder_daily_stats; the current number
+    of active assignments is read from the maintained responder workload.
+    Logs per incident divides the window's logs by the incidents logged on
+    each day, so an incident worked across several days counts once per day.
+    """
+    in_window = Q(daily_stats__day__gte=start_day, daily_stats__day__lte=end_day)
+    responders = (
+        User.objects.filter(role='responder')
+        .annotate(
+            active_assignments=Coalesce('workload__active_count', 0),
+            **{
+                counter: Sum(f'daily_stats__{counter}', filter=in_window)
+                for counter in RESPONDER_COUNTERS
+            }
+        )
+        .values('id', 'username', 'active_assignments', *RESPONDER_COUNTERS)
+        .order_by('username')
+    )
+    
+    results = []
+    for row in responders:
+        for counter in RESPONDER_COUNTERS:
+            row[counter] = row[counter] or 0
+        results.append({
+            'responder_id': row['id'],
+            'username': row['username'],
+            'active_assignments': row['active_assignments'],
+            'assignments': row['assignments'],
+            'logs': row['logs'],
+            'resolved': row['resolved'],
+            'avg_time_to_first_log': (
+                row['first_log_seconds'] / row['first_logs'] if row['first_logs'] else None
+            ),
+            'avg_time_to_resolve': (
+                row['resolve_seconds'] / row['resolved'] if row['resolved'] else None
+            ),
+            'logs_per_incident': (
+                row['logs'] / row['logged_incidents'] if row['logged_incidents'] else None
+            ),
+        })
+    return results
+
+
+def response_time_percentiles(start_day, end_day, group_by=None):
+    """
+    p50/p90/p99 response times in seconds for incidents created between two dates.
+    
+    With `group_by` set to 'category', 'severity' or 'day', returns
+    {group: {metric: summary}}; otherwise {metric: summary}. Each summary is
+    {'count', 'p50', 'p90', 'p99'}.
+    """
+    if group_by is not None and group_by not in PERCENTILE_GROUPS:
+        raise ValueError(f"group_by must be one of {', '.join(PERCENTILE_GROUPS)}")
+    
+    rows = ResponseTimeRollup.objects.filter(
+        day__gte=start_day, day__lte=end_day
+    ).values_list('day', 'category_id', 'severity', 'metric', 'sketch')
+    
+    groups = {}
+    for day, category_id, severity, metric, data in rows:
+        group = {None: None, 'category': category_id, 'severity': severity, 'day': day}[group_by]
+        metrics = groups.setdefault(group, {})
+        sketch = DDSketch.from_dict(data)
+        if metric in metrics:
+            metrics[metric].merge(sketch)
+        else:
+            metrics[metric] = sketch
+    
+    summaries = {
+        group: {
+            metric: {
+                'count': sketch.count,
+                **{
+                    name: round(sketch.quantile(q), 1) if sketch.count else None
+                    for name, q in PERCENTILES
+                },
+            }
+            for metric, sketch in metrics.items()
+        }
+        for group, metrics in groups.items()
+    }
+    if group_by is None:
+        return summaries.get(None, {})
+    return summaries
+
+
+def bucket_start(value, bucket):
+    """Truncate a date (or datetime for hourly buckets) to the start of its bucket."""
+    if bucket == 'hour':
+        return value.replace(minute=0, second=0, microsecond=0)
+    if isinstance(value, datetime):
+        value = timezone.localdate(value)
+    if bucket == 'week':
+        return value - timedelta(days=value.weekday())
+    return value
+
+
+def bucket_series(start, end, bucket):
+    """Every bucket start from `start` to `end` inclusive; raises ValueError past MAX_TREND_BUCKETS."""
+    step = {'hour': timedelta(hours=1), 'day': timedelta(days=1), 'week': timedelta(weeks=1)}[bucket]
+    current = bucket_start(start, bucket)
+    last = bucket_start(end, bucket)
+    if (last - current) // step >= MAX_TREND_BUCKETS:
+        raise ValueError(f'a trend may span at most {MAX_TREND_BUCKETS} buckets')
+    series = []
+    while current <= last:
+        series.append(current)
+        current += step
+    return series
+
+
+def incident_trend(start, end, bucket='day', incidents_qs=None):
+    """
+    Incident counts per bucket between `start` and `end`, with empty buckets filled.
+    
+    Daily and weekly trends over all incidents are read from the rollup table.
+    Hourly trends, and trends for a scoped `incidents_qs`, group raw incidents.
+    
+    Returns a list of {'day', 'count', 'by_status', 'resolved'} where `day` is the
+    bucket start, `by_status` counts incidents still reported and `resolved`
+    counts incidents created in the bucket that are now resolved.
+    """
+    if bucket not in TREND_BUCKETS:
+        raise ValueError(f"bucket must be one of {', '.join(TREND_BUCKETS)}")
+    
+    if bucket == 'hour':
+        start = timezone.localtime(start)
+        end = timezone.localtime(end)
+    series = bucket_series(start, end, bucket)
+    
+    if incidents_qs is None and bucket != 'hour':
+        rows = (
+            IncidentDailyRollup.objects.filter(
+                day__gte=timezone.localdate(start),
+                day__lte=timezone.localdate(end),
+                created__gt=0
+            )
+            .values('day', 'status')
+            .annotate(count=Sum('created'))
+            .order_by()
+        )
+        counts = [(row['day'], row['status'], row['count']) for row in rows]
+    else:
+        if incidents_qs is None:
+            incidents_qs = Incident.objects.all()
+        trunc = {'hour': TruncHour, 'day': TruncDate, 'week': TruncWeek}[bucket]
+        rows = (
+            incidents_qs.filter(created_at__gte=start, created_at__lte=end)
+            .annotate(period=trunc('created_at'))
+            .values('period', 'status')
+            .annotate(count=Count('id'))
+            .order_by()
+        )
+        counts = [(row['period'], row['status'], row['count']) for row in rows]
+    
+    trend = {
+        period: {'day': period, 'count': 0, 'by_status': 0, 'resolved': 0}
+        for period in series
+    }
+    for period, status, count in counts:
+        if bucket == 'hour':
+            period = timezone.localtime(period)
+        entry = trend.get(bucket_start(period, bucket))
+        if entry is None:
+            continue
+        entry['count'] += count
+        if status == 'reported':
+            entry['by_status'] += count
+        elif status == 'resolved':
+            entry['resolved'] += count
+    return list(trend.values())
@@ -0,0 +1,232 @@
+"""
+Signals for dashboard app.
+"""
+import threading
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from incidents.models import Incident
+from notifications.models import Notification
+from responses.models import ResponseLog, ResponseTeam
+from .cache import bump_notifications_version, bump_stats_version
+from .models import ResponseTimeRollup
+from .rollups import (
+    ROLLUP_FIELDS, add_to_responder_stats, apply_first_event_change, apply_first_event_move,
+    apply_resolve_time_change, apply_responder_assignment, apply_responder_first_log_change,
+    apply_responder_resolve_change, apply_rollup_change, first_event_at, logged_on_day, record_responder_log,
+    responder_first_log_at, rollup_state, stats_deltas
+)
+from .utils import publish_dashboard_delta
+
+
+User = get_user_model()
+
+# User fields the cached statistics read: active responder counts and the
+# responder analytics
+STATS_USER_FIELDS = {'role', 'is_available', 'is_active', 'username'}
+
+# Values captured before a delete, such as an incident's first-event time,
+# for the handlers that update rollups once the rows are gone. Django sends
+# pre_delete for every row of a delete (cascades included) before removing
+# any, so one value may be shared by several rows: entries are
+# {group: {'value': ..., 'pks': rows still to be handled}}.
+pending_deletes = threading.local()
+
+@receiver(post_save, sender=Incident)
+def update_rollup_on_save(sender, instance, raw=False, **kwargs):
+    """Keep the daily rollup in step with incident changes."""
+    if raw:
+        return
+    # Stored values before this save, set by incidents.signals
+    previous = getattr(instance, '_previous_values', None)
+    old_state = tuple(previous[field] for field in ROLLUP_FIELDS) if previous else None
+    new_state = rollup_state(instance)
+    if old_state != new_state:
+        apply_rollup_change(old_state, new_state)
+        apply_resolve_time_change(old_state, new_state)
+        apply_responder_resolve_change(
+            instance.pk, old_state[-1] if old_state else None, new_state[-1]
+        )
+        apply_first_event_move(instance.pk, old_state, new_state)
+        changes = stats_deltas(old_state, new_state)
+        transaction.on_commit(lambda: publish_dashboard_delta(changes))
+
+
+@receiver(post_delete, sender=Incident)
+def update_rollup_on_delete(sender, instance, **kwargs):
+    """Remove a deleted incident from the daily rollup."""
+    state = rollup_state(instance)
+    apply_rollup_change(state, None)
+    apply_resolve_time_change(state, None)
+    changes = stats_deltas(state, None)
+    transaction.on_commit(lambda: publish_dashboard_delta(changes))
+
+
+def first_event_metric(instance):
+    """The response-time metric an assignment or log can be the first event for."""
+    if isinstance(instance, ResponseTeam):
+        return ResponseTimeRollup.TIME_TO_ASSIGN
+    return ResponseTimeRollup.TIME_TO_FIRST_LOG
+
+
+def record_first_event(instance, timestamp):
+    """Update the incident's first-event duration for a newly created assignment or log."""
+    metric = first_event_metric(instance)
+    old_first_at = first_event_at(metric, instance.incident_id, exclude_pk=instance.pk)
+    new_first_at = timestamp if old_first_at is None else min(old_first_at, timestamp)
+    apply_first_event_change(instance.incident_id, metric, old_first_at, new_first_at)
+
+
+@receiver(post_save, sender=ResponseTeam)
+def record_time_to_assign(sender, instance, created, raw=False, **kwargs):
+    """Credit the assignment to its responder, and record time-to-assign if it is the incident's first."""
+    if not created or raw:
+        return
+    apply_responder_assignment(instance)
+    record_first_event(instance, instance.assigned_at)
+
+
+@receiver(post_save, sender=ResponseLog)
+def record_time_to_first_log(sender, instance, created, raw=False, **kwargs):
+    """Count the log for its responder, and record time-to-first-log if it is the incident's first."""
+    if not created or raw:
+        return
+    record_responder_log(instance)
+    record_first_event(instance, instance.timestamp)
+
+
+def pending_groups():
+    """This thread's pending delete entries."""
+    return pending_deletes.__dict__.setdefault('groups', {})
+
+
+def clear_pending_deletes():
+    """Drop every pending entry, including any left by a delete that rolled back."""
+    pending_groups().clear()
+
+
+def remember_before_delete(group, pk, value):
+    """Record `value` for `group` before the row `pk` is deleted."""
+    transaction.on_commit(clear_pending_deletes)
+    entry = pending_groups().setdefault(group, {'value': value, 'pks': set()})
+    # Every row of one delete captures the same value; a newer capture
+    # replaces anything left by an earlier delete that rolled back
+    entry['value'] = value
+    entry['pks'].add(pk)
+
+
+def settle_after_delete(group, pk, load):
+    """
+    Return (old, new) values of `group` once the row `pk` is deleted.
+    
+    `load` reads the current value. Returns None unless this row's
+    pre_delete recorded the group. Rows deleted with it then start from the
+    new value, so a change shared by the whole batch is applied once.
+    """
+    groups = pending_groups()
+    entry = groups.get(group)
+    if entry is None or pk not in entry['pks']:
+        return None
+    entry['pks'].discard(pk)
+    old, new = entry['value'], load()
+    if entry['pks']:
+        entry['value'] = new
+    else:
+        del groups[group]
+    return old, new
+
+
+@receiver(pre_delete, sender=ResponseTeam)
+@receiver(pre_delete, sender=ResponseLog)
+def remember_first_event(sender, instance, **kwargs):
+    """Capture the incident's first-event time before assignments or logs are deleted."""
+    metric = first_event_metric(instance)
+    remember_before_delete(
+        ('first_event', metric, instance.incident_id), instance.pk,
+        first_event_at(metric, instance.incident_id)
+    )
+    if isinstance(instance, ResponseLog):
+        remember_before_delete(
+            ('first_log', instance.incident_id, instance.responder_id), instance.pk,
+            responder_first_log_at(instance.incident_id, instance.responder_id)
+        )
+        remember_before_delete(
+            ('logged_day', instance.incident_id, instance.responder_id, timezone.localdate(instance.timestamp)),
+            instance.pk, 1
+        )
+
+
+@receiver(post_delete, sender=ResponseTeam)
+@receiver(post_delete, sender=ResponseLog)
+def forget_first_event(sender, instance, **kwargs):
+    """Replace or remove the incident's first-event duration once its rows are deleted."""
+    metric = first_event_metric(instance)
+    change = settle_after_delete(
+        ('first_event', metric, instance.incident_id), instance.pk,
+        lambda: first_event_at(metric, instance.incident_id)
+    )
+    if change is not None:
+        apply_first_event_change(instance.incident_id, metric, *change)
+
+
+@receiver(post_delete, sender=ResponseTeam)
+def withdraw_assignment(sender, instance, **kwargs):
+    """Remove a deleted assignment's counts and credits from its responder's stats."""
+    apply_responder_assignment(instance, -1)
+
+
+@receiver(post_delete, sender=ResponseLog)
+def withdraw_responder_log(sender, instance, **kwargs):
+    """Uncount a deleted log and, once none remain that day, its incident; move the first-log credit if it changed."""
+    logged = settle_after_delete(
+        ('logged_day', instance.incident_id, instance.responder_id, timezone.localdate(instance.timestamp)),
+        instance.pk,
+        lambda: int(logged_on_day(instance.incident_id, instance.responder_id, instance.timestamp))
+    )
+    add_to_responder_stats(
+        instance.responder_id, instance.timestamp,
+        logs=-1,
+        logged_incidents=logged[1] - logged[0] if logged else 0
+    )
+    change = settle_after_delete(
+        ('first_log', instance.incident_id, instance.responder_id), instance.pk,
+        lambda: responder_first_log_at(instance.incident_id, instance.responder_id)
+    )
+    if change is not None:
+        apply_responder_first_log_change(instance.incident_id, instance.responder_id, *change)
+
+
+@receiver([post_save, post_delete], sender=Incident)
+@receiver([post_save, post_delete], sender=ResponseTeam)
+@receiver([post_save, post_delete], sender=ResponseLog)
+def invalidate_cached_stats(sender, **kwargs):
+    """Invalidate cached dashboard statistics on incident and response writes."""
+    # Bump again on commit so a request that read pre-commit data in between
+    # cannot leave it cached under the current version
+    bump_stats_version()
+    transaction.on_commit(bump_stats_version)
+
+
+@receiver(post_save, sender=User)
+def invalidate_cached_responder_stats(sender, instance, update_fields=None, **kwargs):
+    """Invalidate cached statistics when a responder's fields that they show may have changed."""
+    # Partial saves such as the last_login update on every sign-in leave them alone
+    if update_fields is not None and not STATS_USER_FIELDS.intersection(update_fields):
+        return
+    # A role saved on its own may have been a responder's
+    if instance.role == 'responder' or (update_fields is not None and 'role' in update_fields):
+        bump_stats_version()
+        transaction.on_commit(bump_stats_version)
+
+
+# post_save only: a post_delete receiver would stop the retention job's bulk
+# deletes from using Django's fast delete path, so it bumps versions itself
+@receiver(post_save, sender=Notification)
+def invalidate_cached_notification_stats(sender, instance, **kwargs):
+    """Invalidate a user's cached notification counts."""
+    bump_notifications_version(instance.recipient_id)
+    transaction.on_commit(lambda: bump_notifications_version(instance.recipient_id))
@@ -0,0 +1,89 @@
+"""
+Mergeable quantile sketches for dashboard app.
+"""
+from math import ceil, log
+
+
+class DDSketch:
+    """
+    DDSketch quantile sketch for non-negative values.
+    
+    Values are counted in logarithmic bins so any quantile is returned within
+    `relative_accuracy` of the true value. Sketches with the same accuracy
+    merge by adding bin counts, and values can be removed again, which lets
+    rollup rows follow incidents that change category or get reopened.
+    """
+    
+    # Values at or below this are counted as zero
+    MIN_VALUE = 1e-3
+    
+    def __init__(self, relative_accuracy=0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = log(self.gamma)
+        self.bins = {}
+        self.zero_count = 0
+        self.count = 0
+    
+    def key(self, value):
+        return ceil(log(value) / self.log_gamma)
+    
+    def add(self, value, weight=1):
+        """Count `value` `weight` times (a negative weight removes it)."""
+        if value <= self.MIN_VALUE:
+            self.zero_count += weight
+        else:
+            key = self.key(value)
+            count = self.bins.get(key, 0) + weight
+            if count > 0:
+                self.bins[key] = count
+            else:
+                self.bins.pop(key, None)
+        self.count += weight
+    
+    def remove(self, value):
+        """Remove one previously added `value`."""
+        self.add(value, -1)
+    
+    def merge(self, other):
+        """Add every value counted by `other` to this sketch."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError('Cannot merge sketches with different accuracy')
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        return self
+    
+    def quantile(self, q):
+        """Return the approximate `q` quantile (0 <= q <= 1), or None if empty."""
+        if self.count <= 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if rank < seen:
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.bins) / (self.gamma + 1)
+    
+    def to_dict(self):
+        """Serialize for a JSONField."""
+        return {
+            'accuracy': self.relative_accuracy,
+            'zero': self.zero_count,
+            'count': self.count,
+            'bins': {str(key): count for key, count in self.bins.items()},
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Restore a sketch serialized with to_dict()."""
+        sketch = cls(data.get('accuracy', 0.01))
+        if data:
+            sketch.zero_count = data['zero']
+            sketch.count = data['count']
+            sketch.bins = {int(key): count for key, count in data['bins'].items()}
+        return sketch
@@ -1,8 +1,672 @@
 """
 Tests for dashboard app.
 """
-from django.test import TestCase
+import asyncio
+import json
+import threading
+import time
+from datetime import timedelta
+from unittest.mock import patch
 
-# Add dashboard tests here if needed
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import pre_delete
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.db.models import F, Sum
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
 
+from incidents.models import Incident, IncidentCategory
+from responses.models import ResponseTeam
+from responses.models import ResponseLog
+from .cache import get_or_compute
+from .consumers import DashboardConsumer
+from .models import IncidentDailyRollup, ResponderDailyStats, ResponseTimeRollup
+from .rollups import (
+    RESPONDER_COUNTERS, bucket_series, rebuild_responder_stats, rebuild_response_time_rollups, rebuild_rollups,
+    stats_deltas
+)
+from .signals import pending_groups
+from .sketches import DDSketch
+from .utils import VIEWERS_KEY, publish_dashboard_delta
 
+User = get_user_model()
+
+
+class DashboardStatsViewTest(TestCase):
+    """Test cases for the dashboard statistics endpoint."""
+    
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        self.admin = User.objects.create_user(username='admin', password='testpass123', role='admin')
+        self.responder = User.objects.create_user(username='responder', password='testpass123', role='responder')
+        self.reporter = User.objects.create_user(username='reporter', password='testpass123', role='reporter')
+        self.category = IncidentCategory.objects.create(name='Fire', priority_level=5)
+        
+        for index, (status, severity) in enumerate([
+            ('reported', 'high'),
+            ('in_progress', 'critical'),
+            ('resolved', 'low'),
+            ('resolved', 'high'),
+        ]):
+            Incident.objects.create(
+                incident_id=f'INC-TEST-{index}',
+                title=f'Incident {index}',
+                description='Test Description',
+                category=self.category,
+                reporter=self.reporter,
+                status=status,
+                severity=severity,
+                latitude=40.7128,
+                longitude=-74.0060,
+                location_address='Test Address'
+            )
+        Incident.objects.filter(status='resolved').update(resolved_at=F('created_at') + timedelta(hours=2))
+        ResponseTeam.objects.create(
+            incident=Incident.objects.get(incident_id='INC-TEST-1'),
+            responder=self.responder,
+            assigned_by=self.admin
+        )
+        self.client = APIClient()
+    
+    def get_stats(self, user):
+        """Fetch dashboard statistics as the given user."""
+        self.client.force_authenticate(user)
+        response = self.client.get('/api/dashboard/stats/')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+    
+    def test_admin_stats(self):
+        """Test admin statistics cover every incident."""
+        stats = self.get_stats(self.admin)
+        self.assertEqual(stats['overview']['total_incidents'], 4)
+        self.assertEqual(stats['overview']['active_incidents'], 2)
+        self.assertEqual(stats['overview']['avg_response_time_hours'], 2.0)
+        self.assertEqual(stats['by_status']['resolved'], 2)
+        self.assertEqual(stats['by_status']['closed'], 0)
+        self.assertEqual(stats['by_severity']['high'], 2)
+        self.assertEqual(stats['response_stats']['total_assignments'], 1)
+    
+    def test_responder_stats(self):
+        """Test responders only see incidents assigned to them."""
+        stats = self.get_stats(self.responder)
+        self.assertEqual(stats['overview']['total_incidents'], 1)
+        self.assertEqual(stats['by_status']['in_progress'], 1)
+        self.assertNotIn('avg_response_time_hours', stats['overview'])
+    
+    def test_query_budget(self):
+        """Test the endpoint runs a fixed number of queries regardless of data size."""
+        self.client.force_authenticate(self.admin)
+        with self.assertNumQueries(7):
+            self.client.get('/api/dashboard/stats/')
+        cache.clear()
+        
+        Incident.objects.bulk_create([
+            Incident(
+                incident_id=f'INC-BULK-{index}',
+                title=f'Bulk {index}',
+                description='Bulk',
+                category=self.category,
+                reporter=self.reporter,
+                status='resolved',
+                latitude=0,
+                longitude=0,
+                location_address='Bulk'
+            )
+            for index in range(50)
+        ])
+        Incident.objects.filter(resolved_at__isnull=True, status='resolved').update(resolved_at=F('created_at'))
+        with self.assertNumQueries(7):
+            self.client.get('/api/dashboard/stats/')
+    
+    def test_stats_are_cached_until_a_write(self):
+        """Test repeat requests are served from cache and writes invalidate it."""
+        first = self.get_stats(self.admin)
+        with self.assertNumQueries(0):
+            self.get_stats(self.admin)
+        
+        Incident.objects.create(
+            incident_id='INC-TEST-NEW',
+            title='New Incident',
+            description='Test Description',
+            category=self.category,
+            reporter=self.reporter,
+            latitude=40.7128,
+            longitude=-74.0060,
+            location_address='Test Address'
+        )
+        second = self.get_stats(self.admin)
+        self.assertEqual(second['overview']['total_incidents'], first['overview']['total_incidents'] + 1)
+    
+    def test_responder_sign_in_keeps_cache(self):
+        """Test a responder's last_login update keeps cached stats, and an availability change drops them."""
+        self.get_stats(self.admin)
+        self.responder.last_login = timezone.now()
+        self.responder.save(update_fields=['last_login'])
+        with self.assertNumQueries(0):
+            self.get_stats(self.admin)
+        
+        self.responder.is_available = False
+        self.responder.save(update_fields=['is_available'])
+        self.assertEqual(self.get_stats(self.admin)['response_stats']['active_responders'], 0)
+    
+    @override_settings(DASHBOARD_CACHE_WAIT=5)
+    def test_concurrent_requests_share_one_computation(self):
+        """Test a request waits for an in-flight computation instead of repeating it."""
+        cache.add('test-entry:lock', 1)
+        
+        def finish():
+            time.sleep(0.1)
+            cache.set('test-entry', 'computed elsewhere')
+        
+        thread = threading.Thread(target=finish)
+        thread.start()
+        try:
+            value = get_or_compute('test-entry', lambda: self.fail('computed twice'))
+        finally:
+            thread.join()
+        self.assertEqual(value, 'computed elsewhere')
+
+
+class IncidentRollupTest(TestCase):
+    """Test cases for the incident daily rollup."""
+    
+    def setUp(self):
+        """Set up test data."""
+        self.reporter = User.objects.create_user(username='reporter', password='testpass123')
+        self.admin = User.objects.create_user(username='admin', password='testpass123', role='admin')
+        self.category = IncidentCategory.objects.create(name='Fire', priority_level=5)
+        self.incident = Incident.objects.create(
+            incident_id='INC-TEST-1',
+            title='Test Incident',
+            description='Test Description',
+            category=self.category,
+            reporter=self.reporter,
+            severity='high',
+            latitude=40.7128,
+            longitude=-74.0060,
+            location_address='Test Address'
+        )
+    
+    def snapshot(self):
+        """Return non-empty rollup rows keyed by (status, severity)."""
+        return {
+            (row.status, row.severity): (row.created, row.resolved)
+            for row in IncidentDailyRollup.objects.all()
+            if row.created or row.resolved
+        }
+    
+    def test_rollup_follows_incident_changes(self):
+        """Test rows move between buckets as an incident changes."""
+        self.assertEqual(self.snapshot(), {('reported', 'high'): (1, 0)})
+        
+        self.incident.status = 'resolved'
+        self.incident.resolved_at = timezone.now()
+        self.incident.save()
+        self.assertEqual(self.snapshot(), {('resolved', 'high'): (1, 1)})
+        
+        incident = Incident.objects.only('id', 'status').get(pk=self.incident.pk)
+        incident.status = 'closed'
+        incident.save(update_fields=['status'])
+        self.assertEqual(self.snapshot(), {('closed', 'high'): (1, 1)})
+        
+        incident.delete()
+        self.assertEqual(self.snapshot(), {})
+    
+    def test_rebuild_matches_incremental(self):
+        """Test a rebuild reproduces the incrementally maintained rows."""
+        self.incident.status = 'resolved'
+        self.incident.resolved_at = self.incident.created_at + timedelta(hours=3)
+        self.incident.save()
+        incremental = self.snapshot()
+        seconds = IncidentDailyRollup.objects.aggregate(total=Sum('resolve_seconds'))['total']
+        
+        rebuild_rollups()
+        self.assertEqual(self.snapshot(), incremental)
+        self.assertEqual(
+            IncidentDailyRollup.objects.aggregate(total=Sum('resolve_seconds'))['total'],
+            seconds
+        )
+    
+    def test_trend_buckets_are_gap_filled(self):
+        """Test trend endpoint returns every bucket in the range."""
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        
+        days = client.get('/api/dashboard/trends/', {'days': 6}).json()
+        self.assertEqual(len(days), 7)
+        self.assertEqual(days[-1]['count'], 1)
+        self.assertEqual(days[-1]['by_status'], 1)
+        self.assertEqual(sum(entry['count'] for entry in days), 1)
+        
+        hours = client.get('/api/dashboard/trends/', {'days': 1, 'bucket': 'hour'}).json()
+        self.assertIn(len(hours), (24, 25))
+        self.assertEqual(sum(entry['count'] for entry in hours), 1)
+        
+        weeks = client.get('/api/dashboard/trends/', {'days': 28, 'bucket': 'week'}).json()
+        self.assertEqual(sum(entry['count'] for entry in weeks), 1)
+        
+        response = client.get('/api/dashboard/trends/', {'bucket': 'month'})
+        self.assertEqual(response.status_code, 400)
+    
+    def test_trend_rejects_bad_days(self):
+        """Test non-numeric, non-positive and oversized windows are 400s."""
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        for params in (
+            {'days': 'abc'},
+            {'days': 0},
+            {'days': 100000},
+            {'days': 30, 'bucket': 'hour'},
+        ):
+            with self.subTest(params=params):
+                response = client.get('/api/dashboard/trends/', params)
+                self.assertEqual(response.status_code, 400)
+        
+        with self.assertRaises(ValueError):
+            bucket_series(timezone.now() - timedelta(days=365), timezone.now(), 'hour')
+
+
+class DDSketchTest(TestCase):
+    """Test cases for the DDSketch quantile sketch."""
+    
+    def test_quantiles_within_relative_accuracy(self):
+        """Test quantiles stay within the configured relative error."""
+        sketch = DDSketch(relative_accuracy=0.01)
+        for value in range(1, 10001):
+            sketch.add(value)
+        for q in (0.5, 0.9, 0.99):
+            expected = q * 9999 + 1
+            self.assertAlmostEqual(sketch.quantile(q), expected, delta=expected * 0.011)
+    
+    def test_merge_remove_and_round_trip(self):
+        """Test merging, removal and serialization."""
+        first = DDSketch()
+        second = DDSketch()
+        for value in range(1, 101):
+            (first if value % 2 else second).add(value)
+        first.merge(DDSketch.from_dict(second.to_dict()))
+        self.assertEqual(first.count, 100)
+        
+        first.remove(100)
+        self.assertEqual(first.count, 99)
+        self.assertAlmostEqual(first.quantile(1), 99, delta=1)
+        self.assertIsNone(DDSketch().quantile(0.5))
+
+
+class ResponseTimeRollupTest(TestCase):
+    """Test cases for response-time percentile rollups."""
+    
+    def setUp(self):
+        """Set up an incident that gets assigned, logged and resolved."""
+        self.admin = User.objects.create_user(username='admin', password='testpass123', role='admin')
+        self.responder = User.objects.create_user(username='responder', password='testpass123', role='responder')
+        self.category = IncidentCategory.objects.create(name='Fire', priority_level=5)
+        self.incident = Incident.objects.create(
+            incident_id='INC-TEST-1',
+            title='Test Incident',
+            description='Test Description',
+            category=self.category,
+            reporter=self.admin,
+            latitude=40.7128,
+            longitude=-74.0060,
+            location_address='Test Address'
+        )
+        ResponseTeam.objects.create(incident=self.incident, responder=self.responder, assigned_by=self.admin)
+        ResponseLog.objects.create(incident=self.incident, responder=self.responder, action='Arrived', details='On scene')
+        ResponseLog.objects.create(incident=self.incident, responder=self.responder, action='Update', details='Contained')
+        self.incident.refresh_from_db()
+        self.incident.status = 'resolved'
+        self.incident.resolved_at = self.incident.created_at + timedelta(hours=1)
+        self.incident.save()
+    
+    def counts(self):
+        """Return the number of durations recorded per metric."""
+        counts = {}
+        for row in ResponseTimeRollup.objects.all():
+            counts[row.metric] = counts.get(row.metric, 0) + DDSketch.from_dict(row.sketch).count
+        return counts
+    
+    def test_first_events_and_resolution_are_recorded(self):
+        """Test each metric records one duration per incident."""
+        self.assertEqual(self.counts(), {
+            'time_to_assign': 1,
+            'time_to_first_log': 1,
+            'time_to_resolve': 1,
+        })
+        
+        self.incident.severity = 'critical'
+        self.incident.save()
+        rows = ResponseTimeRollup.objects.filter(metric='time_to_resolve')
+        self.assertEqual(
+            {row.severity: DDSketch.from_dict(row.sketch).count for row in rows},
+            {'medium': 0, 'critical': 1}
+        )
+    
+    def sketches(self):
+        """Return every non-empty sketch by (day, category, severity, metric)."""
+        return {
+            (row.day, row.category_id, row.severity, row.metric): row.sketch
+            for row in ResponseTimeRollup.objects.all()
+            if row.sketch.get('count')
+        }
+    
+    def assertMatchesRebuild(self):
+        """Assert the incrementally maintained sketches equal a rebuild's."""
+        incremental = self.sketches()
+        rebuild_response_time_rollups()
+        self.assertEqual(self.sketches(), incremental)
+    
+    def test_rebuild_matches_incremental(self):
+        """Test a rebuild records the same durations."""
+        incremental = self.counts()
+        rebuild_response_time_rollups()
+        self.assertEqual(self.counts(), incremental)
+        self.assertMatchesRebuild()
+    
+    def test_category_change_moves_first_events(self):
+        """Test first-assignment and first-log durations follow the incident to its new category."""
+        other = IncidentCategory.objects.create(name='Flood', priority_level=3)
+        self.incident.category = other
+        self.incident.save()
+        rows = ResponseTimeRollup.objects.filter(metric='time_to_assign')
+        self.assertEqual(
+            {row.category_id: DDSketch.from_dict(row.sketch).count for row in rows},
+            {self.category.id: 0, other.id: 1}
+        )
+        self.assertMatchesRebuild()
+    
+    def test_deletes_remove_durations(self):
+        """Test deleting assignments, logs and incidents withdraws their durations."""
+        ResponseLog.objects.filter(incident=self.incident, action='Arrived').delete()
+        self.assertEqual(self.counts()['time_to_first_log'], 1)
+        self.assertMatchesRebuild()
+        
+        ResponseLog.objects.filter(incident=self.incident).delete()
+        ResponseTeam.objects.filter(incident=self.incident).delete()
+        self.assertEqual(self.counts(), {'time_to_assign': 0, 'time_to_first_log': 0, 'time_to_resolve': 1})
+        self.assertMatchesRebuild()
+    
+    def test_incident_delete_removes_all_durations(self):
+        """Test a cascading incident delete leaves no durations behind."""
+        ResponseLog.objects.create(incident=self.incident, responder=self.responder, action='Left', details='Done')
+        self.incident.delete()
+        self.assertEqual(self.counts(), {'time_to_assign': 0, 'time_to_first_log': 0, 'time_to_resolve': 0})
+    
+    def test_rolled_back_delete_is_not_applied_later(self):
+        """Test values captured for a delete that rolls back are dropped, not applied to a later delete."""
+        def fail(sender, **kwargs):
+            raise RuntimeError('delete failed')
+        
+        pre_delete.connect(fail, sender=ResponseLog)
+        try:
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                ResponseLog.objects.filter(incident=self.incident, action='Arrived').delete()
+        finally:
+            pre_delete.disconnect(fail, sender=ResponseLog)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            ResponseLog.objects.filter(incident=self.incident, action='Update').delete()
+        self.assertEqual(pending_groups(), {})
+        self.assertEqual(self.counts()['time_to_first_log'], 1)
+        self.assertMatchesRebuild()
+    
+    def test_delete_then_recreate_counts_once(self):
+        """Test an incident whose only assignment and logs are replaced is counted once."""
+        ResponseTeam.objects.filter(incident=self.incident).delete()
+        ResponseLog.objects.filter(incident=self.incident).delete()
+        ResponseTeam.objects.create(incident=self.incident, responder=self.responder, assigned_by=self.admin)
+        ResponseLog.objects.create(incident=self.incident, responder=self.responder, action='Back', details='On scene')
+        self.assertEqual(self.counts(), {'time_to_assign': 1, 'time_to_first_log': 1, 'time_to_resolve': 1})
+        self.assertMatchesRebuild()
+    
+    def test_endpoint(self):
+        """Test percentiles endpoint output and permissions."""
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        data = client.get('/api/dashboard/response-times/').json()
+        self.assertAlmostEqual(data['time_to_resolve']['p50'], 3600, delta=36)
+        
+        grouped = client.get('/api/dashboard/response-times/', {'group_by': 'category'}).json()
+        self.assertEqual(grouped[0]['category'], self.category.id)
+        
+        for days in ('abc', 100000):
+            response = client.get('/api/dashboard/response-times/', {'days': days})
+            self.assertEqual(response.status_code, 400)
+        
+        client.force_authenticate(self.responder)
+        response = client.get('/api/dashboard/response-times/')
+        self.assertEqual(response.status_code, 403)
+
+
+class ResponderPerformanceTest(TestCase):
+    """Test cases for per-responder daily stats and the analytics endpoint."""
+    
+    def setUp(self):
+        """Set up two responders on one incident that gets logged and resolved."""
+        cache.clear()
+        self.admin = User.objects.create_user(username='admin', password='testpass123', role='admin')
+        self.responder = User.objects.create_user(username='responder', password='testpass123', role='responder')
+        self.idle = User.objects.create_user(username='idle', password='testpass123', role='responder')
+        self.category = IncidentCategory.objects.create(name='Fire', priority_level=5)
+        self.incident = Incident.objects.create(
+            incident_id='INC-TEST-1',
+            title='Test Incident',
+            description='Test Description',
+            category=self.category,
+            reporter=self.admin,
+            latitude=40.7128,
+            longitude=-74.0060,
+            location_address='Test Address'
+        )
+        ResponseTeam.objects.create(incident=self.incident, responder=self.responder, assigned_by=self.admin)
+        ResponseLog.objects.create(incident=self.incident, responder=self.responder, action='Arrived', details='On scene')
+        ResponseLog.objects.create(incident=self.incident, responder=self.responder, action='Update', details='Contained')
+    
+    def totals(self):
+        """Return the summed counters per responder."""
+        return {
+            row['responder_id']: row
+            for row in ResponderDailyStats.objects.values('responder_id').annotate(
+                assignments=Sum('assignments'), logs=Sum('logs'), logged_incidents=Sum('logged_incidents'),
+                first_logs=Sum('first_logs'), resolved=Sum('resolved')
+            )
+        }
+    
+    def resolve(self):
+        """Resolve the incident an hour after it was created."""
+        self.incident.refresh_from_db()
+        self.incident.status = 'resolved'
+        self.incident.resolved_at = self.incident.created_at + timedelta(hours=1)
+        self.incident.save()
+    
+    def test_incremental_counters(self):
+        """Test assignments, logs and resolutions update the responder's row."""
+        self.resolve()
+        totals = self.totals()[self.responder.id]
+        self.assertEqual(
+            (totals['assignments'], totals['logs'], totals['logged_incidents'], totals['first_logs'], totals['resolved']),
+            (1, 2, 1, 1, 1)
+        )
+        
+        # Reopening withdraws the resolution credit
+        self.incident.status = 'in_progress'
+        self.incident.resolved_at = None
+        self.incident.save()
+        self.assertEqual(self.totals()[self.responder.id]['resolved'], 0)
+    
+    def stats(self):
+        """Return every non-empty stats row by (responder, day)."""
+        stats = {}
+        for row in ResponderDailyStats.objects.values('responder_id', 'day', *RESPONDER_COUNTERS):
+            counters = {counter: round(row[counter], 3) for counter in RESPONDER_COUNTERS}
+            if any(counters.values()):
+                stats[(row['responder_id'], row['day'])] = counters
+        return stats
+    
+    def assertMatchesRebuild(self):
+        """Assert the incrementally maintained rows equal a rebuild's."""
+        incremental = self.stats()
+        rebuild_responder_stats()
+        self.assertEqual(self.stats(), incremental)
+    
+    def test_rebuild_matches_incremental(self):
+        """Test a rebuild produces the same totals."""
+        self.resolve()
+        incremental = self.totals()
+        rebuild_responder_stats()
+        self.assertEqual(self.totals(), incremental)
+    
+    def test_rebuild_matches_incremental_after_changes(self):
+        """Test logs before assignment, late assignments and deletes are counted like a rebuild."""
+        # Logged before being assigned: credited once the assignment exists
+        ResponseLog.objects.create(incident=self.incident, responder=self.idle, action='Passing', details='Saw smoke')
+        ResponseTeam.objects.create(incident=self.incident, responder=self.idle, assigned_by=self.admin)
+        self.assertEqual(self.totals()[self.idle.id]['first_logs'], 1)
+        self.assertMatchesRebuild()
+        
+        ResponseLog.objects.filter(incident=self.incident, responder=self.responder, action='Arrived').delete()
+        self.assertEqual(self.totals()[self.responder.id]['logged_incidents'], 1)
+        self.assertMatchesRebuild()
+        
+        # The incident is no longer logged once every log that day is gone
+        ResponseLog.objects.create(incident=self.incident, responder=self.idle, action='Again', details='Still there')
+        ResponseLog.objects.filter(responder=self.idle).delete()
+        self.assertEqual(self.totals()[self.idle.id]['logged_incidents'], 0)
+        self.assertMatchesRebuild()
+        
+        # Assigned after resolution: credited with it
+        self.resolve()
+        late = User.objects.create_user(username='late', password='testpass123', role='responder')
+        ResponseTeam.objects.create(incident=self.incident, responder=late, assigned_by=self.admin)
+        self.assertEqual(self.totals()[late.id]['resolved'], 1)
+        self.assertMatchesRebuild()
+        
+        ResponseTeam.objects.filter(responder=self.responder).delete()
+        self.assertEqual(self.totals()[self.responder.id]['assignments'], 0)
+        self.assertMatchesRebuild()
+    
+    def test_deletes_withdraw_stats(self):
+        """Test deleting an incident or a responder leaves no stats behind."""
+        self.resolve()
+        self.idle.delete()
+        self.responder.delete()
+        self.assertEqual(self.stats(), {})
+        
+        ResponseTeam.objects.create(
+            incident=self.incident,
+            responder=User.objects.create_user(username='other', password='testpass123', role='responder'),
+            assigned_by=self.admin
+        )
+        self.incident.delete()
+        self.assertEqual(self.stats(), {})
+    
+    def test_endpoint(self):
+        """Test the endpoint answers for all responders in one query."""
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        with self.assertNumQueries(1):
+            data = client.get('/api/dashboard/responders/').json()
+        rows = {row['username']: row for row in data}
+        
+        self.assertEqual(rows['responder']['active_assignments'], 1)
+        self.assertEqual(rows['responder']['logs_per_incident'], 2)
+        self.assertIsNone(rows['responder']['avg_time_to_resolve'])
+        self.assertEqual(rows['idle']['assignments'], 0)
+        self.assertIsNone(rows['idle']['avg_time_to_first_log'])
+        
+        self.resolve()
+        cache.clear()
+        rows = {row['username']: row for row in client.get('/api/dashboard/responders/').json()}
+        self.assertEqual(rows['responder']['active_assignments'], 0)
+        self.assertAlmostEqual(rows['responder']['avg_time_to_resolve'], 3600, delta=60)
+        
+        response = client.get('/api/dashboard/responders/', {'days': 'abc'})
+        self.assertEqual(response.status_code, 400)
+        
+        client.force_authenticate(self.responder)
+        response = client.get('/api/dashboard/responders/')
+        self.assertEqual(response.status_code, 403)
+
+
+@override_settings(NOTIFICATION_WS_BATCH_DELAY=0)
+class DashboardDeltaTest(SimpleTestCase):
+    """Test cases for live dashboard deltas."""
+    
+    def test_status_change_deltas(self):
+        """Test a status change moves one count between statuses."""
+        now = timezone.now()
+        old_state = (1, 'high', 'reported', now, None)
+        new_state = (1, 'high', 'resolved', now, now)
+        self.assertEqual(stats_deltas(old_state, new_state, now), {
+            'by_status.reported': -1,
+            'by_status.resolved': 1,
+            'overview.active_incidents': -1,
+            'overview.resolved_today': 1,
+            'overview.resolved_this_week': 1,
+        })
+        self.assertEqual(stats_deltas(None, old_state, now), {
+            'overview.total_incidents': 1,
+            'overview.active_incidents': 1,
+            'by_status.reported': 1,
+            'by_severity.high': 1,
+        })
+    
+    async def test_consumer_merges_pending_deltas(self):
+        """Test deltas queued together are summed into one frame."""
+        frames = []
+        consumer = DashboardConsumer()
+        consumer.init_send_buffer()
+        
+        async def send(text_data=None, bytes_data=None, close=False):
+            frames.append(json.loads(text_data))
+        
+        consumer.send = send
+        await consumer.dashboard_delta({'seq': 1, 'changes': {'by_status.reported': 1, 'overview.total_incidents': 1}})
+        await consumer.dashboard_delta({'seq': 2, 'changes': {'by_status.reported': -1, 'by_status.assigned': 1}})
+        while consumer.flush_task:
+            await asyncio.sleep(0)
+        
+        self.assertEqual(frames, [{
+            'type': 'delta',
+            'data': {'overview.total_incidents': 1, 'by_status.assigned': 1},
+        }])
+    
+    async def test_snapshot_supersedes_earlier_deltas(self):
+        """Test deltas numbered at or before the snapshot's version are dropped."""
+        frames = []
+        consumer = DashboardConsumer()
+        consumer.init_send_buffer()
+        consumer.user = None
+        
+        async def send(text_data=None, bytes_data=None, close=False):
+            frames.append(json.loads(text_data))
+        
+        consumer.send = send
+        await consumer.dashboard_delta({'seq': 4, 'changes': {'by_status.reported': 1}})
+        with patch('dashboard.consumers.adelta_sequence', return_value=5), \
+                patch('dashboard.consumers.get_dashboard_stats', return_value={'by_status': {'reported': 1}}):
+            await consumer.send_snapshot()
+        await consumer.dashboard_delta({'seq': 5, 'changes': {'by_status.reported': 1}})
+        await consumer.dashboard_delta({'seq': 6, 'changes': {'by_status.assigned': 1}})
+        while consumer.flush_task:
+            await asyncio.sleep(0)
+        
+        self.assertEqual(frames, [
+            {'type': 'snapshot', 'version': 5, 'data': {'by_status': {'reported': 1}}},
+            {'type': 'delta', 'data': {'by_status.assigned': 1}},
+        ])
+    
+    def test_publish_skipped_without_viewers(self):
+        """Test deltas are only sent while a live dashboard is open."""
+        cache.delete(VIEWERS_KEY)
+        with patch('dashboard.utils.get_channel_layer', return_value=None) as get_channel_layer:
+            publish_dashboard_delta({'by_status.reported': 1})
+            get_channel_layer.assert_not_called()
+            
+            cache.set(VIEWERS_KEY, True)
+            publish_dashboard_delta({'by_status.reported': 1})
+            get_channel_layer.assert_called_once()
+        cache.delete(VIEWERS_KEY)
@@ -2,11 +2,13 @@
 URLs for dashboard app.
 """
 from django.urls import path
-from .views import DashboardStatsView, IncidentTrendView
+from .views import DashboardStatsView, IncidentTrendView, ResponderPerformanceView, ResponseTimeView
 
 urlpatterns = [
     path('stats/', DashboardStatsView.as_view(), name='dashboard-stats'),
     path('trends/', IncidentTrendView.as_view(), name='incident-trends'),
+    path('response-times/', ResponseTimeView.as_view(), name='response-times'),
+    path('responders/', ResponderPerformanceView.as_view(), name='responder-performance'),
 ]
 
 
@@ -0,0 +1,90 @@
+"""
+Utility functions for dashboard app.
+"""
+import asyncio
+import logging
+
+from django.core.cache import cache
+
+# Make channels optional - only import if available
+try:
+    from channels.layers import get_channel_layer
+    from asgiref.sync import async_to_sync
+    CHANNELS_AVAILABLE = True
+except ImportError:
+    CHANNELS_AVAILABLE = False
+    get_channel_layer = None
+    async_to_sync = None
+
+logger = logging.getLogger(__name__)
+
+DASHBOARD_GROUP = 'dashboard_admin'
+
+# Cache key present while any live dashboard is open, as for the incident
+# feed (see incidents.feed): open dashboards refresh it, and writers skip
+# publishing deltas once it expires.
+VIEWERS_KEY = 'dashboard:viewers'
+VIEWERS_REFRESH_SECONDS = 30
+VIEWERS_TTL = 3 * VIEWERS_REFRESH_SECONDS
+
+# Sequence number of the latest published delta; snapshots record it so
+# consumers drop deltas the snapshot already includes
+DELTA_SEQUENCE_KEY = 'dashboard:delta_seq'
+
+
+def has_viewers():
+    """Whether any live dashboard has been open recently."""
+    return bool(cache.get(VIEWERS_KEY))
+
+
+async def advertise_viewers():
+    """Tell writers in every process that a live dashboard is open."""
+    try:
+        await cache.aset(VIEWERS_KEY, True, VIEWERS_TTL)
+    except Exception:
+        logger.exception('Error advertising dashboard viewers')
+
+
+async def keep_advertising_viewers():
+    """Refresh VIEWERS_KEY until cancelled, e.g. when the dashboard closes."""
+    while True:
+        await asyncio.sleep(VIEWERS_REFRESH_SECONDS)
+        await advertise_viewers()
+
+
+def next_delta_sequence():
+    """Claim the sequence number for a new delta."""
+    try:
+        return cache.incr(DELTA_SEQUENCE_KEY)
+    except ValueError:
+        cache.add(DELTA_SEQUENCE_KEY, 0, None)
+        return cache.incr(DELTA_SEQUENCE_KEY)
+
+
+async def adelta_sequence():
+    """The sequence number of the latest published delta."""
+    return await cache.aget(DELTA_SEQUENCE_KEY, 0)
+
+
+def publish_dashboard_delta(changes):
+    """Send counter changes to live dashboard screens via WebSocket, if any are open."""
+    if not CHANNELS_AVAILABLE or not changes:
+        return
+    
+    try:
+        if not has_viewers():
+            # Nobody would receive it - skip the channel layer entirely
+            return
+        channel_layer = get_channel_layer()
+        if channel_layer:
+            async_to_sync(channel_layer.group_send)(
+                DASHBOARD_GROUP,
+                {
+                    'type': 'dashboard.delta',
+                    'seq': next_delta_sequence(),
+                    'changes': changes,
+                }
+            )
+    except Exception:
+        # Log error but don't fail the incident update
+        logger.exception('Error publishing dashboard delta')
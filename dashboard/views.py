@@ -1,73 +1,128 @@
 """
 Views for dashboard app.
 """
+from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Count, Q, Avg
+from django.db.models import Count, Q, Avg, F, ExpressionWrapper, DurationField
 from django.utils import timezone
 from datetime import datetime, timedelta
 from incidents.models import Incident
+from incidents.scoping import scope_incidents
 from responses.models import ResponseTeam, ResponseLog
 from notifications.models import Notification
 from accounts.models import User
+from .cache import cached_notification_stats, cached_stats
+from .rollups import (
+    PERCENTILE_GROUPS, TREND_BUCKETS, incident_trend, responder_performance, response_time_percentiles
+)
+
+# Longest window, in days, the analytics views accept; hourly trends are capped lower
+MAX_DAYS = 365
+MAX_DAYS_BY_BUCKET = {'hour': 7, 'day': MAX_DAYS, 'week': MAX_DAYS}
+
+
+def parse_days(request, maximum=MAX_DAYS, default=30):
+    """
+    Read the `days` query parameter.
+    
+    Returns (days, None), or (None, a 400 response) when it is not a whole
+    number between 1 and `maximum`.
+    """
+    try:
+        days = int(request.query_params.get('days', default))
+    except ValueError:
+        days = None
+    if days is None or not 1 <= days <= maximum:
+        return None, Response(
+            {'error': f'days must be a whole number between 1 and {maximum}'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    return days, None
+
+
+def get_dashboard_stats(user):
+    """Incident and response statistics for the user's role scope (cached)."""
+    return cached_stats('stats', user, [], lambda: DashboardStatsView().get_scope_stats(user))
 
 
 class DashboardStatsView(APIView):
     """API view for dashboard statistics."""
     permission_classes = [IsAuthenticated]
+    read_replica = True
     
     def get(self, request):
         """Get dashboard statistics."""
         user = request.user
+        stats = get_dashboard_stats(user)
+        stats['notifications'] = cached_notification_stats(
+            user,
+            lambda: Notification.objects.filter(recipient=user).aggregate(
+                unread_count=Count('id', filter=Q(is_read=False)),
+                total_count=Count('id'),
+            )
+        )
+        return Response(stats)
+    
+    def get_scope_stats(self, user):
+        """Compute incident and response statistics for the user's role scope."""
         now = timezone.now()
         last_30_days = now - timedelta(days=30)
         last_7_days = now - timedelta(days=7)
         
         # Base queryset based on user role
+        incidents_qs = scope_incidents(Incident.objects.all(), user)
         if user.role == 'admin':
-            incidents_qs = Incident.objects.all()
             response_teams_qs = ResponseTeam.objects.all()
             response_logs_qs = ResponseLog.objects.all()
         elif user.role == 'responder':
-            incidents_qs = Incident.objects.filter(response_teams__responder=user).distinct()
             response_teams_qs = ResponseTeam.objects.filter(responder=user)
             response_logs_qs = ResponseLog.objects.filter(responder=user)
         else:
-            incidents_qs = Incident.objects.filter(reporter=user)
             response_teams_qs = ResponseTeam.objects.filter(incident__reporter=user)
             response_logs_qs = ResponseLog.objects.filter(incident__reporter=user)
         
+        incident_stats = incidents_qs.aggregate(
+            total_incidents=Count('id'),
+            active_incidents=Count('id', filter=Q(status__in=Incident.ACTIVE_STATUSES)),
+            resolved_today=Count('id', filter=Q(resolved_at__date=now.date())),
+            resolved_this_week=Count('id', filter=Q(resolved_at__gte=last_7_days)),
+            avg_resolve_time=Avg(
+                ExpressionWrapper(F('resolved_at') - F('created_at'), output_field=DurationField()),
+                filter=Q(status='resolved', resolved_at__isnull=False)
+            ),
+            **{
+                f'status_{value}': Count('id', filter=Q(status=value))
+                for value, _ in Incident.STATUS_CHOICES
+            },
+            **{
+                f'severity_{value}': Count('id', filter=Q(severity=value))
+                for value, _ in Incident.SEVERITY_CHOICES
+            },
+        )
         stats = {
             'overview': {
-                'total_incidents': incidents_qs.count(),
-                'active_incidents': incidents_qs.filter(
-                    status__in=['reported', 'assigned', 'in_progress']
-                ).count(),
-                'resolved_today': incidents_qs.filter(
-                    resolved_at__date=now.date()
-                ).count(),
-                'resolved_this_week': incidents_qs.filter(
-                    resolved_at__gte=last_7_days
-                ).count(),
+                'total_incidents': incident_stats['total_incidents'],
+                'active_incidents': incident_stats['active_incidents'],
+                'resolved_today': incident_stats['resolved_today'],
+                'resolved_this_week': incident_stats['resolved_this_week'],
             },
-            'by_status': dict(
-                incidents_qs.values('status')
-                .annotate(count=Count('id'))
-                .values_list('status', 'count')
-            ),
-            'by_severity': dict(
-                incidents_qs.values('severity')
-                .annotate(count=Count('id'))
-                .values_list('severity', 'count')
-            ),
-            'recent_trend': list(
-                incidents_qs.filter(created_at__gte=last_30_days)
-                .extra(select={'day': "date(created_at)"})
-                .values('day')
-                .annotate(count=Count('id'))
-                .order_by('day')
-            ),
+            'by_status': {
+                value: incident_stats[f'status_{value}']
+                for value, _ in Incident.STATUS_CHOICES
+            },
+            'by_severity': {
+                value: incident_stats[f'severity_{value}']
+                for value, _ in Incident.SEVERITY_CHOICES
+            },
+            'recent_trend': [
+                {'day': entry['day'], 'count': entry['count']}
+                for entry in incident_trend(
+                    last_30_days, now, 'day',
+                    incidents_qs=None if user.role == 'admin' else incidents_qs
+                )
+            ],
             'response_stats': {
                 'total_assignments': response_teams_qs.count(),
                 'total_logs': response_logs_qs.count(),
@@ -77,67 +132,110 @@ class DashboardStatsView(APIView):
                     is_active=True
                 ).count(),
             },
-            'notifications': {
-                'unread_count': Notification.objects.filter(
-                    recipient=user,
-                    is_read=False
-                ).count(),
-                'total_count': Notification.objects.filter(recipient=user).count(),
-            }
         }
         
-        # Add average response time for admins
+        # Add average response time and percentiles for admins
         if user.role == 'admin':
-            resolved_incidents = incidents_qs.filter(
-                status='resolved',
-                resolved_at__isnull=False
+            if incident_stats['avg_resolve_time'] is not None:
+                stats['overview']['avg_response_time_hours'] = round(
+                    incident_stats['avg_resolve_time'].total_seconds() / 3600, 2
+                )
+            stats['response_times'] = response_time_percentiles(
+                timezone.localdate(last_30_days), timezone.localdate(now)
             )
-            if resolved_incidents.exists():
-                # Calculate average time to resolve
-                response_times = []
-                for incident in resolved_incidents:
-                    if incident.resolved_at and incident.created_at:
-                        delta = incident.resolved_at - incident.created_at
-                        response_times.append(delta.total_seconds() / 3600)  # hours
-                
-                if response_times:
-                    stats['overview']['avg_response_time_hours'] = round(
-                        sum(response_times) / len(response_times), 2
-                    )
         
-        return Response(stats)
+        return stats
 
 
 class IncidentTrendView(APIView):
     """API view for incident trends."""
     permission_classes = [IsAuthenticated]
+    read_replica = True
     
     def get(self, request):
         """Get incident trends over time."""
         user = request.user
-        days = int(request.query_params.get('days', 30))
+        incidents_qs = scope_incidents(Incident.objects.all(), user)
         
-        if user.role == 'admin':
-            incidents_qs = Incident.objects.all()
-        elif user.role == 'responder':
-            incidents_qs = Incident.objects.filter(response_teams__responder=user).distinct()
-        else:
-            incidents_qs = Incident.objects.filter(reporter=user)
+        bucket = request.query_params.get('bucket', 'day')
+        if bucket not in TREND_BUCKETS:
+            return Response(
+                {'error': f"bucket must be one of {', '.join(TREND_BUCKETS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        days, error = parse_days(request, MAX_DAYS_BY_BUCKET[bucket])
+        if error:
+            return error
         
-        start_date = timezone.now() - timedelta(days=days)
+        end_date = timezone.now()
+        start_date = end_date - timedelta(days=days)
+        
+        # Admins see every incident, which the rollup table already aggregates
+        trends = cached_stats('trends', user, [days, bucket], lambda: incident_trend(
+            start_date, end_date, bucket,
+            incidents_qs=None if user.role == 'admin' else incidents_qs
+        ))
+        
+        return Response(trends)
+
+
+class ResponseTimeView(APIView):
+    """API view for response-time percentiles (admin only)."""
+    permission_classes = [IsAuthenticated]
+    read_replica = True
+    
+    def get(self, request):
+        """Get p50/p90/p99 time-to-assign, time-to-first-log and time-to-resolve in seconds."""
+        if request.user.role != 'admin':
+            return Response(
+                {'error': 'Only admins can view response-time analytics'},
+                status=status.HTTP_403_FORBIDDEN
+            )
         
-        trends = list(
-            incidents_qs.filter(created_at__gte=start_date)
-            .extra(select={'day': "date(created_at)"})
-            .values('day')
-            .annotate(
-                count=Count('id'),
-                by_status=Count('id', filter=Q(status='reported')),
-                resolved=Count('id', filter=Q(status='resolved'))
+        days, error = parse_days(request)
+        if error:
+            return error
+        group_by = request.query_params.get('group_by')
+        if group_by is not None and group_by not in PERCENTILE_GROUPS:
+            return Response(
+                {'error': f"group_by must be one of {', '.join(PERCENTILE_GROUPS)}"},
+                status=status.HTTP_400_BAD_REQUEST
             )
-            .order_by('day')
+        
+        end_day = timezone.localdate()
+        start_day = end_day - timedelta(days=days)
+        percentiles = cached_stats(
+            'response_times', request.user, [days, group_by],
+            lambda: response_time_percentiles(start_day, end_day, group_by)
         )
         
-        return Response(trends)
+        if group_by is None:
+            return Response(percentiles)
+        return Response([
+            {group_by: group, **metrics}
+            for group, metrics in sorted(percentiles.items(), key=lambda item: str(item[0]))
+        ])
 
 
+class ResponderPerformanceView(APIView):
+    """API view for per-responder performance analytics (admin only)."""
+    permission_classes = [IsAuthenticated]
+    read_replica = True
+    
+    def get(self, request):
+        """Get workload, log and timing metrics for every responder over the last `days` days."""
+        if request.user.role != 'admin':
+            return Response(
+                {'error': 'Only admins can view responder analytics'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        days, error = parse_days(request)
+        if error:
+            return error
+        end_day = timezone.localdate()
+        start_day = end_day - timedelta(days=days)
+        return Response(cached_stats(
+            'responders', request.user, [days],
+            lambda: responder_performance(start_day, end_day)
+        ))
@@ -5,25 +5,28 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth import login, authenticate
 from django.contrib import messages
-from django.db.models import Q, Count
+from django.db.models import Q, Count, OuterRef, Subquery
 from django.core.paginator import Paginator
 from django.utils import timezone
 
 from incidents.models import Incident, IncidentCategory
-from responses.models import ResponseTeam, ResponseLog
+from responses.models import ResponderWorkload, ResponseTeam, ResponseLog
 from notifications.models import Notification
 from accounts.models import User
+from accounts.cache import get_role_users
+from dashboard.cache import bump_notifications_version
+from incidents.cache import get_categories
 
 
 def homepage(request):
     """Homepage showing active incidents."""
     # Get active incidents (not resolved or closed)
     active_incidents = Incident.objects.filter(
-        status__in=['reported', 'assigned', 'in_progress']
+        status__in=Incident.ACTIVE_STATUSES
     ).select_related('category', 'reporter').order_by('-created_at')
     
     # Get all categories
-    categories = IncidentCategory.objects.all().order_by('priority_level')
+    categories = get_categories()
     
     # Pagination
     paginator = Paginator(active_incidents, 12)
@@ -100,7 +103,7 @@ def report_incident(request):
         except Exception as e:
             messages.error(request, f'Error reporting incident: {str(e)}')
     
-    categories = IncidentCategory.objects.all().order_by('name')
+    categories = sorted(get_categories(), key=lambda category: category.name)
     context = {
         'categories': categories,
         'severity_choices': Incident.SEVERITY_CHOICES,
@@ -136,7 +139,8 @@ def notifications_list(request):
     
     # Mark as read when viewed
     unread = notifications.filter(is_read=False)
-    unread.update(is_read=True)
+    if unread.update(is_read=True):
+        bump_notifications_version(request.user.id)
     
     # Pagination
     paginator = Paginator(notifications, 15)
@@ -313,35 +317,24 @@ def update_incident_status(request, incident_id):
 
 def team_list(request):
     """List all response teams."""
-    # Get all response teams with details
-    response_teams = ResponseTeam.objects.select_related(
-        'responder', 'incident', 'assigned_by'
-    ).order_by('-assigned_at')
-    
-    # Group by responder
-    teams_by_responder = {}
-    for team in response_teams:
-        responder_id = team.responder.id
-        if responder_id not in teams_by_responder:
-            teams_by_responder[responder_id] = {
-                'responder': team.responder,
-                'teams': [],
-                'total_assignments': 0,
-            }
-        teams_by_responder[responder_id]['teams'].append(team)
-        teams_by_responder[responder_id]['total_assignments'] += 1
-    
-    # Convert to list for pagination
-    teams_list = list(teams_by_responder.values())
+    # Responders with assignments, most recently assigned first; paginated in SQL
+    latest_team = ResponseTeam.objects.filter(
+        responder=OuterRef('responder')
+    ).order_by('-assigned_at').values('id')[:1]
+    workloads = ResponderWorkload.objects.filter(
+        total_count__gt=0
+    ).select_related('responder').annotate(
+        latest_team_id=Subquery(latest_team)
+    ).order_by('-last_assigned_at', 'responder_id')
     
     # Pagination
-    paginator = Paginator(teams_list, 12)
+    paginator = Paginator(workloads, 12)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     
     context = {
         'teams': page_obj,
-        'total_teams': len(teams_by_responder),
+        'total_teams': paginator.count,
     }
     return render(request, 'frontend/team_list.html', context)
 
@@ -433,8 +426,12 @@ def assign_responder(request):
             except Exception as e:
                 messages.error(request, f'Error assigning responder: {str(e)}')
     
-    # Get only responders for dropdown
-    responders = User.objects.filter(role='responder', is_active=True).order_by('username')
+    # Get only responders for dropdown, with their current active assignments
+    active_counts = dict(ResponderWorkload.objects.values_list('responder_id', 'active_count'))
+    responders = [
+        {'responder': responder, 'active_assignments': active_counts.get(responder['id'], 0)}
+        for responder in get_role_users('responder')
+    ]
     
     # Get only reported incidents for dropdown
     reported_incidents = Incident.objects.filter(status='reported').order_by('-created_at')
@@ -4,5 +4,9 @@ from django.apps import AppConfig
 class IncidentsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'incidents'
+    
+    def ready(self):
+        """Import signals when app is ready."""
+        import incidents.signals  # noqa
 
 
@@ -0,0 +1,47 @@
+"""
+Async read views for incidents app.
+
+Native async counterparts of the hottest IncidentViewSet reads, returning
+the same responses without holding a thread under ASGI. Queryset scoping,
+filtering, search, ordering and pagination all come from IncidentViewSet.
+"""
+from qrcs_project.async_api import async_api_view, get_viewset, list_view, render, retrieve_view
+from .serializers import IncidentSerializer
+from .views import IncidentViewSet, calculate_distance
+
+
+@async_api_view
+async def incident_list(request):
+    """List visible incidents, as GET /api/incidents/ does."""
+    return render(await list_view(get_viewset(IncidentViewSet, request, 'list')))
+
+
+@async_api_view
+async def incident_detail(request, pk):
+    """Retrieve a visible incident, as GET /api/incidents/<pk>/ does."""
+    return render(await retrieve_view(get_viewset(IncidentViewSet, request, 'retrieve', pk=pk)))
+
+
+@async_api_view
+async def incidents_nearby(request):
+    """Get incidents near a location, as GET /api/incidents/nearby/ does."""
+    lat = request.GET.get('lat')
+    lng = request.GET.get('lng')
+    if not lat or not lng:
+        return render({'error': 'lat and lng parameters are required'}, 400)
+    try:
+        radius = float(request.GET.get('radius', 5))  # km
+        float(lat), float(lng)
+    except ValueError:
+        return render({'error': 'lat, lng and radius must be numbers'}, 400)
+    
+    nearby = []
+    async for incident in get_viewset(IncidentViewSet, request, 'nearby').get_queryset():
+        distance = calculate_distance(lat, lng, incident.latitude, incident.longitude)
+        if distance <= radius:
+            nearby.append({
+                'incident': IncidentSerializer(incident).data,
+                'distance_km': round(distance, 2)
+            })
+    nearby.sort(key=lambda x: x['distance_km'])
+    return render(nearby)
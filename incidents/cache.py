@@ -0,0 +1,30 @@
+"""
+Cached lookups for incidents app.
+"""
+from django.db import transaction
+
+from qrcs_project.cache import LocalRegistry, cached_queryset, invalidate
+from .models import IncidentCategory
+
+CATEGORIES_NAMESPACE = 'incidents:categories'
+
+
+def cached_categories():
+    """All incident categories in display order, from the shared cache."""
+    return cached_queryset(CATEGORIES_NAMESPACE, IncidentCategory.objects.order_by('priority_level', 'name'))
+
+
+category_registry = LocalRegistry(cached_categories)
+
+
+def get_categories():
+    """All incident categories in display order, from the in-process registry."""
+    return category_registry.get()
+
+
+def invalidate_categories():
+    """Drop cached category lists after a category changes."""
+    invalidate(CATEGORIES_NAMESPACE)
+    category_registry.clear()
+    # Clear again once committed, in case a concurrent read reloaded old rows
+    transaction.on_commit(category_registry.clear)
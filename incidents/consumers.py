@@ -0,0 +1,107 @@
+"""
+WebSocket consumers for incidents app.
+"""
+import json
+from math import isfinite
+
+from channels.generic.websocket import AsyncWebsocketConsumer
+
+from notifications.consumers import BufferedSendMixin
+from .feed import Subscription, advertise_subscribers, ensure_listener, subscription_index
+
+
+class IncidentFeedConsumer(BufferedSendMixin, AsyncWebsocketConsumer):
+    """
+    WebSocket consumer for the live incident map feed.
+    
+    Clients send {"type": "subscribe", "bbox": [min_lat, min_lng, max_lat, max_lng]}
+    with optional "status", "severity" and "category" lists, and then receive
+    incident create/update events inside that area.
+    """
+    single_message_type = 'incident'
+    batch_message_type = 'incidents'
+    
+    async def connect(self):
+        """Handle WebSocket connection."""
+        self.init_send_buffer()
+        self.user = self.scope["user"]
+        if self.user.is_authenticated:
+            await self.accept(self.scope.get('auth_subprotocol'))
+        else:
+            await self.close()
+    
+    async def disconnect(self, close_code):
+        """Handle WebSocket disconnection."""
+        self.cancel_send_buffer()
+        subscription_index.remove(self.channel_name)
+    
+    async def receive(self, text_data):
+        """Handle incoming WebSocket messages."""
+        try:
+            data = json.loads(text_data)
+        except json.JSONDecodeError:
+            return
+        
+        message_type = data.get('type')
+        if message_type == 'ping':
+            await self.send(text_data=json.dumps({'type': 'pong'}))
+        elif message_type == 'subscribe':
+            await self.subscribe(data)
+        elif message_type == 'unsubscribe':
+            subscription_index.remove(self.channel_name)
+    
+    async def subscribe(self, data):
+        """Register (or replace) this connection's bounding box and filters."""
+        try:
+            bbox = [float(value) for value in data['bbox']]
+            min_lat, min_lng, max_lat, max_lng = bbox
+            # json.loads accepts NaN and Infinity, which no range check catches
+            if not all(isfinite(value) for value in bbox):
+                raise ValueError
+            if not (-90 <= min_lat <= max_lat <= 90 and -180 <= min_lng <= max_lng <= 180):
+                raise ValueError
+        except (KeyError, TypeError, ValueError):
+            await self.send(text_data=json.dumps({
+                'type': 'error',
+                'error': 'bbox must be [min_lat, min_lng, max_lat, max_lng] with latitudes in '
+                         '[-90, 90] and longitudes in [-180, 180]'
+            }))
+            return
+        try:
+            statuses = self.filter_values(data, 'status', str)
+            severities = self.filter_values(data, 'severity', str)
+            categories = [int(value) for value in self.filter_values(data, 'category', (int, str))]
+        except ValueError:
+            await self.send(text_data=json.dumps({
+                'type': 'error',
+                'error': 'status and severity must be lists of strings, category a list of ids'
+            }))
+            return
+        
+        subscription_index.add(self.channel_name, Subscription(
+            self,
+            self.user,
+            bbox,
+            statuses=statuses,
+            severities=severities,
+            categories=categories,
+        ))
+        await ensure_listener(self.channel_layer)
+        await advertise_subscribers()
+        await self.send(text_data=json.dumps({'type': 'subscribed', 'bbox': bbox}))
+    
+    @staticmethod
+    def filter_values(data, key, kind):
+        """Return the `key` filter list, raising ValueError unless it is a list of `kind` values."""
+        values = data.get(key)
+        if values is None:
+            return []
+        if not isinstance(values, list) or not all(
+            isinstance(value, kind) and not isinstance(value, bool) for value in values
+        ):
+            raise ValueError(f'{key} must be a list')
+        return values
+    
+    async def incident_event(self, data):
+        """Queue an incident event routed to this connection by the feed."""
+        await self.buffer_event(data['id'], data)
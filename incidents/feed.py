@@ -0,0 +1,205 @@
+"""
+Live incident feed for incidents app.
+
+Map clients subscribe with a bounding box and optional filters. Each server
+process joins the feed group once, and routes incoming incident events to
+its own subscribers through an in-memory grid index, so an event costs one
+channel-layer message per process rather than one per connected client.
+"""
+import asyncio
+import logging
+from collections import defaultdict
+from math import floor
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+FEED_GROUP = 'incident_feed'
+
+# Re-join the feed group well before channels_redis expires membership (24h)
+GROUP_REFRESH_SECONDS = 3600
+
+# Cache key present while any process has feed subscribers. Processes with
+# subscribers refresh it every SUBSCRIBERS_REFRESH_SECONDS; once the last one
+# goes it expires, and writers stop building and sending events. It needs a
+# cache shared by every process (CACHE_BACKEND=redis) to cover writes made
+# outside the web process, e.g. by Celery.
+SUBSCRIBERS_KEY = 'incident_feed:subscribers'
+SUBSCRIBERS_REFRESH_SECONDS = 30
+SUBSCRIBERS_TTL = 3 * SUBSCRIBERS_REFRESH_SECONDS
+
+
+class Subscription:
+    """A client's bounding box and status/severity/category filters."""
+    
+    def __init__(self, consumer, user, bbox, statuses=None, severities=None, categories=None):
+        self.consumer = consumer
+        self.user = user
+        self.min_lat, self.min_lng, self.max_lat, self.max_lng = bbox
+        self.statuses = set(statuses or [])
+        self.severities = set(severities or [])
+        self.categories = set(categories or [])
+    
+    @property
+    def bbox(self):
+        return (self.min_lat, self.min_lng, self.max_lat, self.max_lng)
+    
+    def contains(self, lat, lng):
+        """Check whether a point lies inside the bounding box."""
+        return self.min_lat <= lat <= self.max_lat and self.min_lng <= lng <= self.max_lng
+    
+    def accepts(self, data):
+        """Check filters and visibility for an incident event payload."""
+        if self.statuses and data['status'] not in self.statuses:
+            return False
+        if self.severities and data['severity'] not in self.severities:
+            return False
+        if self.categories and data['category'] not in self.categories:
+            return False
+        if self.user.role == 'admin':
+            return True
+        return data['reporter'] == self.user.id or self.user.id in data['responders']
+
+
+class SubscriptionIndex:
+    """
+    Grid index of subscriptions by bounding box.
+    
+    Boxes are registered in every `cell_size` degree cell they overlap, so a
+    lookup only checks subscriptions near the point. Boxes spanning more than
+    `max_cells` cells are kept in a separate list that every lookup checks.
+    """
+    
+    def __init__(self, cell_size=0.5, max_cells=256):
+        self.cell_size = cell_size
+        self.max_cells = max_cells
+        self.subscriptions = {}
+        self.cells = defaultdict(set)
+        self.wide = set()
+        self.cells_by_key = {}
+    
+    def __len__(self):
+        return len(self.subscriptions)
+    
+    def cell_for(self, lat, lng):
+        return (floor(lat / self.cell_size), floor(lng / self.cell_size))
+    
+    def add(self, key, subscription):
+        """Register or replace the subscription for `key`."""
+        # Before touching the index, so a box that cannot be indexed leaves no entry
+        min_row, min_col = self.cell_for(subscription.min_lat, subscription.min_lng)
+        max_row, max_col = self.cell_for(subscription.max_lat, subscription.max_lng)
+        self.remove(key)
+        self.subscriptions[key] = subscription
+        
+        if (max_row - min_row + 1) * (max_col - min_col + 1) > self.max_cells:
+            self.wide.add(key)
+            return
+        
+        cells = [
+            (row, col)
+            for row in range(min_row, max_row + 1)
+            for col in range(min_col, max_col + 1)
+        ]
+        for cell in cells:
+            self.cells[cell].add(key)
+        self.cells_by_key[key] = cells
+    
+    def remove(self, key):
+        """Drop the subscription for `key`, if any."""
+        if self.subscriptions.pop(key, None) is None:
+            return
+        self.wide.discard(key)
+        for cell in self.cells_by_key.pop(key, []):
+            keys = self.cells[cell]
+            keys.discard(key)
+            if not keys:
+                del self.cells[cell]
+    
+    def match(self, lat, lng):
+        """Return subscriptions whose bounding box contains the point."""
+        keys = list(self.cells.get(self.cell_for(lat, lng), ())) + list(self.wide)
+        return [
+            self.subscriptions[key]
+            for key in keys
+            if self.subscriptions[key].contains(lat, lng)
+        ]
+
+
+# Subscriptions for consumers running in this process
+subscription_index = SubscriptionIndex()
+
+_listener = {'loop': None, 'lock': None, 'task': None}
+
+
+async def ensure_listener(channel_layer):
+    """Start this process's feed listener, joined to the feed group, if it is not already running."""
+    loop = asyncio.get_running_loop()
+    if _listener['loop'] is not loop:
+        _listener.update(loop=loop, lock=asyncio.Lock(), task=None)
+    
+    async with _listener['lock']:
+        task = _listener['task']
+        if task is None or task.done():
+            channel = await channel_layer.new_channel()
+            await channel_layer.group_add(FEED_GROUP, channel)
+            _listener['task'] = loop.create_task(listen(channel_layer, channel))
+
+
+async def listen(channel_layer, channel):
+    """Receive feed events for this process and route them to local subscribers."""
+    refreshers = [
+        asyncio.ensure_future(keep_membership(channel_layer, channel)),
+        asyncio.ensure_future(keep_advertising()),
+    ]
+    try:
+        while True:
+            message = await channel_layer.receive(channel)
+            try:
+                await dispatch(message['data'])
+            except Exception:
+                # Keep the listener alive for the remaining subscribers
+                logger.exception('Error dispatching incident event')
+    finally:
+        for refresher in refreshers:
+            refresher.cancel()
+
+
+async def keep_membership(channel_layer, channel):
+    """Re-join the feed group every GROUP_REFRESH_SECONDS, so long-open screens keep receiving events."""
+    while True:
+        await asyncio.sleep(GROUP_REFRESH_SECONDS)
+        try:
+            await channel_layer.group_add(FEED_GROUP, channel)
+        except Exception:
+            # Retried at the next refresh, well before membership expires
+            logger.exception('Error refreshing incident feed group membership')
+
+
+async def advertise_subscribers():
+    """Tell writers in every process that the feed has subscribers."""
+    try:
+        await cache.aset(SUBSCRIBERS_KEY, True, SUBSCRIBERS_TTL)
+    except Exception:
+        logger.exception('Error advertising incident feed subscribers')
+
+
+async def keep_advertising():
+    """Refresh SUBSCRIBERS_KEY while this process has subscribers."""
+    while True:
+        await asyncio.sleep(SUBSCRIBERS_REFRESH_SECONDS)
+        if len(subscription_index):
+            await advertise_subscribers()
+
+
+def has_subscribers():
+    """Whether any process has advertised feed subscribers recently."""
+    return bool(cache.get(SUBSCRIBERS_KEY))
+
+
+async def dispatch(data):
+    """Deliver an incident event to every matching local subscription."""
+    for subscription in subscription_index.match(data['latitude'], data['longitude']):
+        if subscription.accepts(data):
+            await subscription.consumer.incident_event(data)
@@ -0,0 +1,239 @@
+"""
+Management command to generate realistic data volumes for benchmarking.
+"""
+import random
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from dashboard.rollups import rebuild_responder_stats, rebuild_response_time_rollups, rebuild_rollups
+from incidents.models import Incident, IncidentCategory
+from notifications.models import Notification
+from responses.models import ResponseLog, ResponseTeam
+from responses.workload import rebuild_workloads
+
+User = get_user_model()
+
+DEFAULT_CATEGORIES = [
+    ('Fire', 5), ('Medical', 5), ('Flood', 4), ('Traffic Accident', 3), ('Crime', 3), ('Infrastructure', 2),
+]
+
+LOG_ACTIONS = ['Dispatched', 'Arrived on scene', 'Assessment', 'Update', 'Contained', 'Cleared']
+
+SEVERITY_WEIGHTS = [('low', 30), ('medium', 40), ('high', 20), ('critical', 10)]
+
+
+@contextmanager
+def explicit_timestamps(*fields):
+    """Let bulk inserts set auto_now/auto_now_add fields to generated values."""
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = 'Generate synthetic users, incidents, assignments, logs and notifications'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--incidents', type=int, default=100000, help='Number of incidents')
+        parser.add_argument('--reporters', type=int, default=2000, help='Number of reporters')
+        parser.add_argument('--responders', type=int, default=200, help='Number of responders')
+        parser.add_argument('--admins', type=int, default=5, help='Number of admins')
+        parser.add_argument('--days', type=int, default=365, help='Spread incidents over this many past days')
+        parser.add_argument('--clusters', type=int, default=25, help='Number of incident hotspots')
+        parser.add_argument('--center', default='40.7128,-74.0060', help='Centre of the area as "lat,lng"')
+        parser.add_argument('--spread', type=float, default=0.5, help='Area half-width in degrees')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Incidents inserted per batch')
+        parser.add_argument('--prefix', default='syn', help='Prefix for usernames and incident ids (max 8 chars)')
+        parser.add_argument('--password', default='benchmark123', help='Password for every generated user')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed')
+        parser.add_argument('--skip-rebuild', action='store_true', help='Do not rebuild rollups and workloads')
+    
+    def handle(self, *args, **options):
+        prefix = options['prefix']
+        if len(prefix) > 8:
+            raise CommandError('--prefix must be at most 8 characters')
+        if User.objects.filter(username__startswith=f'{prefix}_').exists():
+            raise CommandError(f'Users with prefix "{prefix}_" already exist; choose another --prefix')
+        
+        self.rng = random.Random(options['seed'])
+        self.now = timezone.now()
+        self.days = options['days']
+        started = time.monotonic()
+        
+        self.categories = self.ensure_categories()
+        self.reporters, self.responders, self.admins = self.create_users(prefix, options)
+        self.hotspots = self.make_hotspots(options)
+        
+        total = options['incidents']
+        batch_size = options['batch_size']
+        counts = {'incidents': 0, 'assignments': 0, 'logs': 0, 'notifications': 0}
+        timestamp_fields = [
+            Incident._meta.get_field('created_at'), Incident._meta.get_field('updated_at'),
+            ResponseTeam._meta.get_field('assigned_at'), ResponseLog._meta.get_field('timestamp'),
+            Notification._meta.get_field('created_at'), Notification._meta.get_field('updated_at'),
+        ]
+        with explicit_timestamps(*timestamp_fields):
+            for start in range(0, total, batch_size):
+                batch = self.insert_batch(prefix, start, min(start + batch_size, total))
+                for name, count in batch.items():
+                    counts[name] += count
+                self.stdout.write(f"  {counts['incidents']}/{total} incidents")
+        
+        if not options['skip_rebuild']:
+            self.stdout.write('Rebuilding rollups and workloads...')
+            rebuild_rollups()
+            rebuild_response_time_rollups()
+            rebuild_responder_stats()
+            rebuild_workloads()
+        
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {counts['incidents']} incidents, {counts['assignments']} assignments, "
+            f"{counts['logs']} logs and {counts['notifications']} notifications "
+            f"in {time.monotonic() - started:.1f}s. "
+            f"Log in as {prefix}_admin_0 / {options['password']}"
+        ))
+    
+    def ensure_categories(self):
+        """Use the existing categories, creating a default set if there are none."""
+        categories = list(IncidentCategory.objects.all())
+        if not categories:
+            categories = IncidentCategory.objects.bulk_create([
+                IncidentCategory(name=name, priority_level=priority) for name, priority in DEFAULT_CATEGORIES
+            ])
+        return categories
+    
+    def create_users(self, prefix, options):
+        """Create reporters, responders and admins sharing one password hash."""
+        password = make_password(options['password'])
+        users = {}
+        for role, count in (('reporter', options['reporters']), ('responder', options['responders']),
+                            ('admin', options['admins'])):
+            users[role] = User.objects.bulk_create([
+                User(
+                    username=f'{prefix}_{role}_{i}',
+                    email=f'{prefix}_{role}_{i}@example.com',
+                    password=password,
+                    role=role,
+                    is_staff=role == 'admin',
+                )
+                for i in range(count)
+            ], batch_size=1000)
+            if not users[role]:
+                raise CommandError(f'At least one {role} is required')
+        return users['reporter'], users['responder'], users['admin']
+    
+    def make_hotspots(self, options):
+        """Pick hotspot centres and weights; busy areas get most incidents."""
+        try:
+            lat, lng = (float(value) for value in options['center'].split(','))
+        except ValueError:
+            raise CommandError('--center must look like "40.7128,-74.0060"')
+        spread = options['spread']
+        return [
+            (
+                lat + self.rng.uniform(-spread, spread),
+                lng + self.rng.uniform(-spread, spread),
+                self.rng.uniform(0.005, 0.05),
+                self.rng.paretovariate(1.5),
+            )
+            for _ in range(max(options['clusters'], 1))
+        ]
+    
+    def location(self):
+        """Draw a point from a weighted hotspot with Gaussian scatter."""
+        lat, lng, sigma, _ = self.rng.choices(self.hotspots, weights=[h[3] for h in self.hotspots])[0]
+        return round(self.rng.gauss(lat, sigma), 6), round(self.rng.gauss(lng, sigma), 6)
+    
+    def lifecycle(self, created_at):
+        """Return (status, resolved_at): old incidents are mostly resolved or closed."""
+        age = self.now - created_at
+        if age < timedelta(days=2) and self.rng.random() < 0.7:
+            return self.rng.choice(Incident.ACTIVE_STATUSES), None
+        if self.rng.random() < 0.05:
+            return self.rng.choice(Incident.ACTIVE_STATUSES), None
+        resolved_at = min(created_at + timedelta(hours=self.rng.lognormvariate(1, 1)), self.now)
+        return self.rng.choice(['resolved', 'closed']), resolved_at
+    
+    def insert_batch(self, prefix, start, end):
+        """Insert incidents [start, end) and their assignments, logs and notifications."""
+        rng = self.rng
+        severities, weights = zip(*SEVERITY_WEIGHTS)
+        incidents = []
+        for n in range(start, end):
+            created_at = self.now - timedelta(seconds=rng.uniform(0, self.days * 86400))
+            status, resolved_at = self.lifecycle(created_at)
+            category = rng.choice(self.categories)
+            lat, lng = self.location()
+            incidents.append(Incident(
+                incident_id=f'{prefix.upper()}-{n}',
+                title=f'{category.name} reported',
+                description=f'Synthetic {category.name.lower()} incident #{n}',
+                category=category,
+                reporter=rng.choice(self.reporters),
+                status=status,
+                severity=rng.choices(severities, weights=weights)[0],
+                latitude=lat,
+                longitude=lng,
+                location_address=f'{rng.randint(1, 999)} Synthetic Street',
+                created_at=created_at,
+                updated_at=resolved_at or created_at,
+                resolved_at=resolved_at,
+            ))
+        
+        teams, logs, notifications = [], [], []
+        with transaction.atomic():
+            Incident.objects.bulk_create(incidents)
+            for incident in incidents:
+                notifications.append(self.notification(
+                    rng.choice(self.admins), incident, 'incident_created', 'New Incident Reported', incident.created_at
+                ))
+                if incident.status == 'reported':
+                    continue
+                end_at = incident.resolved_at or self.now
+                assigned_at = min(incident.created_at + timedelta(minutes=rng.expovariate(1 / 15)), end_at)
+                for responder in rng.sample(self.responders, min(rng.randint(1, 3), len(self.responders))):
+                    teams.append(ResponseTeam(
+                        incident=incident, responder=responder, assigned_by=rng.choice(self.admins),
+                        assigned_at=assigned_at, is_lead=not teams or teams[-1].incident is not incident,
+                    ))
+                    notifications.append(self.notification(
+                        responder, incident, 'incident_assigned', 'New Incident Assignment', assigned_at
+                    ))
+                    for _ in range(rng.randint(0, 5)):
+                        logs.append(ResponseLog(
+                            incident=incident, responder=responder,
+                            action=rng.choice(LOG_ACTIONS), details='Synthetic log entry',
+                            timestamp=assigned_at + (end_at - assigned_at) * rng.random(),
+                        ))
+                if incident.resolved_at:
+                    notifications.append(self.notification(
+                        incident.reporter, incident, 'status_update', 'Incident Status Updated', incident.resolved_at
+                    ))
+            ResponseTeam.objects.bulk_create(teams, batch_size=5000)
+            ResponseLog.objects.bulk_create(logs, batch_size=5000)
+            Notification.objects.bulk_create(notifications, batch_size=5000)
+        return {
+            'incidents': len(incidents), 'assignments': len(teams),
+            'logs': len(logs), 'notifications': len(notifications),
+        }
+    
+    def notification(self, recipient, incident, notification_type, title, created_at):
+        """Build a notification; anything older than a week has been read."""
+        return Notification(
+            recipient=recipient, incident=incident, notification_type=notification_type,
+            title=title, message=f'{title}: {incident.incident_id}',
+            is_read=self.now - created_at > timedelta(days=7) or self.rng.random() < 0.5,
+            created_at=created_at, updated_at=created_at,
+        )
@@ -0,0 +1,37 @@
+# Generated by Django 5.0.1 on 2026-10-19 12:28
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+ACTIVE_INDEX_SQL = (
+    "CREATE INDEX IF NOT EXISTS incidents_active_created_idx ON incidents (created_at DESC) "
+    "WHERE status IN ('reported', 'assigned', 'in_progress')"
+)
+
+
+def create_active_index(apps, schema_editor):
+    # Partial index for the homepage; only PostgreSQL can use it with bound parameters
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(ACTIVE_INDEX_SQL)
+
+
+def drop_active_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS incidents_active_created_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('incidents', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='incident',
+            index=models.Index(fields=['reporter', '-created_at'], name='incidents_reporter_created_idx'),
+        ),
+        migrations.RunPython(create_active_index, drop_active_index),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.0.1 on 2026-10-19 16:40
+
+from django.db import migrations, models
+
+
+ACTIVE_INDEX = models.Index(
+    fields=['-created_at'],
+    condition=models.Q(status__in=['reported', 'assigned', 'in_progress']),
+    name='incidents_active_created_idx',
+)
+
+
+def add_active_index(apps, schema_editor):
+    # 0002 already created the index on PostgreSQL with raw SQL
+    if schema_editor.connection.vendor != 'postgresql':
+        schema_editor.add_index(apps.get_model('incidents', 'Incident'), ACTIVE_INDEX)
+
+
+def remove_active_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        schema_editor.remove_index(apps.get_model('incidents', 'Incident'), ACTIVE_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('incidents', '0002_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(add_active_index, remove_active_index),
+            ],
+            state_operations=[
+                migrations.AddIndex(model_name='incident', index=ACTIVE_INDEX),
+            ],
+        ),
+    ]
@@ -42,6 +42,9 @@ class Incident(models.Model):
         ('critical', 'Critical'),
     ]
     
+    # Statuses of incidents still being worked on
+    ACTIVE_STATUSES = ['reported', 'assigned', 'in_progress']
+    
     incident_id = models.CharField(max_length=20, unique=True, editable=False)
     title = models.CharField(max_length=200)
     description = models.TextField()
@@ -68,6 +71,17 @@ class Incident(models.Model):
             models.Index(fields=['status', 'severity']),
             models.Index(fields=['created_at']),
             models.Index(fields=['latitude', 'longitude']),
+            # My incidents: reporter's incidents, newest first
+            models.Index(fields=['reporter', '-created_at'], name='incidents_reporter_created_idx'),
+            # Homepage: active incidents, newest first. The condition lists
+            # ACTIVE_STATUSES, which Meta cannot refer to. SQLite cannot match
+            # partial indexes against bound parameters, so there the query
+            # is served from created_at.
+            models.Index(
+                fields=['-created_at'],
+                condition=models.Q(status__in=['reported', 'assigned', 'in_progress']),
+                name='incidents_active_created_idx'
+            ),
         ]
     
     def save(self, *args, **kwargs):
@@ -0,0 +1,26 @@
+"""
+Role-based incident visibility for incidents app.
+"""
+from responses.models import ResponseTeam
+
+
+def assigned_incident_ids(user):
+    """Subquery of the ids of incidents `user` is assigned to."""
+    return ResponseTeam.objects.filter(responder=user).values('incident_id')
+
+
+def scope_incidents(queryset, user):
+    """
+    Restrict an Incident queryset to the incidents `user` may see.
+    
+    Admins see everything, responders the incidents they are assigned to and
+    reporters their own. Responder scoping is a semi-join on the
+    (responder, incident) index rather than a join plus DISTINCT, so it never
+    duplicates rows, aggregates stay correct, and the cost follows the
+    responder's own assignments rather than the size of the incidents table.
+    """
+    if user.role == 'admin':
+        return queryset
+    if user.role == 'responder':
+        return queryset.filter(id__in=assigned_incident_ids(user))
+    return queryset.filter(reporter=user)
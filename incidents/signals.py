@@ -0,0 +1,63 @@
+"""
+Signals for incidents app.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save, pre_save
+from django.dispatch import receiver
+from .cache import invalidate_categories
+from .models import Incident, IncidentCategory
+from .utils import publish_incident_event
+
+# Fields whose stored values post_save handlers elsewhere compare against:
+# the dashboard rollups and responder workloads
+TRACKED_FIELDS = ('category_id', 'severity', 'status', 'created_at', 'resolved_at')
+
+
+def tracked_values(incident):
+    """The incident's current values of TRACKED_FIELDS."""
+    return {field: getattr(incident, field) for field in TRACKED_FIELDS}
+
+
+@receiver(post_init, sender=Incident)
+def remember_stored_values(sender, instance, **kwargs):
+    """Record the loaded values of the tracked fields, unless some were deferred."""
+    if instance.pk is None:
+        instance._stored_values = None
+    elif not instance.get_deferred_fields().intersection(TRACKED_FIELDS):
+        instance._stored_values = tracked_values(instance)
+
+
+@receiver(pre_save, sender=Incident)
+def load_previous_values(sender, instance, raw=False, **kwargs):
+    """
+    Set instance._previous_values to the stored values this save replaces.
+    
+    None for new incidents. Instances loaded with tracked fields deferred
+    fetch them here, once.
+    """
+    if raw:
+        return
+    if not hasattr(instance, '_stored_values'):
+        instance._stored_values = Incident.objects.filter(pk=instance.pk).values(*TRACKED_FIELDS).first()
+    instance._previous_values = instance._stored_values
+
+
+@receiver(post_save, sender=Incident)
+def remember_saved_values(sender, instance, raw=False, **kwargs):
+    """The saved values are what the next save replaces."""
+    if not raw:
+        instance._stored_values = tracked_values(instance)
+
+
+@receiver(post_save, sender=Incident)
+def handle_incident_saved(sender, instance, created, **kwargs):
+    """Publish incident create/update events to the live feed once committed."""
+    event = 'created' if created else 'updated'
+    transaction.on_commit(lambda: publish_incident_event(instance, event))
+
+
+@receiver(post_save, sender=IncidentCategory)
+@receiver(post_delete, sender=IncidentCategory)
+def invalidate_category_cache(sender, **kwargs):
+    """Drop cached category lists when a category changes."""
+    invalidate_categories()
@@ -1,9 +1,25 @@
 """
 Tests for incidents app.
 """
-from django.test import TestCase
+import asyncio
+from io import StringIO
+from unittest.mock import patch
+
+from channels.testing import WebsocketCommunicator
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Q
+from django.test import SimpleTestCase, TestCase, override_settings
 from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from .consumers import IncidentFeedConsumer
+from .feed import FEED_GROUP, SUBSCRIBERS_KEY, Subscription, SubscriptionIndex, dispatch, keep_membership, subscription_index
+from notifications.models import Notification
+from responses.models import ResponderWorkload, ResponseTeam
 from .models import Incident, IncidentCategory
+from .scoping import scope_incidents
+from .utils import incident_event_payload, publish_incident_event
 
 User = get_user_model()
 
@@ -59,3 +75,319 @@ class IncidentModelTest(TestCase):
         self.assertEqual(self.category.priority_level, 5)
 
 
+
+
+class IncidentFeedTest(SimpleTestCase):
+    """Test cases for routing live incident feed events."""
+    
+    def setUp(self):
+        """Set up users and a recording consumer."""
+        self.admin = User(id=1, username='admin', role='admin')
+        self.responder = User(id=2, username='responder', role='responder')
+        self.events = []
+        
+        test = self
+        
+        class Consumer:
+            async def incident_event(self, data):
+                test.events.append(data)
+        
+        self.consumer = Consumer()
+    
+    def event(self, **overrides):
+        """Build an incident event payload."""
+        data = {
+            'id': 1,
+            'status': 'reported',
+            'severity': 'high',
+            'category': 3,
+            'latitude': 40.7128,
+            'longitude': -74.0060,
+            'reporter': 9,
+            'responders': [],
+        }
+        data.update(overrides)
+        return data
+    
+    def test_index_matches_containing_boxes_only(self):
+        """Test lookups return only boxes containing the point."""
+        index = SubscriptionIndex(cell_size=0.5)
+        nyc = Subscription(self.consumer, self.admin, (40.5, -74.3, 41.0, -73.7))
+        london = Subscription(self.consumer, self.admin, (51.3, -0.5, 51.7, 0.3))
+        world = Subscription(self.consumer, self.admin, (-90, -180, 90, 180))
+        index.add('nyc', nyc)
+        index.add('london', london)
+        index.add('world', world)
+        self.assertIn('world', index.wide)
+        
+        matches = index.match(40.7128, -74.0060)
+        self.assertIn(nyc, matches)
+        self.assertIn(world, matches)
+        self.assertNotIn(london, matches)
+        
+        index.remove('nyc')
+        self.assertEqual(index.match(40.7128, -74.0060), [world])
+        self.assertEqual(len(index), 2)
+    
+    def test_filters_and_visibility(self):
+        """Test status filters and role visibility."""
+        subscription = Subscription(
+            self.consumer, self.responder, (40, -75, 41, -74), statuses=['reported']
+        )
+        self.assertFalse(subscription.accepts(self.event()))
+        self.assertTrue(subscription.accepts(self.event(responders=[2])))
+        self.assertFalse(subscription.accepts(self.event(responders=[2], status='closed')))
+    
+    async def test_dispatch_routes_to_matching_subscribers(self):
+        """Test dispatch delivers only to subscribers in range."""
+        subscription_index.add('inside', Subscription(self.consumer, self.admin, (40, -75, 41, -74)))
+        subscription_index.add('outside', Subscription(self.consumer, self.admin, (10, 10, 11, 11)))
+        try:
+            await dispatch(self.event())
+        finally:
+            subscription_index.remove('inside')
+            subscription_index.remove('outside')
+        self.assertEqual(len(self.events), 1)
+    
+    async def test_group_membership_refreshed(self):
+        """Test the listener keeps re-joining the feed group while it runs."""
+        joined = []
+        
+        class ChannelLayer:
+            async def group_add(self, group, channel):
+                joined.append((group, channel))
+        
+        with patch('incidents.feed.GROUP_REFRESH_SECONDS', 0.01):
+            task = asyncio.ensure_future(keep_membership(ChannelLayer(), 'feed-channel'))
+            await asyncio.sleep(0.05)
+            task.cancel()
+        self.assertGreaterEqual(len(joined), 2)
+        self.assertEqual(set(joined), {(FEED_GROUP, 'feed-channel')})
+    
+    @override_settings(CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}})
+    async def test_subscribe_rejects_malformed_filters(self):
+        """Test filters that are not lists of strings or ids are rejected."""
+        communicator = WebsocketCommunicator(IncidentFeedConsumer.as_asgi(), '/ws/incidents/feed/')
+        communicator.scope['user'] = self.admin
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        for filters in [{'status': 'reported'}, {'severity': [1]}, {'category': '12'}, {'category': ['x']}]:
+            with self.subTest(filters=filters):
+                await communicator.send_json_to({'type': 'subscribe', 'bbox': [40, -75, 41, -74], **filters})
+                response = await communicator.receive_json_from()
+                self.assertEqual(response['type'], 'error')
+        await communicator.disconnect()
+        self.assertEqual(len(subscription_index), 0)
+    
+    @override_settings(CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}})
+    async def test_subscribe_rejects_invalid_bbox(self):
+        """Test non-finite and out-of-range coordinates are rejected without registering."""
+        communicator = WebsocketCommunicator(IncidentFeedConsumer.as_asgi(), '/ws/incidents/feed/')
+        communicator.scope['user'] = self.admin
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        for bbox in ['[NaN, -75, 41, -74]', '[40, -Infinity, 41, -74]', '[40, -75, 91, -74]', '[40, -181, 41, -74]']:
+            with self.subTest(bbox=bbox):
+                await communicator.send_to(text_data='{"type": "subscribe", "bbox": %s}' % bbox)
+                response = await communicator.receive_json_from()
+                self.assertEqual(response['type'], 'error')
+        await communicator.disconnect()
+        self.assertEqual(len(subscription_index), 0)
+    
+    def test_unindexable_bbox_leaves_no_entry(self):
+        """Test a box the grid cannot index is not half-registered."""
+        index = SubscriptionIndex()
+        with self.assertRaises(ValueError):
+            index.add('nan', Subscription(None, self.admin, (float('nan'), 0, 1, 1)))
+        self.assertEqual(len(index), 0)
+    
+    def test_filter_values(self):
+        """Test well-formed filter lists are accepted."""
+        data = {'status': ['reported', 'assigned'], 'category': [3, '4']}
+        self.assertEqual(IncidentFeedConsumer.filter_values(data, 'status', str), ['reported', 'assigned'])
+        self.assertEqual(IncidentFeedConsumer.filter_values(data, 'severity', str), [])
+        self.assertEqual(IncidentFeedConsumer.filter_values(data, 'category', (int, str)), [3, '4'])
+
+
+class IncidentEventPayloadTest(TestCase):
+    """Test cases for incident feed payloads."""
+    
+    def test_payload(self):
+        """Test payload carries location and visibility fields."""
+        user = User.objects.create_user(username='testuser', password='testpass123')
+        category = IncidentCategory.objects.create(name='Fire')
+        incident = Incident.objects.create(
+            title='Test',
+            description='Test',
+            category=category,
+            reporter=user,
+            latitude=40.7128,
+            longitude=-74.0060,
+            location_address='Test'
+        )
+        data = incident_event_payload(incident)
+        self.assertEqual(data['latitude'], 40.7128)
+        self.assertEqual(data['reporter'], user.id)
+        self.assertEqual(data['responders'], [])
+    
+    def test_publish_skipped_without_subscribers(self):
+        """Test events are only built and sent while some process has feed subscribers."""
+        user = User.objects.create_user(username='testuser', password='testpass123')
+        category = IncidentCategory.objects.create(name='Fire')
+        incident = Incident.objects.create(
+            title='Test',
+            description='Test',
+            category=category,
+            reporter=user,
+            latitude=40.7128,
+            longitude=-74.0060,
+            location_address='Test'
+        )
+        cache.delete(SUBSCRIBERS_KEY)
+        with patch('incidents.utils.get_channel_layer') as get_channel_layer, self.assertNumQueries(0):
+            publish_incident_event(incident, 'updated')
+        get_channel_layer.assert_not_called()
+        
+        cache.set(SUBSCRIBERS_KEY, True)
+        self.addCleanup(cache.delete, SUBSCRIBERS_KEY)
+        with patch('incidents.utils.get_channel_layer') as get_channel_layer, patch('incidents.utils.async_to_sync'):
+            publish_incident_event(incident, 'updated')
+        get_channel_layer.assert_called_once()
+
+
+class IncidentScopingTest(TestCase):
+    """Test cases for role-based incident scoping."""
+    
+    def setUp(self):
+        """Set up incidents with two responders sharing one of them."""
+        self.admin = User.objects.create_user(username='admin', password='testpass123', role='admin')
+        self.reporter = User.objects.create_user(username='reporter', password='testpass123', role='reporter')
+        self.responder = User.objects.create_user(username='responder', password='testpass123', role='responder')
+        self.other = User.objects.create_user(username='other', password='testpass123', role='responder')
+        category = IncidentCategory.objects.create(name='Fire', priority_level=5)
+        self.incidents = [
+            Incident.objects.create(
+                incident_id=f'INC-TEST-{i}',
+                title=f'Test Incident {i}',
+                description='Test Description',
+                category=category,
+                reporter=self.reporter if i == 0 else self.admin,
+                latitude=40.7128,
+                longitude=-74.0060,
+                location_address='Test Address'
+            )
+            for i in range(3)
+        ]
+        for responder in (self.responder, self.other):
+            ResponseTeam.objects.create(incident=self.incidents[0], responder=responder, assigned_by=self.admin)
+        ResponseTeam.objects.create(incident=self.incidents[1], responder=self.responder, assigned_by=self.admin)
+    
+    def test_scopes(self):
+        """Test each role sees the right incidents without duplicates or joins."""
+        def ids(user):
+            return sorted(scope_incidents(Incident.objects.all(), user).values_list('incident_id', flat=True))
+        
+        self.assertEqual(len(ids(self.admin)), 3)
+        self.assertEqual(ids(self.responder), ['INC-TEST-0', 'INC-TEST-1'])
+        self.assertEqual(ids(self.other), ['INC-TEST-0'])
+        self.assertEqual(ids(self.reporter), ['INC-TEST-0'])
+        
+        sql = str(scope_incidents(Incident.objects.all(), self.responder).query).upper()
+        self.assertNotIn('DISTINCT', sql)
+        self.assertNotIn('JOIN', sql)
+    
+    def test_api_counts(self):
+        """Test the incident list and dashboard counts match the responder's assignments."""
+        client = APIClient()
+        client.force_authenticate(self.responder)
+        self.assertEqual(client.get('/api/incidents/').json()['count'], 2)
+        stats = client.get('/api/dashboard/stats/').json()
+        self.assertEqual(stats['overview']['total_incidents'], 2)
+
+
+class HotQueryIndexTest(TestCase):
+    """EXPLAIN-based checks that the hot list queries are served by their indexes."""
+    
+    def setUp(self):
+        """Set up incidents, mostly closed as in production, with notifications."""
+        self.user = User.objects.create_user(username='reporter', password='testpass123', role='reporter')
+        category = IncidentCategory.objects.create(name='Fire', priority_level=5)
+        statuses = ['reported', 'in_progress'] + ['resolved', 'closed'] * 20
+        for i, status in enumerate(statuses):
+            incident = Incident.objects.create(
+                incident_id=f'INC-TEST-{i}',
+                title=f'Test Incident {i}',
+                description='Test Description',
+                category=category,
+                reporter=self.user,
+                status=status,
+                latitude=40.7128,
+                longitude=-74.0060,
+                location_address='Test Address'
+            )
+            Notification.objects.create(
+                recipient=self.user, incident=incident, notification_type='status_update',
+                title='Update', message='Status changed'
+            )
+        # Give the planner statistics, as production databases have
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+    
+    def assertUsesIndex(self, queryset, index_name):
+        """Assert the query plan reads through `index_name` without sorting."""
+        if connection.vendor == 'postgresql':
+            # Tiny test tables would otherwise always be sequentially scanned
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+        plan = queryset.explain()
+        self.assertIn(index_name, plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+        self.assertNotIn('Sort', plan)
+    
+    def test_my_incidents(self):
+        """Test a reporter's incidents, newest first."""
+        self.assertUsesIndex(
+            Incident.objects.filter(reporter=self.user).order_by('-created_at'),
+            'incidents_reporter_created_idx'
+        )
+    
+    def test_active_incidents(self):
+        """Test the homepage's active incidents, newest first."""
+        if connection.vendor == 'postgresql':
+            index_name = 'incidents_active_created_idx'
+        else:
+            index_name = next(index.name for index in Incident._meta.indexes if index.fields == ['created_at'])
+        self.assertUsesIndex(
+            Incident.objects.filter(status__in=Incident.ACTIVE_STATUSES).order_by('-created_at'),
+            index_name
+        )
+    
+    def test_active_index_matches_active_statuses(self):
+        """Test the partial index covers exactly Incident.ACTIVE_STATUSES."""
+        index = next(index for index in Incident._meta.indexes if index.name == 'incidents_active_created_idx')
+        self.assertEqual(index.condition, Q(status__in=Incident.ACTIVE_STATUSES))
+    
+    def test_notifications(self):
+        """Test a recipient's notifications, newest first."""
+        self.assertUsesIndex(
+            Notification.objects.filter(recipient=self.user).order_by('-created_at'),
+            'notif_recipient_created_idx'
+        )
+
+
+class SyntheticDataCommandTest(TestCase):
+    """Test cases for the synthetic data generator."""
+    
+    def test_generates_consistent_data(self):
+        """Test a small run creates linked rows and rebuilds derived tables."""
+        call_command(
+            'generate_synthetic_data', incidents=50, reporters=5, responders=3, admins=1,
+            batch_size=20, stdout=StringIO()
+        )
+        self.assertEqual(Incident.objects.count(), 50)
+        self.assertTrue(ResponseTeam.objects.exists())
+        self.assertFalse(Incident.objects.filter(status__in=['resolved', 'closed'], resolved_at__isnull=True).exists())
+        self.assertEqual(
+            sum(ResponderWorkload.objects.values_list('total_count', flat=True)),
+            ResponseTeam.objects.count()
+        )
@@ -0,0 +1,62 @@
+"""
+Utility functions for incidents app.
+"""
+import logging
+
+# Make channels optional - only import if available
+try:
+    from channels.layers import get_channel_layer
+    from asgiref.sync import async_to_sync
+    CHANNELS_AVAILABLE = True
+except ImportError:
+    CHANNELS_AVAILABLE = False
+    get_channel_layer = None
+    async_to_sync = None
+
+from .feed import FEED_GROUP, has_subscribers
+
+logger = logging.getLogger(__name__)
+
+
+def incident_event_payload(incident):
+    """Build the live feed payload for an incident."""
+    return {
+        'id': incident.id,
+        'incident_id': incident.incident_id,
+        'title': incident.title,
+        'status': incident.status,
+        'severity': incident.severity,
+        'category': incident.category_id,
+        'latitude': float(incident.latitude),
+        'longitude': float(incident.longitude),
+        'location_address': incident.location_address,
+        'reporter': incident.reporter_id,
+        'responders': list(incident.response_teams.values_list('responder_id', flat=True)),
+        'updated_at': incident.updated_at.isoformat(),
+    }
+
+
+def publish_incident_event(incident, event):
+    """Send an incident create/update event to the live feed, if anyone is subscribed."""
+    if not CHANNELS_AVAILABLE:
+        # Channels not installed - skip live feed
+        return
+    
+    try:
+        if not has_subscribers():
+            # Nobody would receive it - skip the responders query and the send
+            return
+        channel_layer = get_channel_layer()
+        if channel_layer:
+            data = incident_event_payload(incident)
+            data['event'] = event
+            async_to_sync(channel_layer.group_send)(
+                FEED_GROUP,
+                {
+                    'type': 'incident.event',
+                    'data': data,
+                }
+            )
+    except Exception:
+        # Log error but don't fail the incident update
+        logger.exception('Error publishing incident event')
@@ -11,9 +11,10 @@ from django.db.models import Q
 from django.utils import timezone
 from math import radians, cos, sin, asin, sqrt
 
+from .cache import cached_categories
 from .models import Incident, IncidentCategory
+from .scoping import scope_incidents
 from .serializers import IncidentSerializer, IncidentCategorySerializer, IncidentStatusUpdateSerializer
-from accounts.models import User
 from notifications.utils import create_notification
 
 
@@ -33,7 +34,12 @@ class IncidentCategoryViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = IncidentCategory.objects.all()
     serializer_class = IncidentCategorySerializer
     permission_classes = [IsAuthenticated]
+    read_replica = True
     pagination_class = None  # No pagination for categories
+    
+    def list(self, request, *args, **kwargs):
+        """List categories from the shared cache."""
+        return Response(self.get_serializer(cached_categories(), many=True).data)
 
 
 class IncidentViewSet(viewsets.ModelViewSet):
@@ -41,6 +47,7 @@ class IncidentViewSet(viewsets.ModelViewSet):
     queryset = Incident.objects.all()
     serializer_class = IncidentSerializer
     permission_classes = [IsAuthenticated]
+    read_replica = True
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['status', 'severity', 'category']
     search_fields = ['title', 'description', 'location_address', 'incident_id']
@@ -49,31 +56,21 @@ class IncidentViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Filter queryset based on user role."""
-        user = self.request.user
         queryset = Incident.objects.select_related('category', 'reporter').all()
-        
-        if user.role == 'admin':
-            return queryset
-        elif user.role == 'responder':
-            # Responders see incidents assigned to them
-            return queryset.filter(response_teams__responder=user).distinct()
-        else:
-            # Reporters see only their own incidents
-            return queryset.filter(reporter=user)
+        # Admins see all incidents, responders those assigned to them, reporters their own
+        return scope_incidents(queryset, self.request.user)
     
     def perform_create(self, serializer):
         """Create incident and notify admins."""
         incident = serializer.save()
         # Notify admins
-        admins = User.objects.filter(role='admin', is_active=True)
-        for admin in admins:
-            create_notification(
-                recipient=admin,
-                incident=incident,
-                notification_type='incident_created',
-                title='New Incident Reported',
-                message=f'New incident: {incident.title}'
-            )
+        create_notification(
+            recipient_role='admin',
+            incident=incident,
+            notification_type='incident_created',
+            title='New Incident Reported',
+            message=f'New incident: {incident.title}'
+        )
     
     @action(detail=True, methods=['post'])
     def update_status(self, request, pk=None):
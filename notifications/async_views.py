@@ -0,0 +1,12 @@
+"""
+Async read views for notifications app.
+"""
+from qrcs_project.async_api import async_api_view, render
+from .models import Notification
+
+
+@async_api_view
+async def unread_count(request):
+    """Get count of unread notifications, as GET /api/notifications/unread_count/ does."""
+    count = await Notification.objects.filter(recipient=request.user, is_read=False).acount()
+    return render({'unread_count': count})
@@ -1,19 +1,96 @@
 """
 WebSocket consumers for notifications app.
 """
+import asyncio
 import json
+from collections import Counter, OrderedDict
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
+from django.conf import settings
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
+# Process-wide WebSocket delivery counters: buffered, batched, dropped, resyncs
+consumer_metrics = Counter()
 
-class NotificationConsumer(AsyncWebsocketConsumer):
+
+class BufferedSendMixin:
+    """
+    Bounded per-connection send buffer for WebSocket consumers.
+    
+    Events are queued and flushed as one frame after a short delay, so a burst
+    of events costs the client a single wake-up. If the buffer overflows the
+    backlog is discarded and the client receives one 'resync' frame telling it
+    to reload state over the REST API.
+    """
+    single_message_type = 'notification'
+    batch_message_type = 'notifications'
+    
+    def init_send_buffer(self):
+        """Set up buffer state; call from connect() before accepting."""
+        self.send_buffer = OrderedDict()
+        self.needs_resync = False
+        self.flush_task = None
+    
+    async def buffer_event(self, key, data):
+        """Queue an event for delivery, replacing any queued event with the same key."""
+        if self.needs_resync:
+            consumer_metrics['dropped'] += 1
+            return
+        
+        self.send_buffer.pop(key, None)
+        self.send_buffer[key] = data
+        consumer_metrics['buffered'] += 1
+        
+        if len(self.send_buffer) > settings.NOTIFICATION_WS_BUFFER_SIZE:
+            consumer_metrics['dropped'] += len(self.send_buffer)
+            self.send_buffer.clear()
+            self.needs_resync = True
+        
+        if self.flush_task is None:
+            self.flush_task = asyncio.ensure_future(self.flush_send_buffer())
+    
+    async def flush_send_buffer(self):
+        """Send queued events until the buffer is empty."""
+        try:
+            while self.send_buffer or self.needs_resync:
+                await asyncio.sleep(settings.NOTIFICATION_WS_BATCH_DELAY)
+                
+                if self.needs_resync:
+                    self.needs_resync = False
+                    consumer_metrics['resyncs'] += 1
+                    await self.send(text_data=json.dumps({'type': 'resync'}))
+                    continue
+                
+                batch = list(self.send_buffer.values())
+                self.send_buffer.clear()
+                if len(batch) == 1:
+                    await self.send(text_data=json.dumps({
+                        'type': self.single_message_type,
+                        'data': batch[0]
+                    }))
+                else:
+                    consumer_metrics['batched'] += len(batch)
+                    await self.send(text_data=json.dumps({
+                        'type': self.batch_message_type,
+                        'data': batch
+                    }))
+        finally:
+            self.flush_task = None
+    
+    def cancel_send_buffer(self):
+        """Stop any pending flush; call from disconnect()."""
+        if getattr(self, 'flush_task', None):
+            self.flush_task.cancel()
+
+
+class NotificationConsumer(BufferedSendMixin, AsyncWebsocketConsumer):
     """WebSocket consumer for real-time notifications."""
     
     async def connect(self):
         """Handle WebSocket connection."""
+        self.init_send_buffer()
         self.user = self.scope["user"]
         if self.user.is_authenticated:
             self.room_group_name = f'notifications_{self.user.id}'
@@ -22,12 +99,13 @@ class NotificationConsumer(AsyncWebsocketConsumer):
                 self.room_group_name,
                 self.channel_name
             )
-            await self.accept()
+            await self.accept(self.scope.get('auth_subprotocol'))
         else:
             await self.close()
     
     async def disconnect(self, close_code):
         """Handle WebSocket disconnection."""
+        self.cancel_send_buffer()
         if hasattr(self, 'room_group_name'):
             await self.channel_layer.group_discard(
                 self.room_group_name,
@@ -46,10 +124,7 @@ class NotificationConsumer(AsyncWebsocketConsumer):
             pass
     
     async def notification_message(self, event):
-        """Send notification to WebSocket."""
-        await self.send(text_data=json.dumps({
-            'type': 'notification',
-            'data': event['data']
-        }))
+        """Queue notification for delivery to WebSocket."""
+        await self.buffer_event(event['data']['id'], event['data'])
 
 
@@ -0,0 +1,21 @@
+"""
+Management command to purge old read notifications without celery.
+"""
+from django.core.management.base import BaseCommand
+
+from notifications.utils import purge_read_notifications
+
+
+class Command(BaseCommand):
+    help = 'Delete read notifications older than the retention period'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help='Retention period in days')
+        parser.add_argument('--batch-size', type=int, help='Rows deleted per transaction')
+    
+    def handle(self, *args, **options):
+        result = purge_read_notifications(days=options['days'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Deleted {result['deleted']} notifications in {result['batches']} batches "
+            f"({result['seconds']}s)"
+        ))
@@ -25,7 +25,9 @@ class Notification(models.Model):
     message = models.TextField()
     
     is_read = models.BooleanField(default=False)
+    coalesced_count = models.PositiveIntegerField(default=1)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         db_table = 'notifications'
@@ -33,6 +35,8 @@ class Notification(models.Model):
         indexes = [
             models.Index(fields=['recipient', 'is_read']),
             models.Index(fields=['created_at']),
+            # Notification list: a recipient's notifications, newest first
+            models.Index(fields=['recipient', '-created_at'], name='notif_recipient_created_idx'),
         ]
     
     def __str__(self):
@@ -0,0 +1,21 @@
+"""
+Celery tasks for notifications app.
+"""
+import logging
+
+from celery import shared_task
+
+from .utils import purge_read_notifications as purge
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def purge_read_notifications(days=None, batch_size=None):
+    """Delete old read notifications; scheduled nightly by celery-beat."""
+    result = purge(days=days, batch_size=batch_size)
+    logger.info(
+        "Purged %(deleted)s read notifications in %(batches)s batches (%(seconds)ss)",
+        result
+    )
+    return result
@@ -1,10 +1,16 @@
 """
 Tests for notifications app.
 """
-from django.test import TestCase
+import asyncio
+import json
+from datetime import timedelta
+from django.test import SimpleTestCase, TestCase, override_settings
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 from incidents.models import Incident, IncidentCategory
+from .consumers import NotificationConsumer, consumer_metrics
 from .models import Notification
+from .utils import create_notification, purge_read_notifications
 
 User = get_user_model()
 
@@ -47,3 +53,157 @@ class NotificationModelTest(TestCase):
         self.assertEqual(notification.notification_type, 'incident_created')
 
 
+
+
+class NotificationCoalescingTest(TestCase):
+    """Test cases for notification coalescing."""
+    
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123',
+            role='reporter'
+        )
+        self.category = IncidentCategory.objects.create(
+            name='Fire',
+            priority_level=5
+        )
+        self.incident = Incident.objects.create(
+            title='Test Incident',
+            description='Test Description',
+            category=self.category,
+            reporter=self.user,
+            latitude=40.7128,
+            longitude=-74.0060,
+            location_address='Test Address'
+        )
+    
+    def notify(self, message, **kwargs):
+        """Send a coalescable status update to the test user."""
+        return create_notification(
+            recipient=self.user,
+            incident=self.incident,
+            notification_type='status_update',
+            title='Response Update',
+            message=message,
+            coalesce=True,
+            **kwargs
+        )
+    
+    def test_updates_are_merged(self):
+        """Test repeated updates within the window share one row."""
+        first = self.notify('Arrived at scene')[0]
+        second = self.notify('Fire contained')[0]
+        self.assertEqual(first.id, second.id)
+        self.assertEqual(Notification.objects.count(), 1)
+        notification = Notification.objects.get()
+        self.assertEqual(notification.coalesced_count, 2)
+        self.assertEqual(notification.message, 'Fire contained')
+    
+    def test_merged_notification_moves_to_top(self):
+        """Test a merged update is listed ahead of notifications created since the first one."""
+        first = self.notify('Arrived at scene')[0]
+        other = Notification.objects.create(
+            recipient=self.user, notification_type='message', title='Other', message='Other'
+        )
+        self.notify('Fire contained')
+        self.assertEqual(list(Notification.objects.values_list('id', flat=True)), [first.id, other.id])
+    
+    def test_read_notification_is_not_merged(self):
+        """Test a new row is created once the previous one has been read."""
+        self.notify('Arrived at scene')
+        Notification.objects.update(is_read=True)
+        self.notify('Fire contained')
+        self.assertEqual(Notification.objects.count(), 2)
+    
+    @override_settings(NOTIFICATION_COALESCE_WINDOW=0)
+    def test_coalescing_disabled(self):
+        """Test a zero window disables coalescing."""
+        self.notify('Arrived at scene')
+        self.notify('Fire contained')
+        self.assertEqual(Notification.objects.count(), 2)
+
+
+class NotificationRetentionTest(TestCase):
+    """Test cases for purging old notifications."""
+    
+    def setUp(self):
+        """Set up old and recent, read and unread notifications."""
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123',
+            role='reporter'
+        )
+        for is_read in (True, False):
+            for _ in range(3):
+                Notification.objects.create(
+                    recipient=self.user,
+                    notification_type='message',
+                    title='Old',
+                    message='Old message',
+                    is_read=is_read
+                )
+        Notification.objects.update(created_at=timezone.now() - timedelta(days=100))
+        Notification.objects.create(
+            recipient=self.user,
+            notification_type='message',
+            title='Recent',
+            message='Recent message',
+            is_read=True
+        )
+    
+    def test_purge_removes_only_old_read_notifications(self):
+        """Test only read notifications past the retention period are deleted."""
+        result = purge_read_notifications(days=90, batch_size=2)
+        self.assertEqual(result['deleted'], 3)
+        self.assertEqual(result['batches'], 2)
+        self.assertEqual(Notification.objects.count(), 4)
+        self.assertFalse(Notification.objects.filter(title='Old', is_read=True).exists())
+
+
+@override_settings(NOTIFICATION_WS_BUFFER_SIZE=3, NOTIFICATION_WS_BATCH_DELAY=0)
+class NotificationConsumerBufferTest(SimpleTestCase):
+    """Test cases for NotificationConsumer send buffering."""
+    
+    def setUp(self):
+        """Set up a consumer that records outgoing frames."""
+        self.frames = []
+        self.consumer = NotificationConsumer()
+        self.consumer.init_send_buffer()
+        
+        async def send(text_data=None, bytes_data=None, close=False):
+            self.frames.append(json.loads(text_data))
+        
+        self.consumer.send = send
+    
+    async def deliver(self, *ids):
+        """Queue notifications and wait for the buffer to drain."""
+        for notification_id in ids:
+            await self.consumer.notification_message({
+                'type': 'notification_message',
+                'data': {'id': notification_id, 'title': f'Notification {notification_id}'}
+            })
+        while self.consumer.flush_task:
+            await asyncio.sleep(0)
+    
+    async def test_single_event_is_sent_as_notification(self):
+        """Test a lone event keeps the original frame format."""
+        await self.deliver(1)
+        self.assertEqual(self.frames, [{'type': 'notification', 'data': {'id': 1, 'title': 'Notification 1'}}])
+    
+    async def test_burst_is_batched(self):
+        """Test events queued together go out in one frame."""
+        batched = consumer_metrics['batched']
+        await self.deliver(1, 2, 2)
+        self.assertEqual(len(self.frames), 1)
+        self.assertEqual(self.frames[0]['type'], 'notifications')
+        self.assertEqual([item['id'] for item in self.frames[0]['data']], [1, 2])
+        self.assertEqual(consumer_metrics['batched'] - batched, 2)
+    
+    async def test_overflow_collapses_to_resync(self):
+        """Test a client that falls too far behind receives one resync frame."""
+        dropped = consumer_metrics['dropped']
+        await self.deliver(1, 2, 3, 4, 5)
+        self.assertEqual(self.frames, [{'type': 'resync'}])
+        self.assertEqual(consumer_metrics['dropped'] - dropped, 5)
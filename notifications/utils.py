@@ -11,13 +11,19 @@ except ImportError:
     get_channel_layer = None
     async_to_sync = None
 
-from django.contrib.auth import get_user_model
-from .models import Notification
+import time
+from datetime import timedelta
 
-User = get_user_model()
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from accounts.cache import get_role_users
+from dashboard.cache import bump_notifications_version
+from .models import Notification
 
 
-def create_notification(recipient=None, recipient_role=None, incident=None, notification_type='message', title='', message=''):
+def create_notification(recipient=None, recipient_role=None, incident=None, notification_type='message', title='', message='', coalesce=False):
     """
     Create a notification and send via WebSocket.
     
@@ -28,10 +34,19 @@ def create_notification(recipient=None, recipient_role=None, incident=None, noti
         notification_type: Type of notification
         title: Notification title
         message: Notification message
+        coalesce: Merge into a recent unread notification for the same
+            recipient, incident and type instead of creating a new row
     """
     notifications_created = []
     
     if recipient:
+        if coalesce:
+            notification = coalesce_notification(recipient, incident, notification_type, title, message)
+            if notification:
+                notifications_created.append(notification)
+                send_websocket_notification(recipient.id, notification)
+                return notifications_created
+        
         # Send to specific user
         notification = Notification.objects.create(
             recipient=recipient,
@@ -45,21 +60,55 @@ def create_notification(recipient=None, recipient_role=None, incident=None, noti
     
     elif recipient_role:
         # Send to all users with specific role
-        users = User.objects.filter(role=recipient_role, is_active=True)
-        for user in users:
+        for user in get_role_users(recipient_role):
             notification = Notification.objects.create(
-                recipient=user,
+                recipient_id=user['id'],
                 incident=incident,
                 notification_type=notification_type,
                 title=title,
                 message=message
             )
             notifications_created.append(notification)
-            send_websocket_notification(user.id, notification)
+            send_websocket_notification(user['id'], notification)
     
     return notifications_created
 
 
+def coalesce_notification(recipient, incident, notification_type, title, message):
+    """
+    Merge a notification into the latest unread one for the same
+    (recipient, incident, type) created within NOTIFICATION_COALESCE_WINDOW.
+    
+    Returns the updated notification, or None if there was nothing to merge into.
+    """
+    window = getattr(settings, 'NOTIFICATION_COALESCE_WINDOW', 0)
+    if not window or incident is None:
+        return None
+    
+    since = timezone.now() - timedelta(seconds=window)
+    with transaction.atomic():
+        notification = Notification.objects.select_for_update().filter(
+            recipient=recipient,
+            incident=incident,
+            notification_type=notification_type,
+            is_read=False,
+            created_at__gte=since
+        ).order_by('-created_at').first()
+        if notification is None:
+            return None
+        
+        notification.title = title
+        notification.message = message
+        notification.coalesced_count = F('coalesced_count') + 1
+        # Move the merged row to the top of the -created_at ordering, like a new one
+        notification.created_at = timezone.now()
+        notification.save(update_fields=['title', 'message', 'coalesced_count', 'created_at', 'updated_at'])
+        notification.refresh_from_db(fields=['coalesced_count'])
+    
+    notification.incident = incident
+    return notification
+
+
 def send_websocket_notification(user_id, notification):
     """Send notification via WebSocket."""
     if not CHANNELS_AVAILABLE:
@@ -79,7 +128,9 @@ def send_websocket_notification(user_id, notification):
                         'message': notification.message,
                         'notification_type': notification.notification_type,
                         'is_read': notification.is_read,
+                        'coalesced_count': notification.coalesced_count,
                         'created_at': notification.created_at.isoformat(),
+                        'updated_at': notification.updated_at.isoformat(),
                         'incident_id': notification.incident.incident_id if notification.incident else None,
                     }
                 }
@@ -88,3 +139,50 @@ def send_websocket_notification(user_id, notification):
         # Log error but don't fail notification creation
         print(f"Error sending WebSocket notification: {e}")
 
+
+
+def purge_read_notifications(days=None, batch_size=None):
+    """
+    Delete read notifications older than `days` in batches of `batch_size`.
+    
+    Each batch is deleted in its own short transaction so the table is never
+    locked for the whole run. Defaults come from NOTIFICATION_RETENTION_DAYS
+    and NOTIFICATION_RETENTION_BATCH_SIZE.
+    
+    Returns:
+        dict with the number of rows deleted, batches run and seconds taken
+    """
+    if days is None:
+        days = settings.NOTIFICATION_RETENTION_DAYS
+    if batch_size is None:
+        batch_size = settings.NOTIFICATION_RETENTION_BATCH_SIZE
+    
+    cutoff = timezone.now() - timedelta(days=days)
+    started = time.monotonic()
+    deleted = 0
+    batches = 0
+    
+    while True:
+        rows = list(
+            Notification.objects.filter(is_read=True, created_at__lt=cutoff)
+            .order_by('created_at')
+            .values_list('id', 'recipient_id')[:batch_size]
+        )
+        if not rows:
+            break
+        
+        with transaction.atomic():
+            count, _ = Notification.objects.filter(id__in=[row[0] for row in rows]).delete()
+        for recipient_id in {row[1] for row in rows}:
+            bump_notifications_version(recipient_id)
+        deleted += count
+        batches += 1
+        
+        if len(rows) < batch_size:
+            break
+    
+    return {
+        'deleted': deleted,
+        'batches': batches,
+        'seconds': round(time.monotonic() - started, 3),
+    }
@@ -9,6 +9,7 @@ from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import OrderingFilter
 from django.db.models import Q
 
+from dashboard.cache import bump_notifications_version
 from .models import Notification
 from .serializers import NotificationSerializer
 
@@ -17,6 +18,7 @@ class NotificationViewSet(viewsets.ModelViewSet):
     """ViewSet for Notification model."""
     serializer_class = NotificationSerializer
     permission_classes = [IsAuthenticated]
+    read_replica = True
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_fields = ['notification_type', 'is_read']
     ordering_fields = ['created_at']
@@ -26,12 +28,17 @@ class NotificationViewSet(viewsets.ModelViewSet):
         """Return notifications for current user only."""
         return Notification.objects.filter(
             recipient=self.request.user
-        ).select_related('incident')
+        ).select_related('incident', 'incident__category', 'incident__reporter')
     
     def perform_create(self, serializer):
         """Create notification (usually done via utils, but allow API creation)."""
         serializer.save(recipient=self.request.user)
     
+    def perform_destroy(self, instance):
+        """Delete notification and refresh the recipient's cached counts."""
+        instance.delete()
+        bump_notifications_version(instance.recipient_id)
+    
     @action(detail=True, methods=['post'])
     def mark_read(self, request, pk=None):
         """Mark notification as read."""
@@ -52,6 +59,7 @@ class NotificationViewSet(viewsets.ModelViewSet):
             recipient=request.user,
             is_read=False
         ).update(is_read=True)
+        bump_notifications_version(request.user.id)
         return Response({'status': 'success', 'marked_read': count})
     
     @action(detail=False, methods=['get'])
@@ -3,19 +3,21 @@ ASGI config for qrcs_project project.
 """
 import os
 from django.core.asgi import get_asgi_application
-from channels.routing import ProtocolTypeRouter, URLRouter
-from channels.auth import AuthMiddlewareStack
-from . import routing
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'qrcs_project.settings')
 
+# Initialise Django before importing consumers, which load models
+django_asgi_app = get_asgi_application()
+
+from channels.routing import ProtocolTypeRouter, URLRouter  # noqa: E402
+from accounts.middleware import JWTAuthMiddleware  # noqa: E402
+from . import routing  # noqa: E402
+
 application = ProtocolTypeRouter({
-    "http": get_asgi_application(),
-    "websocket": AuthMiddlewareStack(
+    "http": django_asgi_app,
+    "websocket": JWTAuthMiddleware(
         URLRouter(
             routing.websocket_urlpatterns
         )
     ),
 })
-
-
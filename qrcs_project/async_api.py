@@ -0,0 +1,170 @@
+"""
+Helpers for native async API views.
+
+DRF views are synchronous, so under ASGI every request to one holds a thread
+for its whole duration. The async read endpoints are plain Django async
+views built on the async ORM. These helpers give them the same JWT
+authentication, response rendering and error bodies as their DRF
+counterparts, and run a viewset's own queryset, filter backends, paginator
+and serializer, so each endpoint behaves like the viewset action it mirrors.
+"""
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage
+from django.http import HttpResponse
+from rest_framework.exceptions import APIException, NotFound
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+User = get_user_model()
+
+
+def render(data, status=200):
+    """Render `data` with the API's default renderer, as a DRF Response would be."""
+    renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+    return HttpResponse(renderer.render(data), status=status, content_type=renderer.media_type)
+
+
+def error(detail, status, **extra):
+    """Render a DRF-style error body."""
+    return render({'detail': detail, **extra}, status)
+
+
+def unauthenticated(detail, **extra):
+    """401 response carrying the challenge JWTAuthentication would send."""
+    response = error(detail, 401, **extra)
+    response['WWW-Authenticate'] = f'{jwt_settings.AUTH_HEADER_TYPES[0]} realm="api"'
+    return response
+
+
+def get_raw_token(request):
+    """Return the bearer token from the Authorization header, or None if absent."""
+    parts = request.META.get(jwt_settings.AUTH_HEADER_NAME, '').split()
+    if not parts or parts[0] not in jwt_settings.AUTH_HEADER_TYPES:
+        return None
+    if len(parts) != 2:
+        return ''
+    return parts[1]
+
+
+def async_api_view(view):
+    """
+    Turn an async view into an authenticated, read-only API endpoint.
+    
+    Resolves request.user from the JWT access token with one query, as
+    JWTAuthentication does, and answers missing or invalid credentials and
+    non-GET methods with DRF's status codes and bodies. API exceptions
+    raised by the view go through DRF's exception handler. Being read-only,
+    these views read from replicas when any are configured.
+    """
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        raw_token = get_raw_token(request)
+        if raw_token is None:
+            return unauthenticated('Authentication credentials were not provided.')
+        try:
+            token = AccessToken(raw_token)
+        except TokenError:
+            return unauthenticated('Given token not valid for any token type', code='token_not_valid')
+        
+        try:
+            user = await User.objects.aget(**{jwt_settings.USER_ID_FIELD: token[jwt_settings.USER_ID_CLAIM]})
+        except (KeyError, User.DoesNotExist):
+            return unauthenticated('User not found', code='user_not_found')
+        if not user.is_active:
+            return unauthenticated('User is inactive', code='user_inactive')
+        
+        if request.method != 'GET':
+            return error(f'Method "{request.method}" not allowed.', 405)
+        request.user = user
+        try:
+            return await view(request, *args, **kwargs)
+        except APIException as exc:
+            handled = api_settings.EXCEPTION_HANDLER(exc, {'request': request})
+            response = render(handled.data, handled.status_code)
+            for header, value in handled.items():
+                response[header] = value
+            return response
+    
+    wrapper.read_replica = True
+    return wrapper
+
+
+def get_viewset(viewset_class, request, action, **kwargs):
+    """Return `viewset_class` set up for `request` and `action`, as its router's view would be."""
+    view = viewset_class(action=action, args=(), kwargs=kwargs, format_kwarg=None)
+    view.request = Request(request)
+    # Already authenticated by async_api_view
+    view.request.user = request.user
+    return view
+
+
+async def filter_queryset(view, queryset):
+    """
+    Apply the viewset's filter backends to `queryset`.
+    
+    Runs in a thread, since validating filter parameters may read the
+    database, e.g. to check a related choice exists.
+    """
+    return await sync_to_async(view.filter_queryset)(queryset)
+
+
+async def paginate_queryset(view, queryset):
+    """
+    Async view.paginate_queryset(): return the requested page's rows.
+    
+    Uses the viewset's paginator, which keeps the page for
+    get_paginated_response(). Returns None when the viewset does not
+    paginate; raises NotFound for an invalid page.
+    """
+    paginator = view.paginator
+    if paginator is None:
+        return None
+    page_size = paginator.get_page_size(view.request)
+    if not page_size:
+        return None
+    
+    django_paginator = paginator.django_paginator_class(queryset, page_size)
+    # Count up front, asynchronously; Paginator caches it for page()
+    django_paginator.count = await queryset.acount()
+    page_number = paginator.get_page_number(view.request, django_paginator)
+    try:
+        page = django_paginator.page(page_number)
+    except InvalidPage as exc:
+        raise NotFound(paginator.invalid_page_message.format(page_number=page_number, message=str(exc)))
+    page.object_list = [row async for row in page.object_list]
+    paginator.page = page
+    paginator.request = view.request
+    return page.object_list
+
+
+async def list_view(view):
+    """Async ListModelMixin.list(): return the response data for the viewset's list action."""
+    queryset = await filter_queryset(view, view.get_queryset())
+    page = await paginate_queryset(view, queryset)
+    if page is not None:
+        return view.get_paginated_response(view.get_serializer(page, many=True).data).data
+    return view.get_serializer([row async for row in queryset], many=True).data
+
+
+async def retrieve_view(view):
+    """
+    Async RetrieveModelMixin.retrieve(): return the response data for one object.
+    
+    Looks the object up in the filtered queryset, as get_object() does, and
+    checks object permissions, which must not query the database.
+    """
+    queryset = await filter_queryset(view, view.get_queryset())
+    lookup_url_kwarg = view.lookup_url_kwarg or view.lookup_field
+    try:
+        instance = await queryset.aget(**{view.lookup_field: view.kwargs[lookup_url_kwarg]})
+    except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError):
+        raise NotFound()
+    view.check_object_permissions(view.request, instance)
+    return view.get_serializer(instance).data
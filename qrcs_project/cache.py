@@ -0,0 +1,178 @@
+"""
+Shared cache helpers for qrcs_project.
+
+Entries are grouped into namespaces, each with a version number stored in
+the cache itself. Keys embed the current version, so bumping it invalidates
+every entry in the namespace at once, in every process, without enumerating
+keys; stale entries are never read and simply expire.
+"""
+import asyncio
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .db_routers import primary_reads
+
+# How long a computing caller holds the lock, and how often others poll for its result
+LOCK_TIMEOUT = 30
+POLL_INTERVAL = 0.05
+
+# Every LocalRegistry in the process, for clear_registries()
+registries = []
+
+
+def get_version(namespace):
+    """Return the current version of `namespace`, initialising it if missing."""
+    key = f'{namespace}:version'
+    version = cache.get(key)
+    if version is None:
+        # Start from a timestamp so a lost version key never reuses old entries
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def invalidate(namespace):
+    """Invalidate every entry in `namespace`."""
+    key = f'{namespace}:version'
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def versioned_key(namespace, *parts):
+    """Build a key for `parts` under the namespace's current version."""
+    return ':'.join([namespace, str(get_version(namespace)), *(str(part) for part in parts)])
+
+
+def get_or_compute(key, compute, timeout=None, wait=None):
+    """
+    Return the cached value for `key`, computing it at most once across concurrent callers.
+    
+    A timeout of 0 disables caching. Callers that find another caller already
+    computing the entry wait up to `wait` seconds for its result.
+    """
+    if timeout is None:
+        timeout = settings.CACHE_DEFAULT_TIMEOUT
+    if wait is None:
+        wait = settings.CACHE_LOCK_WAIT
+    if not timeout:
+        return compute()
+    
+    value = cache.get(key)
+    if value is not None:
+        return value
+    
+    lock_key = f'{key}:lock'
+    deadline = time.monotonic() + wait
+    while not cache.add(lock_key, 1, LOCK_TIMEOUT):
+        # Another caller is computing this entry - wait for its result
+        if time.monotonic() >= deadline:
+            return compute()
+        time.sleep(POLL_INTERVAL)
+        value = cache.get(key)
+        if value is not None:
+            return value
+    
+    try:
+        value = cache.get(key)
+        if value is None:
+            value = compute()
+            cache.set(key, value, timeout)
+        return value
+    finally:
+        cache.delete(lock_key)
+
+
+def cached_queryset(namespace, queryset, *parts, timeout=None):
+    """Cache the rows of `queryset` as a list under `namespace`."""
+    return get_or_compute(versioned_key(namespace, *parts), lambda: list(queryset), timeout)
+
+
+async def aget_version(namespace):
+    """Async get_version(), for async views."""
+    key = f'{namespace}:version'
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, time.time_ns(), None)
+        version = await cache.aget(key)
+    return version
+
+
+async def aversioned_key(namespace, *parts):
+    """Async versioned_key(); builds the same keys, so sync and async callers share entries."""
+    return ':'.join([namespace, str(await aget_version(namespace)), *(str(part) for part in parts)])
+
+
+async def aget_or_compute(key, compute, timeout=None, wait=None):
+    """Async get_or_compute(); `compute` returns an awaitable."""
+    if timeout is None:
+        timeout = settings.CACHE_DEFAULT_TIMEOUT
+    if wait is None:
+        wait = settings.CACHE_LOCK_WAIT
+    if not timeout:
+        return await compute()
+    
+    value = await cache.aget(key)
+    if value is not None:
+        return value
+    
+    lock_key = f'{key}:lock'
+    deadline = time.monotonic() + wait
+    while not await cache.aadd(lock_key, 1, LOCK_TIMEOUT):
+        if time.monotonic() >= deadline:
+            return await compute()
+        await asyncio.sleep(POLL_INTERVAL)
+        value = await cache.aget(key)
+        if value is not None:
+            return value
+    
+    try:
+        value = await cache.aget(key)
+        if value is None:
+            value = await compute()
+            await cache.aset(key, value, timeout)
+        return value
+    finally:
+        await cache.adelete(lock_key)
+
+
+class LocalRegistry:
+    """
+    Process-local TTL cache in front of a loader, for near-static lookups.
+    
+    Reads are dictionary lookups. Entries expire after REGISTRY_TTL seconds;
+    signal handlers clear the registry in the process that changes the
+    underlying rows, and other processes pick the change up within the TTL.
+    Loads read from the primary, since registries feed writes such as
+    notifications and a lagging replica would keep stale rows for the TTL.
+    Returned values are shared between callers and must not be mutated.
+    """
+    
+    def __init__(self, loader):
+        self.loader = loader
+        self.entries = {}
+        registries.append(self)
+    
+    def get(self, *args):
+        """Return the value for `args`, loading it if missing or expired."""
+        now = time.monotonic()
+        entry = self.entries.get(args)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+        with primary_reads():
+            value = self.loader(*args)
+        self.entries[args] = (now + settings.REGISTRY_TTL, value)
+        return value
+    
+    def clear(self):
+        """Drop every entry."""
+        self.entries.clear()
+
+
+def clear_registries():
+    """Drop every in-process registry entry, e.g. between tests."""
+    for registry in registries:
+        registry.clear()
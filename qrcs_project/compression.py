@@ -0,0 +1,106 @@
+"""
+Content-coding helpers shared by CompressionMiddleware and the static files storage.
+
+gzip is always available; brotli is used when the Brotli package is
+installed. Clients get the coding they rate highest in Accept-Encoding,
+with brotli preferred over gzip on ties, as it is typically 15-25% smaller
+for JSON and HTML at a similar CPU cost.
+"""
+import gzip
+import mimetypes
+
+from django.utils.text import compress_string
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Codings we can produce, most preferred first
+ENCODINGS = ['br', 'gzip'] if brotli is not None else ['gzip']
+
+# Media types whose content is already compressed; recompressing them costs
+# CPU and saves nothing
+INCOMPRESSIBLE_TYPES = (
+    'image/', 'video/', 'audio/', 'font/woff',
+    'application/zip', 'application/gzip', 'application/x-gzip', 'application/x-brotli',
+    'application/zstd', 'application/pdf', 'application/octet-stream',
+)
+
+# Text-based image formats, which do compress
+COMPRESSIBLE_IMAGE_TYPES = ('image/svg+xml', 'image/x-icon', 'image/bmp')
+
+# Random gzip header bytes added by Django's GZipMiddleware against BREACH
+MAX_RANDOM_BYTES = 100
+
+
+def is_compressible(content_type):
+    """Whether a response or file of `content_type` is worth compressing."""
+    media_type = content_type.split(';')[0].strip().lower()
+    if not media_type:
+        return False
+    if media_type in COMPRESSIBLE_IMAGE_TYPES:
+        return True
+    return not media_type.startswith(INCOMPRESSIBLE_TYPES)
+
+
+def guess_compressible(name):
+    """Whether a file is worth compressing, judged by its name."""
+    content_type, encoding = mimetypes.guess_type(name)
+    return encoding is None and content_type is not None and is_compressible(content_type)
+
+
+def accepted_qualities(header):
+    """Map each coding in an Accept-Encoding header to its q-value."""
+    qualities = {}
+    for part in header.split(','):
+        coding, _, params = part.partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding] = quality
+    return qualities
+
+
+def negotiate(header, encodings=None):
+    """
+    Pick the coding to send for an Accept-Encoding header, or None for identity.
+    
+    `encodings` lists the candidates in order of preference (default
+    ENCODINGS). Codings the header does not mention get the q-value of "*",
+    if present; a q-value of 0 rules a coding out.
+    """
+    qualities = accepted_qualities(header)
+    best, best_quality = None, 0.0
+    for coding in ENCODINGS if encodings is None else encodings:
+        quality = qualities.get(coding, qualities.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def compress(content, coding, brotli_quality=5):
+    """
+    Compress a response body with `coding`.
+    
+    gzip output carries Django's random-length header padding, which makes
+    BREACH attacks on pages that reflect input next to secrets impractical.
+    """
+    if coding == 'br':
+        return brotli.compress(content, quality=brotli_quality)
+    return compress_string(content, max_random_bytes=MAX_RANDOM_BYTES)
+
+
+def compress_file(content, coding):
+    """Compress static file contents with `coding` at maximum compression."""
+    if coding == 'br':
+        return brotli.compress(content, quality=11)
+    return gzip.compress(content, compresslevel=9, mtime=0)
@@ -0,0 +1,104 @@
+"""
+Read-replica routing for qrcs_project.
+
+Reads go to a replica only inside a replica scope: safe-method requests to
+views that set `read_replica = True` (read-only API actions and analytics),
+or code wrapped in replica_reads(). Everything else, and every write, uses
+the primary. A scope that writes is pinned to the primary for the rest of
+the request, and ReplicaRoutingMiddleware sets a short-lived cookie so the
+client's next requests read their own writes while replicas catch up.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Cookie that pins a client's reads to the primary after it writes
+PIN_COOKIE = 'qrcs_primary'
+
+# The RoutingState of the current request or scope; a mutable object, so
+# pinning inside sync_to_async threads is seen by the whole request
+routing_state = ContextVar('routing_state', default=None)
+
+
+def reads_from_replica(view):
+    """Whether a view opted in to replica reads, directly or through its class."""
+    if getattr(view, 'read_replica', False):
+        return True
+    view_class = getattr(view, 'cls', None) or getattr(view, 'view_class', None)
+    return getattr(view_class, 'read_replica', False)
+
+
+class RoutingState:
+    """Replica eligibility and primary pinning for one request or scope."""
+    
+    def __init__(self, request=None, replicas=None, pinned=False):
+        self.request = request
+        # None: decide from the request's view once the URL has been resolved
+        self.replicas = replicas
+        self.pinned = pinned
+        self.wrote = False
+    
+    def use_replicas(self):
+        """Whether reads may go to a replica right now."""
+        if self.pinned:
+            return False
+        if self.replicas is None:
+            match = getattr(self.request, 'resolver_match', None)
+            if match is None:
+                # Middleware before URL resolution reads from the primary
+                return False
+            self.replicas = self.request.method in SAFE_METHODS and reads_from_replica(match.func)
+        return self.replicas
+    
+    def pin(self):
+        """Send every later query in this scope to the primary."""
+        self.pinned = self.wrote = True
+
+
+@contextmanager
+def replica_reads():
+    """Route reads in this block to replicas, e.g. for reports run outside a request."""
+    token = routing_state.set(RoutingState(replicas=True))
+    try:
+        yield
+    finally:
+        routing_state.reset(token)
+
+
+@contextmanager
+def primary_reads():
+    """Route reads in this block to the primary, e.g. for data that feeds writes."""
+    token = routing_state.set(None)
+    try:
+        yield
+    finally:
+        routing_state.reset(token)
+
+
+class ReplicaRouter:
+    """Send eligible reads to a random DATABASE_REPLICAS alias and all writes to the primary."""
+    
+    def db_for_read(self, model, **hints):
+        state = routing_state.get()
+        if not settings.DATABASE_REPLICAS or state is None or not state.use_replicas():
+            return None
+        if hints.get('instance') is not None:
+            # Related lookups follow the database their instance came from
+            return None
+        return random.choice(settings.DATABASE_REPLICAS)
+    
+    def db_for_write(self, model, **hints):
+        state = routing_state.get()
+        if state is not None:
+            state.pin()
+        # Explicit, or saving an instance read from a replica would write there
+        return DEFAULT_DB_ALIAS
+    
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        return True
@@ -0,0 +1,156 @@
+"""
+In-process request metrics with a Prometheus text-format endpoint.
+
+Metrics are kept per process: under a multi-worker server each worker
+exposes its own series, which Prometheus aggregates by instance.
+"""
+import threading
+from bisect import bisect_left
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    """Cumulative histogram of observations keyed by a tuple of label values."""
+    
+    def __init__(self, name, help_text, label_names, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = tuple(sorted(buckets))
+        self.series = {}
+    
+    def observe(self, labels, value):
+        """Record one observation for a label set."""
+        series = self.series.get(labels)
+        if series is None:
+            # Per-bucket counts, plus one for +Inf; then sum and count
+            series = self.series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+    
+    def render(self):
+        """Return exposition lines for every label set."""
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        for labels, (counts, total, count) in sorted(self.series.items()):
+            label_text = format_labels(self.label_names, labels)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += bucket_count
+                le = format_labels(self.label_names + ('le',), labels + (str(bound),))
+                lines.append(f'{self.name}_bucket{le} {cumulative}')
+            lines.append(f'{self.name}_sum{label_text} {total}')
+            lines.append(f'{self.name}_count{label_text} {count}')
+        return lines
+
+
+class CounterFamily:
+    """Monotonic counters keyed by a tuple of label values."""
+    
+    def __init__(self, name, help_text, label_names):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.series = {}
+    
+    def inc(self, labels, value=1):
+        """Add `value` to the counter for a label set."""
+        self.series[labels] = self.series.get(labels, 0) + value
+    
+    def render(self):
+        """Return exposition lines for every label set."""
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        for labels, value in sorted(self.series.items()):
+            lines.append(f'{self.name}{format_labels(self.label_names, labels)} {value}')
+        return lines
+
+
+def format_labels(names, values):
+    """Format label pairs as {a="1",b="2"}, escaping values."""
+    if not names:
+        return ''
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{name}="{value}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+class RequestMetrics:
+    """Per-view latency, DB query count and DB time for handled requests."""
+    
+    def __init__(self, latency_buckets=DEFAULT_LATENCY_BUCKETS):
+        self.lock = threading.Lock()
+        self.latency = Histogram(
+            'qrcs_request_duration_seconds', 'Request latency by view.',
+            ('view', 'method'), latency_buckets
+        )
+        self.queries = Histogram(
+            'qrcs_request_db_queries', 'Database queries per request by view.',
+            ('view', 'method'), QUERY_COUNT_BUCKETS
+        )
+        self.db_time = CounterFamily(
+            'qrcs_request_db_seconds_total', 'Time spent in database queries by view.',
+            ('view', 'method')
+        )
+        self.requests = CounterFamily(
+            'qrcs_requests_total', 'Requests by view and response status.',
+            ('view', 'method', 'status')
+        )
+    
+    def observe(self, view, method, status, seconds, queries, db_seconds):
+        """Record one handled request."""
+        labels = (view, method)
+        with self.lock:
+            self.latency.observe(labels, seconds)
+            self.queries.observe(labels, queries)
+            self.db_time.inc(labels, db_seconds)
+            self.requests.inc((view, method, str(status)))
+    
+    def reset(self):
+        """Drop all recorded series."""
+        with self.lock:
+            for family in (self.latency, self.queries, self.db_time, self.requests):
+                family.series.clear()
+    
+    def render(self):
+        """Return exposition lines for all request metrics."""
+        with self.lock:
+            lines = []
+            for family in (self.requests, self.latency, self.queries, self.db_time):
+                lines.extend(family.render())
+        return lines
+
+
+request_metrics = RequestMetrics(getattr(settings, 'METRICS_LATENCY_BUCKETS', DEFAULT_LATENCY_BUCKETS))
+
+
+def websocket_metric_lines():
+    """Render the WebSocket send-buffer counters, if channels is installed."""
+    try:
+        from notifications.consumers import consumer_metrics
+    except ImportError:
+        return []
+    events = CounterFamily('qrcs_websocket_events_total', 'WebSocket send-buffer events.', ('event',))
+    for event, value in consumer_metrics.items():
+        events.inc((event,), value)
+    return events.render()
+
+
+def render_metrics():
+    """Return all metrics in Prometheus text exposition format."""
+    lines = request_metrics.render() + websocket_metric_lines()
+    return '\n'.join(lines) + '\n'
+
+
+def metrics_view(request):
+    """Expose metrics to scrapers on METRICS_ALLOWED_IPS only."""
+    if request.META.get('REMOTE_ADDR') not in settings.METRICS_ALLOWED_IPS:
+        return HttpResponseForbidden()
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,266 @@
+"""
+Request instrumentation, database routing and compression middleware for qrcs_project.
+"""
+import logging
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.utils.cache import patch_vary_headers
+
+from .compression import ENCODINGS, compress, is_compressible, negotiate
+from .db_routers import PIN_COOKIE, RoutingState, routing_state
+from .metrics import request_metrics
+
+logger = logging.getLogger('qrcs.slow_requests')
+
+# The QueryCollector of the request being handled; context variables follow
+# the request into sync_to_async threads, where the async ORM runs queries
+current_collector = ContextVar('current_collector', default=None)
+
+
+class QueryCollector:
+    """Database execute wrapper that counts and times queries."""
+    
+    def __init__(self, keep_sql):
+        self.count = 0
+        self.seconds = 0.0
+        self.keep_sql = keep_sql
+        self.statements = []
+    
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.seconds += elapsed
+            if len(self.statements) < self.keep_sql:
+                self.statements.append((elapsed, sql))
+
+
+def collect_query(execute, sql, params, many, context):
+    """Execute wrapper that reports to the current request's QueryCollector, if any."""
+    collector = current_collector.get()
+    if collector is None:
+        return execute(sql, params, many, context)
+    return collector(execute, sql, params, many, context)
+
+
+def install_query_hook(connection, **kwargs):
+    """Add collect_query to a connection's execute wrappers once."""
+    if collect_query not in connection.execute_wrappers:
+        # First, so connection.execute_wrapper() blocks still pop their own wrapper
+        connection.execute_wrappers.insert(0, collect_query)
+
+
+class RequestMetricsMiddleware:
+    """
+    Record latency, DB query count and DB time for every request by view.
+    
+    Requests slower than METRICS_SLOW_REQUEST_SECONDS are logged with their
+    SQL (up to METRICS_SLOW_SQL_LIMIT statements). Works in both sync and
+    async stacks, so async views are not forced onto a thread.
+    """
+    
+    sync_capable = True
+    async_capable = True
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        # Connections opened later, e.g. by sync_to_async threads, get the hook on connect
+        connection_created.connect(install_query_hook, dispatch_uid='qrcs_project.install_query_hook')
+    
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not self.is_instrumented(request):
+            return self.get_response(request)
+        
+        for alias in connections:
+            install_query_hook(connections[alias])
+        collector = self.new_collector()
+        token = current_collector.set(collector)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_collector.reset(token)
+        self.record(request, response, time.perf_counter() - started, collector)
+        return response
+    
+    async def __acall__(self, request):
+        if not self.is_instrumented(request):
+            return await self.get_response(request)
+        
+        collector = self.new_collector()
+        token = current_collector.set(collector)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_collector.reset(token)
+        self.record(request, response, time.perf_counter() - started, collector)
+        return response
+    
+    @staticmethod
+    def is_instrumented(request):
+        """Whether metrics are enabled for this request; the endpoint does not instrument itself."""
+        return settings.METRICS_ENABLED and request.path != settings.METRICS_PATH
+    
+    @staticmethod
+    def new_collector():
+        """Create a collector that keeps SQL only when slow requests are logged."""
+        slow_seconds = settings.METRICS_SLOW_REQUEST_SECONDS
+        return QueryCollector(settings.METRICS_SLOW_SQL_LIMIT if slow_seconds else 0)
+    
+    def record(self, request, response, elapsed, collector):
+        """Record a handled request and log it if slow."""
+        view = self.view_name(request)
+        request_metrics.observe(
+            view, request.method, response.status_code, elapsed, collector.count, collector.seconds
+        )
+        slow_seconds = settings.METRICS_SLOW_REQUEST_SECONDS
+        if slow_seconds and elapsed >= slow_seconds:
+            self.log_slow_request(request, view, elapsed, collector)
+    
+    @staticmethod
+    def view_name(request):
+        """Label requests by URL name or view path; unresolved URLs share one label."""
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return 'unresolved'
+        return match.view_name or match._func_path
+    
+    @staticmethod
+    def log_slow_request(request, view, elapsed, collector):
+        """Log a slow request with the SQL it ran."""
+        statements = '\n'.join(
+            f'  [{seconds * 1000:.1f}ms] {sql}' for seconds, sql in collector.statements
+        )
+        logger.warning(
+            'Slow request %s %s (%s): %.3fs, %d queries, %.3fs in DB\n%s',
+            request.method, request.path, view, elapsed, collector.count, collector.seconds, statements
+        )
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Give each request a replica routing scope (see qrcs_project.db_routers).
+    
+    Clients whose request wrote get a cookie that pins their reads to the
+    primary for DB_REPLICA_PIN_SECONDS, so they read their own writes.
+    Does nothing when no replicas are configured.
+    """
+    
+    sync_capable = True
+    async_capable = True
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+    
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+        
+        state = RoutingState(request, pinned=PIN_COOKIE in request.COOKIES)
+        token = routing_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            routing_state.reset(token)
+        return self.pin_client(state, response)
+    
+    async def __acall__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return await self.get_response(request)
+        
+        state = RoutingState(request, pinned=PIN_COOKIE in request.COOKIES)
+        token = routing_state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            routing_state.reset(token)
+        return self.pin_client(state, response)
+    
+    @staticmethod
+    def pin_client(state, response):
+        """Set the pin cookie on responses to requests that wrote."""
+        if state.wrote:
+            response.set_cookie(
+                PIN_COOKIE, '1', max_age=settings.DB_REPLICA_PIN_SECONDS,
+                httponly=True, samesite='Lax', secure=settings.SESSION_COOKIE_SECURE,
+            )
+        return response
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with brotli or gzip, whichever the client prefers.
+    
+    Responses smaller than COMPRESSION_MIN_SIZE bytes, already-encoded and
+    streaming responses, and media types that are compressed already
+    (images, fonts, archives) are sent as they are; static files are
+    compressed ahead of time by collectstatic instead. HTML pages carry
+    CSRF tokens, so they always get gzip with Django's BREACH padding,
+    which brotli has no equivalent of.
+    """
+    
+    sync_capable = True
+    async_capable = True
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+    
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        return self.compress(request, self.get_response(request))
+    
+    async def __acall__(self, request):
+        return self.compress(request, await self.get_response(request))
+    
+    @staticmethod
+    def compress(request, response):
+        """Compress `response` in place if it and the client qualify."""
+        content_type = response.get('Content-Type', '')
+        if (
+            response.streaming or response.has_header('Content-Encoding')
+            or len(response.content) < settings.COMPRESSION_MIN_SIZE
+            or not is_compressible(content_type)
+        ):
+            return response
+        
+        # Caches must key on Accept-Encoding even for clients sent identity
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encodings = ['gzip'] if content_type.startswith('text/html') else ENCODINGS
+        coding = negotiate(request.META.get('HTTP_ACCEPT_ENCODING', ''), encodings)
+        if coding is None:
+            return response
+        content = compress(response.content, coding, settings.COMPRESSION_BROTLI_QUALITY)
+        if len(content) >= len(response.content):
+            return response
+        
+        response.content = content
+        response['Content-Length'] = str(len(content))
+        response['Content-Encoding'] = coding
+        # The body no longer matches a strong ETag byte for byte (RFC 9110 8.8.1)
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        return response
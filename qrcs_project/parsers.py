@@ -0,0 +1,39 @@
+"""
+JSON parser for the REST API, using orjson when it is installed.
+
+Accepts what rest_framework.parsers.JSONParser accepts with its default
+strict setting: orjson also rejects NaN and Infinity. orjson parses integers
+wider than 64 bits as floats, losing precision, so bodies containing a run
+of 19 or more digits are parsed by DRF, as are bodies in an encoding other
+than UTF-8 and every body when orjson is not installed.
+"""
+import codecs
+import re
+from io import BytesIO
+
+from django.conf import settings
+from rest_framework import parsers
+from rest_framework.exceptions import ParseError
+
+from .renderers import JSONRenderer, orjson
+
+# Integer literals this long may not fit in 64 bits
+LONG_DIGITS = re.compile(rb'[0-9]{19}')
+
+
+class JSONParser(parsers.JSONParser):
+    """Drop-in replacement for DRF's JSONParser backed by orjson."""
+    
+    renderer_class = JSONRenderer
+    
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or not self.strict or codecs.lookup(encoding).name != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+        body = stream.read()
+        if LONG_DIGITS.search(body):
+            return super().parse(BytesIO(body), media_type, parser_context)
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -3,9 +3,13 @@ WebSocket routing for qrcs_project.
 """
 from django.urls import re_path
 from notifications.consumers import NotificationConsumer
+from incidents.consumers import IncidentFeedConsumer
+from dashboard.consumers import DashboardConsumer
 
 websocket_urlpatterns = [
     re_path(r'ws/notifications/$', NotificationConsumer.as_asgi()),
+    re_path(r'ws/incidents/feed/$', IncidentFeedConsumer.as_asgi()),
+    re_path(r'ws/dashboard/$', DashboardConsumer.as_asgi()),
 ]
 
 
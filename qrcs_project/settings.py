@@ -94,14 +94,24 @@ INSTALLED_APPS.extend([
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    # Above everything that reads or writes response bodies
+    'qrcs_project.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'qrcs_project.middleware.ReplicaRoutingMiddleware',
 ]
 
+# Serve collected static files, and their precompressed versions, if available
+try:
+    import whitenoise
+    MIDDLEWARE.insert(1, 'qrcs_project.static.AsyncWhiteNoiseMiddleware')
+except ImportError:
+    pass
+
 # Add CORS middleware if available
 try:
     import corsheaders
@@ -109,6 +119,9 @@ try:
 except ImportError:
     pass
 
+# Request metrics wrap the whole stack so latency includes all middleware
+MIDDLEWARE.insert(0, 'qrcs_project.middleware.RequestMetricsMiddleware')
+
 ROOT_URLCONF = 'qrcs_project.urls'
 
 TEMPLATES = [
@@ -134,6 +147,41 @@ ASGI_APPLICATION = 'qrcs_project.asgi.application'
 # Use SQLite for development/testing, PostgreSQL for production
 DB_ENGINE = config('DB_ENGINE', default='sqlite')
 
+# SQLite tuning for single-node deployments (see qrcs_project.sqlite_backend)
+# WAL lets readers run alongside the writer and synchronous=NORMAL only syncs
+# at checkpoints, which is durable against application crashes but may lose
+# the last commits on power loss. Writers wait up to SQLITE_BUSY_TIMEOUT ms
+# for the lock, and autocommit statements that still hit a lock are retried
+# SQLITE_LOCK_RETRIES times. SQLITE_CACHE_SIZE is in KiB.
+SQLITE_JOURNAL_MODE = config('SQLITE_JOURNAL_MODE', default='WAL')
+SQLITE_SYNCHRONOUS = config('SQLITE_SYNCHRONOUS', default='NORMAL')
+SQLITE_BUSY_TIMEOUT = config('SQLITE_BUSY_TIMEOUT', default=5000, cast=int)
+SQLITE_MMAP_SIZE = config('SQLITE_MMAP_SIZE', default=256 * 1024 * 1024, cast=int)
+SQLITE_CACHE_SIZE = config('SQLITE_CACHE_SIZE', default=64 * 1024, cast=int)
+SQLITE_LOCK_RETRIES = config('SQLITE_LOCK_RETRIES', default=3, cast=int)
+
+
+def sqlite_database(name):
+    """DATABASES entry for a tuned SQLite database file."""
+    return {
+        'ENGINE': 'qrcs_project.sqlite_backend',
+        'NAME': name,
+        'OPTIONS': {
+            'timeout': SQLITE_BUSY_TIMEOUT / 1000,
+            'pragmas': {
+                'journal_mode': SQLITE_JOURNAL_MODE,
+                'synchronous': SQLITE_SYNCHRONOUS,
+                'busy_timeout': SQLITE_BUSY_TIMEOUT,
+                'mmap_size': SQLITE_MMAP_SIZE,
+                # Negative values are KiB rather than pages
+                'cache_size': -SQLITE_CACHE_SIZE,
+                'temp_store': 'MEMORY',
+            },
+            'lock_retries': SQLITE_LOCK_RETRIES,
+        },
+    }
+
+
 if DB_ENGINE == 'postgresql':
     try:
         import psycopg2
@@ -150,19 +198,67 @@ if DB_ENGINE == 'postgresql':
     except ImportError:
         # Fallback to SQLite if psycopg2 is not installed
         DATABASES = {
-            'default': {
-                'ENGINE': 'django.db.backends.sqlite3',
-                'NAME': BASE_DIR / 'db.sqlite3',
-            }
+            'default': sqlite_database(BASE_DIR / 'db.sqlite3'),
         }
 else:
     DATABASES = {
-        'default': {
-            'ENGINE': 'django.db.backends.sqlite3',
-            'NAME': BASE_DIR / 'db.sqlite3',
-        }
+        'default': sqlite_database(BASE_DIR / 'db.sqlite3'),
     }
 
+# Read replicas
+# DB_REPLICA_HOSTS lists PostgreSQL replica hosts (comma-separated); each gets
+# a `replica_N` alias with the primary's other settings. ReplicaRouter sends
+# reads from read-only API actions and analytics views to a random replica,
+# and a client that writes reads from the primary for DB_REPLICA_PIN_SECONDS
+# afterwards. With no replicas every query uses `default`.
+DB_REPLICA_HOSTS = config('DB_REPLICA_HOSTS', default='', cast=lambda v: [s.strip() for s in v.split(',') if s.strip()])
+DB_REPLICA_PIN_SECONDS = config('DB_REPLICA_PIN_SECONDS', default=5, cast=int)
+DATABASE_ROUTERS = ['qrcs_project.db_routers.ReplicaRouter']
+
+
+def configure_replicas(databases, hosts):
+    """Add a replica alias per host, copying the primary's settings; return the aliases."""
+    aliases = []
+    for i, host in enumerate(hosts):
+        alias = f'replica_{i}'
+        # Tests read replicas through the primary's test database
+        databases[alias] = {**databases['default'], 'HOST': host, 'TEST': {'MIRROR': 'default'}}
+        aliases.append(alias)
+    return aliases
+
+
+DATABASE_REPLICAS = configure_replicas(DATABASES, DB_REPLICA_HOSTS)
+
+# Database connections
+# Django's ASGI handler runs each HTTP request's sync code on a fresh thread,
+# so a connection kept by CONN_MAX_AGE is never reused there and stays open
+# until its thread is garbage collected. The web service therefore keeps
+# DB_CONN_MAX_AGE at 0 and connects through PgBouncer (see docker-compose),
+# which pools server connections in transaction mode: opening a connection
+# to it is cheap, and PostgreSQL sees at most the bouncer's pool size, sized
+# from ASGI_THREADS - the number of threads daphne runs sync code on, read by
+# daphne from the environment. DB_PGBOUNCER=True disables server-side cursors,
+# which transaction pooling cannot carry between queries. Processes with
+# long-lived threads, namely WSGI workers and Celery, connect directly and
+# set DB_CONN_MAX_AGE (e.g. 60); reused connections are health-checked first.
+ASGI_THREADS = config('ASGI_THREADS', default=min(32, (os.cpu_count() or 1) + 4), cast=int)
+DB_CONN_MAX_AGE = config('DB_CONN_MAX_AGE', default=0, cast=int)
+DB_CONN_HEALTH_CHECKS = config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool)
+DB_PGBOUNCER = config('DB_PGBOUNCER', default=False, cast=bool)
+
+
+def configure_connections(databases):
+    """Apply DB_CONN_MAX_AGE, health checks and PgBouncer compatibility to every alias."""
+    for database in databases.values():
+        database['CONN_MAX_AGE'] = DB_CONN_MAX_AGE
+        database['CONN_HEALTH_CHECKS'] = DB_CONN_HEALTH_CHECKS
+        if DB_PGBOUNCER and database['ENGINE'] == 'django.db.backends.postgresql':
+            database['DISABLE_SERVER_SIDE_CURSORS'] = True
+    return databases
+
+
+configure_connections(DATABASES)
+
 # Custom User Model
 AUTH_USER_MODEL = 'accounts.User'
 
@@ -192,6 +288,30 @@ USE_TZ = True
 STATIC_URL = '/static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# With STATIC_MANIFEST, collectstatic writes content-hashed copies of static
+# files with .gz and .br versions next to them, and {% static %} links to
+# the hashed names, which can be cached forever. Pages then render only
+# after collectstatic has run, so it defaults to off when DEBUG is on.
+STATIC_MANIFEST = config('STATIC_MANIFEST', default=not DEBUG, cast=bool)
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': (
+            'qrcs_project.storage.CompressedManifestStaticFilesStorage' if STATIC_MANIFEST
+            else 'django.contrib.staticfiles.storage.StaticFilesStorage'
+        ),
+    },
+}
+
+# Response compression (qrcs_project.middleware.CompressionMiddleware).
+# Bodies shorter than COMPRESSION_MIN_SIZE bytes fit in a packet or two
+# anyway. COMPRESSION_BROTLI_QUALITY (0-11) trades CPU for size; 4-6 suit
+# per-request compression.
+COMPRESSION_MIN_SIZE = config('COMPRESSION_MIN_SIZE', default=1024, cast=int)
+COMPRESSION_BROTLI_QUALITY = config('COMPRESSION_BROTLI_QUALITY', default=5, cast=int)
+
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
@@ -212,6 +332,16 @@ REST_FRAMEWORK = {
         'rest_framework.filters.SearchFilter',
         'rest_framework.filters.OrderingFilter',
     ],
+    # orjson-backed JSON, falling back to DRF's stdlib json when not installed
+    'DEFAULT_RENDERER_CLASSES': [
+        'qrcs_project.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'qrcs_project.parsers.JSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
@@ -225,6 +355,11 @@ SIMPLE_JWT = {
     'ROTATE_REFRESH_TOKENS': True,
 }
 
+# WebSocket JWT authentication: users resolved from access tokens are cached
+# in-process for this many seconds, up to WEBSOCKET_AUTH_CACHE_SIZE entries.
+WEBSOCKET_AUTH_CACHE_TTL = config('WEBSOCKET_AUTH_CACHE_TTL', default=60, cast=int)
+WEBSOCKET_AUTH_CACHE_SIZE = config('WEBSOCKET_AUTH_CACHE_SIZE', default=10000, cast=int)
+
 # Logout redirect
 LOGOUT_REDIRECT_URL = '/'
 LOGIN_REDIRECT_URL = '/'
@@ -248,6 +383,46 @@ CHANNEL_LAYERS = {
     },
 }
 
+# Cache
+# 'locmem' is per-process and meant for development; 'redis' is shared by all
+# web and worker processes (docker-compose runs one). Keys are namespaced with
+# CACHE_KEY_PREFIX; bump CACHE_VERSION to invalidate every entry at once, e.g.
+# when the shape of cached data changes. Callers computing a missing entry
+# hold a lock that others wait on for up to CACHE_LOCK_WAIT seconds.
+CACHE_BACKEND = config('CACHE_BACKEND', default='locmem')
+CACHE_REDIS_URL = config('CACHE_REDIS_URL', default='redis://127.0.0.1:6379/1')
+CACHE_KEY_PREFIX = config('CACHE_KEY_PREFIX', default='qrcs')
+CACHE_VERSION = config('CACHE_VERSION', default=1, cast=int)
+CACHE_DEFAULT_TIMEOUT = config('CACHE_DEFAULT_TIMEOUT', default=300, cast=int)
+CACHE_LOCK_WAIT = config('CACHE_LOCK_WAIT', default=5, cast=float)
+# Near-static lookups (categories, users by role) are also kept in each
+# process for REGISTRY_TTL seconds; changes made by other processes show up
+# within that window.
+REGISTRY_TTL = config('REGISTRY_TTL', default=60, cast=float)
+
+
+def cache_config(backend):
+    """Build the default cache alias for a CACHE_BACKEND value."""
+    options = {
+        'KEY_PREFIX': CACHE_KEY_PREFIX,
+        'VERSION': CACHE_VERSION,
+        'TIMEOUT': CACHE_DEFAULT_TIMEOUT,
+    }
+    if backend == 'redis':
+        return {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': CACHE_REDIS_URL, **options}
+    return {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'qrcs', **options}
+
+
+CACHES = {
+    'default': cache_config(CACHE_BACKEND),
+}
+
+# Dashboard caching: statistics are cached for this many seconds (0 disables
+# caching); concurrent requests wait up to DASHBOARD_CACHE_WAIT seconds for
+# another request that is already computing the same entry.
+DASHBOARD_CACHE_TIMEOUT = config('DASHBOARD_CACHE_TIMEOUT', default=300, cast=int)
+DASHBOARD_CACHE_WAIT = config('DASHBOARD_CACHE_WAIT', default=5, cast=float)
+
 # Celery Configuration
 CELERY_BROKER_URL = config('CELERY_BROKER_URL', default='redis://localhost:6379/0')
 CELERY_RESULT_BACKEND = config('CELERY_RESULT_BACKEND', default='redis://localhost:6379/0')
@@ -256,6 +431,53 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
 
+# Celery Beat schedule (optional - only if celery is installed)
+try:
+    from celery.schedules import crontab
+    CELERY_BEAT_SCHEDULE = {
+        'purge-read-notifications': {
+            'task': 'notifications.tasks.purge_read_notifications',
+            'schedule': crontab(hour=3, minute=0),
+        },
+    }
+except ImportError:
+    pass
+
+# Notifications
+# Repeated notifications for the same (recipient, incident, type) within this
+# many seconds of the last one are merged into a single unread row, which
+# takes the latest created_at. 0 disables coalescing.
+NOTIFICATION_COALESCE_WINDOW = config('NOTIFICATION_COALESCE_WINDOW', default=300, cast=int)
+# Per-connection WebSocket buffering: events queued within the batch delay
+# (seconds) go out as one frame; a client with more than the buffer size
+# pending gets a single 'resync' frame instead.
+NOTIFICATION_WS_BUFFER_SIZE = config('NOTIFICATION_WS_BUFFER_SIZE', default=100, cast=int)
+NOTIFICATION_WS_BATCH_DELAY = config('NOTIFICATION_WS_BATCH_DELAY', default=0.05, cast=float)
+# Read notifications older than this many days are purged nightly, in
+# batches of NOTIFICATION_RETENTION_BATCH_SIZE rows.
+NOTIFICATION_RETENTION_DAYS = config('NOTIFICATION_RETENTION_DAYS', default=90, cast=int)
+NOTIFICATION_RETENTION_BATCH_SIZE = config('NOTIFICATION_RETENTION_BATCH_SIZE', default=1000, cast=int)
+
+# Request metrics
+# Per-view latency, DB query count and DB time, exposed in Prometheus text
+# format at METRICS_PATH to METRICS_ALLOWED_IPS only. Requests slower than
+# METRICS_SLOW_REQUEST_SECONDS (0 disables) are logged to 'qrcs.slow_requests'
+# with up to METRICS_SLOW_SQL_LIMIT of their SQL statements.
+METRICS_ENABLED = config('METRICS_ENABLED', default=True, cast=bool)
+METRICS_PATH = '/metrics'
+METRICS_ALLOWED_IPS = config(
+    'METRICS_ALLOWED_IPS',
+    default='127.0.0.1,::1',
+    cast=lambda v: [s.strip() for s in v.split(',')]
+)
+METRICS_LATENCY_BUCKETS = config(
+    'METRICS_LATENCY_BUCKETS',
+    default='0.005,0.01,0.025,0.05,0.1,0.25,0.5,1,2.5,5,10',
+    cast=lambda v: [float(s) for s in v.split(',')]
+)
+METRICS_SLOW_REQUEST_SECONDS = config('METRICS_SLOW_REQUEST_SECONDS', default=1.0, cast=float)
+METRICS_SLOW_SQL_LIMIT = config('METRICS_SLOW_SQL_LIMIT', default=50, cast=int)
+
 # Email Configuration
 EMAIL_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.console.EmailBackend')
 EMAIL_HOST = config('EMAIL_HOST', default='smtp.gmail.com')
@@ -17,6 +17,14 @@ DATABASES = {
         'PORT': config('DB_PORT', default='5432'),
     }
 }
+DATABASE_REPLICAS = configure_replicas(DATABASES, DB_REPLICA_HOSTS)
+configure_connections(DATABASES)
+
+# Shared cache across web and worker processes
+CACHE_BACKEND = config('CACHE_BACKEND', default='redis')
+CACHES = {
+    'default': cache_config(CACHE_BACKEND),
+}
 
 # Security settings
 SECURE_SSL_REDIRECT = config('SECURE_SSL_REDIRECT', default=True, cast=bool)
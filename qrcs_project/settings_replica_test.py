@@ -0,0 +1,17 @@
+"""
+Test settings with a second SQLite database standing in for a read replica.
+
+    python manage.py test qrcs_project.tests.ReplicaRoutingTest --settings=qrcs_project.settings_replica_test
+
+Nothing copies rows between the two databases, so a read that reaches the
+replica cannot see rows written to the primary; that is how the tests tell
+where each query went.
+"""
+from .settings import *
+
+DATABASES = {
+    'default': sqlite_database(BASE_DIR / 'db.sqlite3'),
+    'replica': sqlite_database(BASE_DIR / 'db_replica.sqlite3'),
+}
+DATABASE_REPLICAS = ['replica']
+configure_connections(DATABASES)
@@ -0,0 +1,5 @@
+"""
+SQLite database backend tuned for concurrent writers on a single node.
+
+Use with ENGINE 'qrcs_project.sqlite_backend'; see base.py.
+"""
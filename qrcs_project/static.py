@@ -0,0 +1,44 @@
+"""
+Static file serving for qrcs_project.
+
+WhiteNoise serves collected static files, including the precompressed .br
+and .gz versions CompressedManifestStaticFilesStorage writes, under both
+WSGI and ASGI. Its middleware is sync-only, and a sync middleware makes
+Django run every ASGI request on a thread; the subclass here only takes a
+thread to serve a static file.
+"""
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoiseMiddleware that also runs natively in an async middleware chain.
+    
+    Looking a path up among the collected files is a dictionary lookup, done
+    on the event loop; opening and serving a file (and, with autorefresh in
+    development, finding it) runs in a thread. Other requests go straight on
+    to the next middleware.
+    """
+    sync_capable = True
+    async_capable = True
+    
+    def __init__(self, get_response=None, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+    
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        return super().__call__(request)
+    
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
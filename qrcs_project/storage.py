@@ -0,0 +1,44 @@
+"""
+Static files storage that content-hashes and precompresses files.
+"""
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+from .compression import ENCODINGS, compress_file, guess_compressible
+
+# File suffix for each content coding
+SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+# Compressed versions must be at least this much smaller to be kept
+MIN_SAVING = 0.05
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    ManifestStaticFilesStorage that also writes .gz and, with brotli, .br files.
+    
+    Hashed names never change content, so servers can cache them forever;
+    collectstatic compresses each one once at maximum compression, and
+    WhiteNoise (or nginx's gzip_static) serves the version the client
+    accepts without compressing per request.
+    """
+    
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for name in sorted(set(self.hashed_files.values())):
+            if guess_compressible(name):
+                self.compress(name)
+    
+    def compress(self, name):
+        """Write compressed versions of `name` that are worth keeping."""
+        with self.open(name) as original:
+            content = original.read()
+        for coding in ENCODINGS:
+            compressed_name = name + SUFFIXES[coding]
+            if self.exists(compressed_name):
+                self.delete(compressed_name)
+            compressed = compress_file(content, coding)
+            if len(compressed) <= len(content) * (1 - MIN_SAVING):
+                self._save(compressed_name, ContentFile(compressed))
@@ -0,0 +1,861 @@
+"""
+Tests for project-level middleware and endpoints.
+"""
+import gzip
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+from io import BytesIO
+from unittest import skipUnless
+from unittest.mock import patch
+from uuid import UUID
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management import call_command
+from django.db import OperationalError, connection
+from django.db.utils import ConnectionHandler
+from django.http import HttpResponse
+from django.test import AsyncClient, RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.translation import gettext_lazy
+from rest_framework import renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from notifications.models import Notification
+from responses.models import ResponseLog, ResponseTeam
+from .cache import clear_registries, invalidate, versioned_key
+from .compression import ENCODINGS, brotli, negotiate
+from .db_routers import (
+    PIN_COOKIE, ReplicaRouter, RoutingState, primary_reads, reads_from_replica, replica_reads
+)
+from .metrics import render_metrics, request_metrics
+from .middleware import CompressionMiddleware, install_query_hook
+from .parsers import JSONParser
+from .renderers import JSONRenderer, orjson
+from .settings import sqlite_database
+from .static import AsyncWhiteNoiseMiddleware
+from .storage import SUFFIXES
+
+User = get_user_model()
+
+
+class RequestMetricsTest(TestCase):
+    """Test cases for request metrics middleware and the /metrics endpoint."""
+    
+    def setUp(self):
+        """Start each test with empty metrics."""
+        request_metrics.reset()
+        self.user = User.objects.create_user(username='reporter', password='testpass123', role='reporter')
+    
+    def test_records_api_and_frontend_views(self):
+        """Test DRF and template views are labelled by URL name with query counts."""
+        client = APIClient()
+        client.force_authenticate(self.user)
+        client.get('/api/incidents/')
+        self.client.get('/')
+        self.client.get('/no-such-page/')
+        
+        body = self.client.get('/metrics').content.decode()
+        self.assertIn('qrcs_requests_total{view="incident-list",method="GET",status="200"} 1', body)
+        self.assertIn('qrcs_request_duration_seconds_count{view="frontend:homepage",method="GET"} 1', body)
+        self.assertIn('view="unresolved"', body)
+        self.assertIn('qrcs_request_db_queries_bucket{view="incident-list",method="GET",le="+Inf"} 1', body)
+        # The endpoint does not instrument itself
+        self.assertNotIn('view="metrics"', body)
+    
+    def test_restricted_to_allowed_ips(self):
+        """Test scrapes from other addresses are refused."""
+        response = self.client.get('/metrics', REMOTE_ADDR='10.0.0.5')
+        self.assertEqual(response.status_code, 403)
+    
+    @override_settings(METRICS_SLOW_REQUEST_SECONDS=1e-9)
+    def test_slow_request_logging(self):
+        """Test slow requests are logged with their SQL."""
+        client = APIClient()
+        client.force_authenticate(self.user)
+        with self.assertLogs('qrcs.slow_requests', level='WARNING') as logs:
+            client.get('/api/incidents/')
+        self.assertIn('SELECT', logs.output[0])
+    
+    @override_settings(METRICS_ENABLED=False)
+    def test_disabled(self):
+        """Test nothing is recorded when metrics are disabled."""
+        self.client.get('/')
+        self.assertNotIn('view=', self.client.get('/metrics').content.decode())
+
+
+class QueryBudgetTest(TestCase):
+    """
+    Query counts per endpoint must not grow with the amount of data.
+    
+    Every endpoint is measured after seeding N incidents (with assignments,
+    logs and notifications) and again after seeding 10N; any difference is
+    an N+1 query.
+    """
+    
+    N = 3
+    
+    API_ENDPOINTS = [
+        '/api/incidents/',
+        '/api/incidents/{incident}/',
+        '/api/incidents/nearby/?lat=40.7&lng=-74.0&radius=1000',
+        '/api/incidents/statistics/',
+        '/api/incident-categories/',
+        '/api/response-teams/',
+        '/api/response-teams/{team}/',
+        '/api/response-logs/',
+        '/api/notifications/',
+        '/api/notifications/unread_count/',
+        '/api/accounts/users/',
+        '/api/accounts/users/me/',
+        '/api/dashboard/stats/',
+        '/api/dashboard/trends/',
+        '/api/dashboard/response-times/',
+        '/api/dashboard/responders/',
+    ]
+    
+    FRONTEND_ENDPOINTS = [
+        '/',
+        '/incident/{incident}/',
+        '/my-incidents/',
+        '/notifications/',
+        '/incident/{incident}/update-status/',
+        '/teams/',
+        '/team/{team}/',
+        '/assign-responder/',
+    ]
+    
+    def setUp(self):
+        """Set up one user per role and an incident that accumulates related rows."""
+        from incidents.models import IncidentCategory
+        
+        self.admin = User.objects.create_user(username='admin', password='testpass123', role='admin')
+        self.reporter = User.objects.create_user(username='reporter', password='testpass123', role='reporter')
+        self.responder = User.objects.create_user(username='responder', password='testpass123', role='responder')
+        self.categories = [
+            IncidentCategory.objects.create(name=f'Category {i}', priority_level=i + 1) for i in range(2)
+        ]
+        self.created = 0
+        self.focus = self.create_incident()
+        self.team = ResponseTeam.objects.create(incident=self.focus, responder=self.responder, assigned_by=self.admin)
+    
+    def create_incident(self):
+        """Create an incident with a unique id."""
+        from incidents.models import Incident
+        
+        self.created += 1
+        return Incident.objects.create(
+            incident_id=f'INC-TEST-{self.created}',
+            title=f'Test Incident {self.created}',
+            description='Test Description',
+            category=self.categories[self.created % 2],
+            reporter=self.reporter,
+            latitude=40.7128,
+            longitude=-74.0060,
+            location_address='Test Address'
+        )
+    
+    def seed(self, count):
+        """Add `count` incidents, each with new responders, logs and notifications."""
+        for i in range(count):
+            incident = self.create_incident()
+            responder = User.objects.create_user(
+                username=f'responder{self.created}', password='testpass123', role='responder'
+            )
+            ResponseTeam.objects.create(incident=incident, responder=self.responder, assigned_by=self.admin)
+            ResponseTeam.objects.create(incident=incident, responder=responder, assigned_by=self.admin)
+            ResponseTeam.objects.create(incident=self.focus, responder=responder, assigned_by=self.admin)
+            ResponseLog.objects.create(incident=incident, responder=self.responder, action='Update', details='Details')
+            ResponseLog.objects.create(incident=self.focus, responder=responder, action='Update', details='Details')
+            for recipient in (self.admin, self.reporter):
+                Notification.objects.create(
+                    recipient=recipient, incident=incident, notification_type='status_update',
+                    title='Update', message='Status changed'
+                )
+    
+    def measure(self):
+        """Return {(role, url): query count} for every endpoint as every role."""
+        counts = {}
+        for user in (self.admin, self.responder, self.reporter):
+            api = APIClient()
+            api.force_authenticate(user)
+            self.client.force_login(user)
+            for client, endpoints in ((api, self.API_ENDPOINTS), (self.client, self.FRONTEND_ENDPOINTS)):
+                for endpoint in endpoints:
+                    url = endpoint.format(incident=self.focus.id, team=self.team.id)
+                    cache.clear()
+                    clear_registries()
+                    with CaptureQueriesContext(connection) as queries:
+                        response = client.get(url)
+                    self.assertLess(response.status_code, 500, url)
+                    counts[(user.role, url)] = len(queries)
+        return counts
+    
+    def test_query_counts_do_not_grow_with_data(self):
+        """Test every endpoint runs the same number of queries at N and 10N rows."""
+        self.seed(self.N)
+        small = self.measure()
+        self.seed(self.N * 9)
+        large = self.measure()
+        for key, count in small.items():
+            with self.subTest(role=key[0], url=key[1]):
+                self.assertEqual(large[key], count)
+
+
+class SharedCacheTest(TestCase):
+    """Test cases for versioned cache namespaces and cached lookups."""
+    
+    def setUp(self):
+        """Start from an empty cache."""
+        cache.clear()
+    
+    def test_invalidate_namespace(self):
+        """Test bumping a namespace version hides its entries."""
+        key = versioned_key('test', 'entry')
+        cache.set(key, 'value')
+        self.assertEqual(cache.get(versioned_key('test', 'entry')), 'value')
+        invalidate('test')
+        self.assertIsNone(cache.get(versioned_key('test', 'entry')))
+    
+    def test_categories_invalidated_on_change(self):
+        """Test cached categories are reused until a category is saved."""
+        from incidents.cache import cached_categories
+        from incidents.models import IncidentCategory
+        
+        IncidentCategory.objects.create(name='Fire', priority_level=5)
+        self.assertEqual([c.name for c in cached_categories()], ['Fire'])
+        with self.assertNumQueries(0):
+            cached_categories()
+        IncidentCategory.objects.create(name='Flood', priority_level=1)
+        self.assertEqual([c.name for c in cached_categories()], ['Flood', 'Fire'])
+    
+    def test_role_users_invalidated_on_change(self):
+        """Test cached role lists follow role changes but not logins."""
+        from accounts.cache import ROLE_USER_FIELDS, cached_role_users
+        
+        user = User.objects.create_user(username='responder', password='testpass123', role='responder')
+        self.assertEqual([row['id'] for row in cached_role_users('responder')], [user.id])
+        self.assertEqual(cached_role_users('admin'), [])
+        self.assertEqual(set(cached_role_users('responder')[0]), set(ROLE_USER_FIELDS))
+        
+        self.client.login(username='responder', password='testpass123')
+        with self.assertNumQueries(0):
+            cached_role_users('responder')
+        
+        user.role = 'admin'
+        user.save()
+        self.assertEqual(cached_role_users('responder'), [])
+        self.assertEqual([row['id'] for row in cached_role_users('admin')], [user.id])
+
+
+class LocalRegistryTest(TestCase):
+    """Test cases for the in-process category and role registries."""
+    
+    def setUp(self):
+        """Start from empty caches."""
+        cache.clear()
+        clear_registries()
+    
+    def test_reads_are_local_until_invalidated(self):
+        """Test repeated reads skip the shared cache and signals refresh them."""
+        from accounts.cache import get_role_users
+        from incidents.cache import get_categories
+        from incidents.models import IncidentCategory
+        
+        admin = User.objects.create_user(username='admin', password='testpass123', role='admin')
+        IncidentCategory.objects.create(name='Fire', priority_level=5)
+        self.assertEqual([row['username'] for row in get_role_users('admin')], [admin.username])
+        self.assertEqual(len(get_categories()), 1)
+        
+        cache.clear()
+        with self.assertNumQueries(0):
+            get_role_users('admin')
+            get_categories()
+        
+        IncidentCategory.objects.create(name='Flood', priority_level=1)
+        self.assertEqual(len(get_categories()), 2)
+    
+    @override_settings(REGISTRY_TTL=0)
+    def test_ttl_expiry(self):
+        """Test entries are reloaded once the TTL has passed."""
+        from accounts.cache import get_role_users
+        
+        User.objects.create_user(username='admin', password='testpass123', role='admin')
+        get_role_users('admin')
+        User.objects.filter(username='admin').update(role='reporter')
+        cache.clear()
+        self.assertEqual(get_role_users('admin'), [])
+    
+    def test_incident_creation_notifies_registered_admins(self):
+        """Test admins from the registry are notified about a new incident."""
+        from incidents.models import IncidentCategory
+        
+        admin = User.objects.create_user(username='admin', password='testpass123', role='admin')
+        reporter = User.objects.create_user(username='reporter', password='testpass123', role='reporter')
+        category = IncidentCategory.objects.create(name='Fire', priority_level=5)
+        client = APIClient()
+        client.force_authenticate(reporter)
+        response = client.post('/api/incidents/', {
+            'title': 'Test', 'description': 'Test', 'category': category.id,
+            'latitude': '40.7128', 'longitude': '-74.0060', 'location_address': 'Test Address',
+        })
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(Notification.objects.filter(recipient=admin).exists())
+
+
+class AsyncReadViewTest(TestCase):
+    """The async read endpoints must answer exactly like their DRF counterparts."""
+    
+    PAIRS = [
+        ('/api/incidents/', '/api/async/incidents/'),
+        ('/api/incidents/?status=reported&ordering=severity', '/api/async/incidents/?status=reported&ordering=severity'),
+        ('/api/incidents/?search=flood,street', '/api/async/incidents/?search=flood,street'),
+        ('/api/incidents/?page=2', '/api/async/incidents/?page=2'),
+        ('/api/incidents/?page=9', '/api/async/incidents/?page=9'),
+        ('/api/incidents/?status=bogus', '/api/async/incidents/?status=bogus'),
+        ('/api/incidents/?category=999', '/api/async/incidents/?category=999'),
+        ('/api/incidents/?page=last', '/api/async/incidents/?page=last'),
+        ('/api/incidents/{incident}/', '/api/async/incidents/{incident}/'),
+        ('/api/incidents/{incident}/?status=closed', '/api/async/incidents/{incident}/?status=closed'),
+        ('/api/incidents/nearby/?lat=40.7&lng=-74.0&radius=50', '/api/async/incidents/nearby/?lat=40.7&lng=-74.0&radius=50'),
+        ('/api/incidents/nearby/', '/api/async/incidents/nearby/'),
+        ('/api/notifications/unread_count/', '/api/async/notifications/unread_count/'),
+        ('/api/dashboard/stats/', '/api/async/dashboard/stats/'),
+    ]
+    
+    def setUp(self):
+        """Set up one user per role and enough incidents for two pages."""
+        from incidents.models import Incident, IncidentCategory
+        
+        cache.clear()
+        self.admin = User.objects.create_user(username='admin', password='testpass123', role='admin')
+        self.reporter = User.objects.create_user(username='reporter', password='testpass123', role='reporter')
+        self.responder = User.objects.create_user(username='responder', password='testpass123', role='responder')
+        category = IncidentCategory.objects.create(name='Flood', priority_level=4)
+        self.incidents = [
+            Incident.objects.create(
+                incident_id=f'INC-TEST-{i}',
+                title=f'Flood {i}',
+                description='Water on the street',
+                category=category,
+                reporter=self.reporter,
+                severity=('low', 'high')[i % 2],
+                status=('reported', 'in_progress')[i % 3 == 0],
+                latitude=40.7 + i / 100,
+                longitude=-74.0,
+                location_address=f'{i} Main Street'
+            )
+            for i in range(25)
+        ]
+        ResponseTeam.objects.create(incident=self.incidents[0], responder=self.responder, assigned_by=self.admin)
+        Notification.objects.create(
+            recipient=self.reporter, incident=self.incidents[0], notification_type='status_update',
+            title='Update', message='Status changed'
+        )
+    
+    def get(self, url, user):
+        """GET `url` with a bearer token for `user`."""
+        return self.client.get(url, HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+    
+    def test_responses_match_sync_views(self):
+        """Test every async endpoint returns the sync endpoint's status and body for every role."""
+        for user in (self.admin, self.responder, self.reporter):
+            for sync_url, async_url in self.PAIRS:
+                sync_url, async_url = (
+                    url.format(incident=self.incidents[0].id) for url in (sync_url, async_url)
+                )
+                with self.subTest(role=user.role, url=async_url):
+                    expected = self.get(sync_url, user)
+                    response = self.get(async_url, user)
+                    self.assertEqual(response.status_code, expected.status_code)
+                    # Pagination links point at the endpoint that was called
+                    body = response.content.decode().replace('/api/async/', '/api/')
+                    self.assertEqual(json.loads(body), expected.json())
+    
+    def test_hidden_incident_not_found(self):
+        """Test incidents outside the user's scope are 404s."""
+        response = self.get(f'/api/async/incidents/{self.incidents[1].id}/', self.responder)
+        self.assertEqual(response.status_code, 404)
+    
+    def test_authentication_required(self):
+        """Test missing and invalid tokens are rejected like JWTAuthentication does."""
+        response = self.client.get('/api/async/incidents/')
+        self.assertEqual(response.status_code, 401)
+        self.assertIn('WWW-Authenticate', response)
+        response = self.client.get('/api/async/incidents/', HTTP_AUTHORIZATION='Bearer not-a-token')
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()['code'], 'token_not_valid')
+        
+        token = AccessToken.for_user(self.admin)
+        response = self.client.post('/api/async/incidents/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertEqual(response.status_code, 405)
+    
+    async def test_async_stack_records_metrics(self):
+        """Test async requests are served natively and their queries are counted."""
+        request_metrics.reset()
+        # The test database connection predates the middleware, which hooks
+        # connections as they open; under ASGI that is every request thread's
+        await sync_to_async(install_query_hook)(connection)
+        token = AccessToken.for_user(self.admin)
+        response = await AsyncClient().get('/api/async/incidents/', headers={'Authorization': f'Bearer {token}'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['count'], 25)
+        
+        body = render_metrics()
+        self.assertIn('qrcs_requests_total{view="async-incident-list",method="GET",status="200"} 1', body)
+        # User lookup, count and page: three queries
+        self.assertIn('qrcs_request_db_queries_bucket{view="async-incident-list",method="GET",le="2"} 0', body)
+        self.assertIn('qrcs_request_db_queries_bucket{view="async-incident-list",method="GET",le="5"} 1', body)
+
+
+class ReplicaRouterTest(SimpleTestCase):
+    """Test cases for read-replica routing decisions."""
+    
+    def setUp(self):
+        """Set up a router."""
+        self.router = ReplicaRouter()
+    
+    @override_settings(DATABASE_REPLICAS=['replica'])
+    def test_reads_use_replicas_only_in_scope(self):
+        """Test reads leave the primary only in a replica scope, until it writes."""
+        from incidents.models import Incident
+        
+        self.assertIsNone(self.router.db_for_read(Incident))
+        with replica_reads():
+            self.assertEqual(self.router.db_for_read(Incident), 'replica')
+            self.assertIsNone(self.router.db_for_read(Incident, instance=Incident()))
+            with primary_reads():
+                self.assertIsNone(self.router.db_for_read(Incident))
+            self.assertEqual(self.router.db_for_write(Incident), 'default')
+            self.assertIsNone(self.router.db_for_read(Incident))
+    
+    def test_views_opt_in(self):
+        """Test API viewsets, analytics and async views use replicas; others do not."""
+        from django.urls import resolve
+        
+        for path, expected in [
+            ('/api/incidents/', True),
+            ('/api/incidents/1/', True),
+            ('/api/dashboard/stats/', True),
+            ('/api/async/incidents/', True),
+            ('/', False),
+            ('/api/auth/login/', False),
+        ]:
+            with self.subTest(path=path):
+                self.assertEqual(reads_from_replica(resolve(path).func), expected)
+    
+    def test_request_state(self):
+        """Test only safe methods to opted-in views qualify, decided once the URL resolves."""
+        from django.urls import resolve
+        
+        request = RequestFactory().get('/api/incidents/')
+        state = RoutingState(request)
+        self.assertFalse(state.use_replicas())
+        request.resolver_match = resolve('/api/incidents/')
+        self.assertTrue(state.use_replicas())
+        
+        request = RequestFactory().post('/api/incidents/')
+        request.resolver_match = resolve('/api/incidents/')
+        self.assertFalse(RoutingState(request).use_replicas())
+        self.assertFalse(RoutingState(request, pinned=True).use_replicas())
+
+
+@skipUnless('replica' in settings.DATABASES, 'run with --settings=qrcs_project.settings_replica_test')
+class ReplicaRoutingTest(TestCase):
+    """
+    End-to-end routing against two SQLite databases.
+    
+    The stand-in replica is never written to, so reads routed there do not
+    see rows created on the primary.
+    """
+    
+    # The runner collects databases from skipped classes too
+    databases = {'default', 'replica'} if 'replica' in settings.DATABASES else {'default'}
+    
+    def setUp(self):
+        """Set up an admin, a category and one incident on the primary only."""
+        from incidents.models import Incident, IncidentCategory
+        
+        cache.clear()
+        clear_registries()
+        self.admin = User.objects.create_user(username='admin', password='testpass123', role='admin')
+        self.category = IncidentCategory.objects.create(name='Fire', priority_level=5)
+        self.incident = Incident.objects.create(
+            incident_id='INC-TEST-1',
+            title='Test Incident',
+            description='Test Description',
+            category=self.category,
+            reporter=self.admin,
+            latitude=40.7128,
+            longitude=-74.0060,
+            location_address='Test Address'
+        )
+        self.api = APIClient()
+        self.api.force_authenticate(self.admin)
+    
+    def test_read_only_api_and_analytics_use_replica(self):
+        """Test list and dashboard reads come from the replica."""
+        self.assertEqual(self.api.get('/api/incidents/').json()['count'], 0)
+        stats = self.api.get('/api/dashboard/stats/').json()
+        self.assertEqual(stats['overview']['total_incidents'], 0)
+    
+    def test_async_views_use_replica(self):
+        """Test async read views, including their user lookup, use the replica."""
+        self.admin.save(using='replica', force_insert=True)
+        response = self.client.get(
+            '/api/async/incidents/', HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.admin)}'
+        )
+        self.assertEqual(response.json()['count'], 0)
+    
+    def test_other_views_use_primary(self):
+        """Test views that did not opt in read from the primary."""
+        self.client.force_login(self.admin)
+        self.assertEqual(self.client.get(f'/incident/{self.incident.id}/').status_code, 200)
+    
+    def test_write_pins_client_to_primary(self):
+        """Test a client that wrote reads its own writes until the pin cookie expires."""
+        response = self.api.post('/api/incidents/', {
+            'title': 'Test', 'description': 'Test', 'category': self.category.id,
+            'latitude': '40.7128', 'longitude': '-74.0060', 'location_address': 'Test Address',
+        })
+        self.assertEqual(response.status_code, 201)
+        self.assertIn(PIN_COOKIE, response.cookies)
+        self.assertEqual(self.api.get('/api/incidents/').json()['count'], 2)
+        
+        self.api.cookies.clear()
+        self.assertEqual(self.api.get('/api/incidents/').json()['count'], 0)
+    
+    def test_write_pins_rest_of_scope(self):
+        """Test reads after a write in the same scope go to the primary."""
+        from incidents.models import Incident, IncidentCategory
+        
+        with replica_reads():
+            self.assertEqual(Incident.objects.count(), 0)
+            IncidentCategory.objects.create(name='Flood', priority_level=1)
+            self.assertEqual(Incident.objects.count(), 1)
+
+
+class SQLiteBackendTest(SimpleTestCase):
+    """Test cases for the tuned SQLite backend, on throwaway database files."""
+    
+    def setUp(self):
+        """Create a temporary directory and a handler for its databases."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'test.sqlite3')
+        self.connections = ConnectionHandler({'default': sqlite_database(self.path)})
+        self.addCleanup(self.connections.close_all)
+    
+    def test_pragmas_applied(self):
+        """Test new connections use WAL and the configured pragmas."""
+        with self.connections['default'].cursor() as cursor:
+            for pragma, expected in [
+                ('journal_mode', 'wal'), ('synchronous', 1),
+                ('busy_timeout', settings.SQLITE_BUSY_TIMEOUT), ('cache_size', -settings.SQLITE_CACHE_SIZE),
+            ]:
+                cursor.execute(f'PRAGMA {pragma}')
+                self.assertEqual(cursor.fetchone()[0], expected, pragma)
+    
+    def test_transactions_take_write_lock(self):
+        """Test atomic blocks begin with BEGIN IMMEDIATE."""
+        wrapper = self.connections['default']
+        wrapper.ensure_connection()
+        with CaptureQueriesContext(wrapper) as queries:
+            # What transaction.atomic() calls on SQLite
+            wrapper._start_transaction_under_autocommit()
+        self.assertTrue(wrapper.connection.in_transaction)
+        wrapper.connection.rollback()
+        self.assertEqual(queries[0]['sql'], 'BEGIN IMMEDIATE')
+    
+    def test_autocommit_write_retries_on_lock(self):
+        """Test an autocommit write waits out a lock held past its busy timeout."""
+        config = sqlite_database(self.path)
+        config['OPTIONS'].update(timeout=0, lock_retries=8)
+        config['OPTIONS']['pragmas']['busy_timeout'] = 0
+        handler = ConnectionHandler({'default': sqlite_database(self.path), 'impatient': config})
+        with self.connections['default'].cursor() as cursor:
+            cursor.execute('CREATE TABLE events (id INTEGER PRIMARY KEY)')
+        
+        errors = []
+        
+        def write():
+            try:
+                with handler['impatient'].cursor() as cursor:
+                    cursor.execute('INSERT INTO events DEFAULT VALUES')
+            except OperationalError as e:
+                errors.append(e)
+            finally:
+                handler['impatient'].close()
+        
+        holder = self.connections['default'].connection
+        holder.execute('BEGIN IMMEDIATE')
+        thread = threading.Thread(target=write)
+        thread.start()
+        time.sleep(0.05)
+        holder.execute('COMMIT')
+        thread.join()
+        
+        self.assertEqual(errors, [])
+        self.assertEqual(holder.execute('SELECT COUNT(*) FROM events').fetchone()[0], 1)
+
+
+class JSONRenderingTest(SimpleTestCase):
+    """Test cases for the orjson-backed renderer and parser."""
+    
+    payload = {
+        'count': 2,
+        'results': [
+            {
+                'id': 1, 'title': 'Flood on Main St – مرحبا',
+                'latitude': Decimal('40.712800'), 'longitude': '-74.006000',
+                'created_at': datetime(2024, 1, 5, 9, 30, 15, 123456, tzinfo=dt_timezone.utc),
+                'date': date(2024, 1, 5), 'token': UUID('12345678-1234-5678-1234-567812345678'),
+                'tags': ('a', 'b'), 'note': 'line\u2028break', 'status': gettext_lazy('Reported'),
+                'score': 1.5, 'flag': None,
+            },
+            {'id': 2, 'by_hour': {0: 3, 23: 1}, 'huge': 2 ** 70},
+        ],
+    }
+    
+    def test_output_matches_drf(self):
+        """Test rendering of API payloads is byte-identical to DRF's stdlib renderer."""
+        for data in [self.payload, self.payload['results'][0], [], {}]:
+            with self.subTest(data=data):
+                self.assertEqual(JSONRenderer().render(data), renderers.JSONRenderer().render(data))
+        # Spelled differently by orjson, but parses to the same value
+        self.assertEqual(json.loads(JSONRenderer().render({'v': 0.00001})), {'v': 0.00001})
+    
+    @skipUnless(orjson, 'orjson is not installed')
+    def test_renders_with_orjson(self):
+        """Test orjson renders payloads it supports."""
+        with patch.object(orjson, 'dumps', wraps=orjson.dumps) as dumps:
+            JSONRenderer().render(self.payload['results'][0])
+        dumps.assert_called_once()
+    
+    def test_falls_back_without_orjson(self):
+        """Test indented output and a missing orjson use DRF's renderer."""
+        expected = renderers.JSONRenderer().render(self.payload, 'application/json; indent=4')
+        self.assertEqual(JSONRenderer().render(self.payload, 'application/json; indent=4'), expected)
+        with patch('qrcs_project.renderers.orjson', None):
+            self.assertEqual(JSONRenderer().render(self.payload), renderers.JSONRenderer().render(self.payload))
+    
+    def test_parser(self):
+        """Test parsing matches DRF, including its rejection of invalid bodies."""
+        body = renderers.JSONRenderer().render(self.payload)
+        self.assertEqual(JSONParser().parse(BytesIO(body)), json.loads(body))
+        # Wider than 64 bits: kept exact rather than turned into a float
+        wide = JSONParser().parse(BytesIO(b'{"id": 123456789012345678901234567890}'))
+        self.assertEqual(wide, {'id': 123456789012345678901234567890})
+        self.assertIsInstance(wide['id'], int)
+        for invalid in [b'{"a": ', b'{"a": NaN}', b'\xff']:
+            with self.subTest(body=invalid), self.assertRaises(ParseError):
+                JSONParser().parse(BytesIO(invalid))
+        with patch('qrcs_project.renderers.orjson', None), patch('qrcs_project.parsers.orjson', None):
+            self.assertEqual(JSONParser().parse(BytesIO(body)), json.loads(body))
+    
+    def test_api_uses_renderer_and_parser(self):
+        """Test the API is configured with the orjson classes."""
+        from rest_framework.settings import api_settings
+        
+        self.assertIs(api_settings.DEFAULT_RENDERER_CLASSES[0], JSONRenderer)
+        self.assertIs(api_settings.DEFAULT_PARSER_CLASSES[0], JSONParser)
+
+
+class CompressionTest(TestCase):
+    """Test cases for response compression and precompressed static files."""
+    
+    def setUp(self):
+        """Set up an admin with enough incidents for a list page worth compressing."""
+        from incidents.models import Incident, IncidentCategory
+        
+        self.admin = User.objects.create_user(username='admin', password='testpass123', role='admin')
+        category = IncidentCategory.objects.create(name='Fire', priority_level=5)
+        Incident.objects.bulk_create([
+            Incident(
+                incident_id=f'INC-TEST-{i}', title=f'Test Incident {i}', description='Test Description',
+                category=category, reporter=self.admin, latitude=40.7128, longitude=-74.0060,
+                location_address='Test Address'
+            )
+            for i in range(20)
+        ])
+        self.api = APIClient()
+        self.api.force_authenticate(self.admin)
+    
+    def get(self, path, accept_encoding, content_type='application/json', **response_kwargs):
+        """Run CompressionMiddleware over a canned response."""
+        content = response_kwargs.pop('content', b'{"incidents": "%s"}' % (b'x' * 4000))
+        response = HttpResponse(content, content_type=content_type, **response_kwargs)
+        request = RequestFactory().get(path, HTTP_ACCEPT_ENCODING=accept_encoding)
+        return CompressionMiddleware(lambda request: response)(request)
+    
+    def test_negotiation(self):
+        """Test the client's preferred coding is chosen, ties going to brotli."""
+        for header, expected in [
+            ('gzip, deflate, br', 'br'), ('gzip;q=1.0, br;q=0.5', 'gzip'), ('br;q=0, gzip', 'gzip'),
+            ('*', 'br'), ('*;q=0.1, br;q=0', 'gzip'), ('deflate', None), ('identity', None), ('', None),
+            ('gzip;q=bogus, br;q=0.3', 'br'),
+        ]:
+            with self.subTest(header=header):
+                self.assertEqual(negotiate(header, ['br', 'gzip']), expected)
+        self.assertEqual(negotiate('br, gzip', ['gzip']), 'gzip')
+    
+    def test_api_list_is_compressed(self):
+        """Test an API page is gzipped for clients that accept it, and unchanged otherwise."""
+        plain = self.api.get('/api/incidents/')
+        self.assertFalse(plain.has_header('Content-Encoding'))
+        self.assertIn('Accept-Encoding', plain['Vary'])
+        
+        response = self.api.get('/api/incidents/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+        self.assertLess(len(response.content), len(plain.content) / 4)
+        self.assertEqual(json.loads(gzip.decompress(response.content)), plain.json())
+    
+    async def test_async_views_are_compressed(self):
+        """Test responses from the async stack are compressed too."""
+        response = await AsyncClient().get('/api/async/incidents/', headers={
+            'Authorization': f'Bearer {AccessToken.for_user(self.admin)}', 'Accept-Encoding': 'gzip',
+        })
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(json.loads(gzip.decompress(response.content))['count'], 20)
+    
+    def test_skips_small_encoded_and_binary_responses(self):
+        """Test responses that would not benefit are left alone."""
+        self.assertFalse(self.get('/', 'gzip', content=b'{}').has_header('Content-Encoding'))
+        self.assertFalse(self.get('/', 'gzip', content_type='image/png').has_header('Content-Encoding'))
+        self.assertEqual(self.get('/', 'gzip', headers={'Content-Encoding': 'br'})['Content-Encoding'], 'br')
+        self.assertEqual(self.get('/', 'gzip', content_type='image/svg+xml')['Content-Encoding'], 'gzip')
+        random_bytes = os.urandom(4096)
+        self.assertFalse(self.get('/', 'gzip', content=random_bytes).has_header('Content-Encoding'))
+    
+    def test_weakens_etag(self):
+        """Test a strong ETag is weakened, since the bytes sent differ."""
+        response = self.get('/', 'gzip', headers={'ETag': '"abc"'})
+        self.assertEqual(response['ETag'], 'W/"abc"')
+    
+    @skipUnless(brotli, 'Brotli is not installed')
+    def test_brotli(self):
+        """Test brotli is used for JSON but not for HTML, which gets BREACH-padded gzip."""
+        response = self.get('/', 'gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(self.get('/', 'gzip, br', content_type='text/html')['Content-Encoding'], 'gzip')
+    
+    def test_precompressed_static_files(self):
+        """Test collectstatic writes hashed files with compressed versions of text files."""
+        with tempfile.TemporaryDirectory() as source, tempfile.TemporaryDirectory() as root:
+            css = b'.incident { color: red; }\n' * 200
+            with open(os.path.join(source, 'app.css'), 'wb') as f:
+                f.write(css)
+            with open(os.path.join(source, 'logo.png'), 'wb') as f:
+                f.write(os.urandom(2048))
+            with override_settings(
+                STATIC_ROOT=root, STATICFILES_DIRS=[source],
+                STATICFILES_FINDERS=['django.contrib.staticfiles.finders.FileSystemFinder'],
+                STORAGES={**settings.STORAGES, 'staticfiles': {
+                    'BACKEND': 'qrcs_project.storage.CompressedManifestStaticFilesStorage',
+                }},
+            ):
+                call_command('collectstatic', interactive=False, verbosity=0)
+                css_name = staticfiles_storage.stored_name('app.css')
+                png_name = staticfiles_storage.stored_name('logo.png')
+            
+            self.assertNotEqual(css_name, 'app.css')
+            for coding in ENCODINGS:
+                with self.subTest(coding=coding):
+                    with open(os.path.join(root, css_name + SUFFIXES[coding]), 'rb') as f:
+                        compressed = f.read()
+                    decompress = brotli.decompress if coding == 'br' else gzip.decompress
+                    self.assertEqual(decompress(compressed), css)
+                    self.assertFalse(os.path.exists(os.path.join(root, png_name + SUFFIXES[coding])))
+    
+    @override_settings(DEBUG=True)
+    def test_no_middleware_is_adapted(self):
+        """Test every middleware runs natively under ASGI, so requests stay off threads."""
+        with self.assertLogs('django.request', level='DEBUG') as logs:
+            logging.getLogger('django.request').debug('Loading middleware')
+            ASGIHandler().load_middleware(is_async=True)
+        self.assertEqual([line for line in logs.output if 'adapted' in line], [])
+
+
+class AsyncWhiteNoiseMiddlewareTest(SimpleTestCase):
+    """Test cases for serving collected static files through WhiteNoise."""
+    
+    def setUp(self):
+        """Set up a STATIC_ROOT with a large hashed CSS file and its gzip version."""
+        self.root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.root.cleanup)
+        self.css = b'.incident { color: red; }\n' * 40000
+        os.makedirs(os.path.join(self.root.name, 'css'))
+        name = os.path.join(self.root.name, 'css', 'app.0123456789ab.css')
+        with open(name, 'wb') as f:
+            f.write(self.css)
+        with open(name + '.gz', 'wb') as f:
+            f.write(gzip.compress(self.css))
+        self.path = '/static/css/app.0123456789ab.css'
+        self.factory = RequestFactory()
+        self.passed = []
+    
+    def middleware(self, get_response):
+        """Build the middleware over the test STATIC_ROOT."""
+        with override_settings(STATIC_ROOT=self.root.name, STATIC_URL='/static/', DEBUG=False):
+            return AsyncWhiteNoiseMiddleware(get_response)
+    
+    def get_response(self, request):
+        """Stand-in for the rest of a sync middleware chain."""
+        self.passed.append(request.path)
+        return HttpResponse('from django')
+    
+    async def aget_response(self, request):
+        """Stand-in for the rest of an async middleware chain."""
+        return self.get_response(request)
+    
+    @staticmethod
+    def content(response):
+        """Read a streamed file response."""
+        try:
+            return b''.join(response.streaming_content)
+        finally:
+            response.close()
+    
+    async def test_serves_files_under_asgi(self):
+        """Test files are streamed, precompressed versions negotiated and ranges honoured."""
+        middleware = self.middleware(self.aget_response)
+        
+        response = await middleware(self.factory.get(self.path, HTTP_ACCEPT_ENCODING='gzip'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(gzip.decompress(self.content(response)), self.css)
+        
+        response = await middleware(self.factory.get(self.path, HTTP_RANGE='bytes=100-199'))
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(self.content(response), self.css[100:200])
+        
+        response = await middleware(self.factory.get('/api/incidents/'))
+        self.assertEqual(response.content, b'from django')
+        self.assertEqual(self.passed, ['/api/incidents/'])
+    
+    def test_serves_files_under_wsgi(self):
+        """Test the same middleware serves files in a sync chain."""
+        middleware = self.middleware(self.get_response)
+        
+        response = middleware(self.factory.get(self.path))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.content(response), self.css)
+        
+        response = middleware(self.factory.get('/static/css/missing.css'))
+        self.assertEqual(response.content, b'from django')
+        self.assertEqual(self.passed, ['/static/css/missing.css'])
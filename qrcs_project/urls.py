@@ -5,10 +5,12 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from .metrics import metrics_view
 
 urlpatterns = [
     path('', include('frontend.urls')),
     path('admin/', admin.site.urls),
+    path(settings.METRICS_PATH.lstrip('/'), metrics_view, name='metrics'),
 ]
 
 # Add REST Framework URLs if available
@@ -29,6 +31,19 @@ try:
         path('api/', include(router.urls)),
     ]
     
+    # Native async versions of the hottest read endpoints, with the same responses
+    from incidents.async_views import incident_detail, incident_list, incidents_nearby
+    from notifications.async_views import unread_count
+    from dashboard.async_views import dashboard_stats
+    
+    urlpatterns += [
+        path('api/async/incidents/', incident_list, name='async-incident-list'),
+        path('api/async/incidents/nearby/', incidents_nearby, name='async-incident-nearby'),
+        path('api/async/incidents/<int:pk>/', incident_detail, name='async-incident-detail'),
+        path('api/async/notifications/unread_count/', unread_count, name='async-notification-unread-count'),
+        path('api/async/dashboard/stats/', dashboard_stats, name='async-dashboard-stats'),
+    ]
+    
     # Add JWT authentication if available
     try:
         from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
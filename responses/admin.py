@@ -4,10 +4,17 @@ Admin configuration for responses app.
 from django.contrib import admin
 from django import forms
 from .models import ResponseTeam, ResponseLog
+from accounts.cache import get_role_users
 from accounts.models import User
 from incidents.models import Incident
 
 
+def role_choices(role):
+    """Select options for active users with `role`, led by the empty choice."""
+    label = dict(User.ROLE_CHOICES)[role]
+    return [('', '---------')] + [(user['id'], f"{user['username']} ({label})") for user in get_role_users(role)]
+
+
 class ResponseTeamAdminForm(forms.ModelForm):
     """Custom form for ResponseTeam with filtered fields."""
     class Meta:
@@ -16,17 +23,10 @@ class ResponseTeamAdminForm(forms.ModelForm):
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        # Filter responder field to only show users with role='responder'
-        self.fields['responder'].queryset = User.objects.filter(
-            role='responder',
-            is_active=True
-        ).order_by('username')
-        
-        # Filter assigned_by field to only show users with role='admin' (Administrator)
-        self.fields['assigned_by'].queryset = User.objects.filter(
-            role='admin',
-            is_active=True
-        ).order_by('username')
+        # Render responder and assigned_by options from the role registry; the
+        # field querysets (set in formfield_for_foreignkey) still validate input
+        self.fields['responder'].choices = role_choices('responder')
+        self.fields['assigned_by'].choices = role_choices('admin')
         
         # Filter incident field to only show incidents with status='reported'
         self.fields['incident'].queryset = Incident.objects.filter(
@@ -0,0 +1,19 @@
+"""
+Management command to rebuild responder workloads from the assignments table.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from responses.workload import rebuild_workloads
+
+
+class Command(BaseCommand):
+    help = 'Rebuild every responder workload row from assignments and incident statuses'
+    
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        rows = rebuild_workloads()
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {rows} responder workloads in {time.monotonic() - started:.2f}s'
+        ))
@@ -0,0 +1,51 @@
+# Generated by Django 5.0.1 on 2026-10-19 12:26
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max, Q
+
+
+ACTIVE_STATUSES = ['reported', 'assigned', 'in_progress']
+
+
+def backfill_workloads(apps, schema_editor):
+    ResponseTeam = apps.get_model('responses', 'ResponseTeam')
+    ResponderWorkload = apps.get_model('responses', 'ResponderWorkload')
+    rows = (
+        ResponseTeam.objects.values('responder_id')
+        .annotate(
+            active_count=Count('id', filter=Q(incident__status__in=ACTIVE_STATUSES)),
+            total_count=Count('id'),
+            last_assigned_at=Max('assigned_at'),
+        )
+        .order_by()
+    )
+    ResponderWorkload.objects.bulk_create([ResponderWorkload(**row) for row in rows], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('responses', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResponderWorkload',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('active_count', models.IntegerField(default=0)),
+                ('total_count', models.IntegerField(default=0)),
+                ('last_assigned_at', models.DateTimeField(blank=True, null=True)),
+                ('responder', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='workload', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'responder_workloads',
+                'ordering': ['-last_assigned_at'],
+                'indexes': [models.Index(fields=['-last_assigned_at'], name='responder_w_last_as_7a3745_idx'), models.Index(fields=['active_count'], name='responder_w_active__c5013c_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_workloads, migrations.RunPython.noop),
+    ]
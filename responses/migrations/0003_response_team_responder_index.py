@@ -0,0 +1,20 @@
+# Generated by Django 5.0.1 on 2026-10-19 12:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('incidents', '0001_initial'),
+        ('responses', '0002_responder_workload'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='responseteam',
+            index=models.Index(fields=['responder', 'incident'], name='response_te_respond_b45eb0_idx'),
+        ),
+    ]
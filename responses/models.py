@@ -29,6 +29,7 @@ class ResponseTeam(models.Model):
         ordering = ['-assigned_at']
         indexes = [
             models.Index(fields=['incident', 'responder']),
+            models.Index(fields=['responder', 'incident']),
         ]
     
     def __str__(self):
@@ -59,3 +60,28 @@ class ResponseLog(models.Model):
         return f"{self.action} - {self.incident.incident_id}"
 
 
+
+
+class ResponderWorkload(models.Model):
+    """
+    Maintained per-responder assignment counts.
+    
+    Kept in step by signals on ResponseTeam create/delete and incident status
+    changes, so listings and dispatch can read and paginate a small table
+    instead of aggregating every historical assignment.
+    """
+    responder = models.OneToOneField(User, on_delete=models.CASCADE, related_name='workload')
+    active_count = models.IntegerField(default=0)
+    total_count = models.IntegerField(default=0)
+    last_assigned_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'responder_workloads'
+        ordering = ['-last_assigned_at']
+        indexes = [
+            models.Index(fields=['-last_assigned_at']),
+            models.Index(fields=['active_count']),
+        ]
+    
+    def __str__(self):
+        return f"{self.responder_id}: {self.active_count} active / {self.total_count} total"
@@ -1,9 +1,11 @@
 """
 Signals for responses app.
 """
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
+from incidents.models import Incident
 from .models import ResponseTeam
+from .workload import adjust_incident_workloads, adjust_workload, refresh_last_assigned
 
 
 @receiver(post_save, sender=ResponseTeam)
@@ -36,3 +38,39 @@ def handle_response_team_assignment(sender, instance, created, **kwargs):
             # Log error but don't fail the assignment
             print(f"Error creating notification for assignment: {e}")
 
+
+
+@receiver(post_save, sender=ResponseTeam)
+def add_assignment_to_workload(sender, instance, created, raw=False, **kwargs):
+    """Count a new assignment in the responder's workload."""
+    if not created or raw:
+        return
+    active = Incident.objects.filter(
+        pk=instance.incident_id, status__in=Incident.ACTIVE_STATUSES
+    ).exists()
+    adjust_workload(instance.responder_id, active=int(active), total=1, assigned_at=instance.assigned_at)
+
+
+@receiver(post_delete, sender=ResponseTeam)
+def remove_assignment_from_workload(sender, instance, **kwargs):
+    """Remove a deleted assignment from the responder's workload."""
+    active = Incident.objects.filter(
+        pk=instance.incident_id, status__in=Incident.ACTIVE_STATUSES
+    ).exists()
+    adjust_workload(instance.responder_id, active=-int(active), total=-1)
+    refresh_last_assigned(instance.responder_id, instance.assigned_at)
+
+
+@receiver(post_save, sender=Incident)
+def update_workloads_on_status_change(sender, instance, created, raw=False, **kwargs):
+    """Move assigned responders in or out of their active counts when an incident opens or closes."""
+    if raw:
+        return
+    # Stored values before this save, set by incidents.signals
+    previous = getattr(instance, '_previous_values', None)
+    if created or previous is None:
+        return
+    was_active = previous['status'] in Incident.ACTIVE_STATUSES
+    is_active = instance.status in Incident.ACTIVE_STATUSES
+    if was_active != is_active:
+        adjust_incident_workloads(instance.pk, 1 if is_active else -1)
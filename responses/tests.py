@@ -1,10 +1,14 @@
 """
 Tests for responses app.
 """
+from io import StringIO
+
+from django.core.management import call_command
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 from incidents.models import Incident, IncidentCategory
-from .models import ResponseTeam, ResponseLog
+from .models import ResponderWorkload, ResponseTeam, ResponseLog
+from .workload import rebuild_workloads
 
 User = get_user_model()
 
@@ -61,3 +65,94 @@ class ResponseModelTest(TestCase):
         self.assertEqual(log.action, 'Arrived at scene')
 
 
+
+
+class ResponderWorkloadTest(TestCase):
+    """Test cases for maintained responder workloads."""
+    
+    def setUp(self):
+        """Set up a responder assigned to two incidents."""
+        self.admin = User.objects.create_user(username='admin', password='testpass123', role='admin')
+        self.responder = User.objects.create_user(username='responder', password='testpass123', role='responder')
+        self.category = IncidentCategory.objects.create(name='Fire', priority_level=5)
+        self.incidents = [
+            Incident.objects.create(
+                incident_id=f'INC-TEST-{i}',
+                title=f'Test Incident {i}',
+                description='Test Description',
+                category=self.category,
+                reporter=self.admin,
+                latitude=40.7128,
+                longitude=-74.0060,
+                location_address='Test Address'
+            )
+            for i in range(2)
+        ]
+        self.teams = [
+            ResponseTeam.objects.create(incident=incident, responder=self.responder, assigned_by=self.admin)
+            for incident in self.incidents
+        ]
+    
+    def workload(self):
+        """Return the responder's (active_count, total_count)."""
+        workload = ResponderWorkload.objects.get(responder=self.responder)
+        return workload.active_count, workload.total_count
+    
+    def test_assignment_and_status_changes(self):
+        """Test counts follow assignment create/delete and incident status."""
+        self.assertEqual(self.workload(), (2, 2))
+        
+        incident = Incident.objects.get(pk=self.incidents[0].pk)
+        incident.status = 'resolved'
+        incident.save()
+        self.assertEqual(self.workload(), (1, 2))
+        
+        # Saving again without a status transition changes nothing
+        incident.save()
+        self.assertEqual(self.workload(), (1, 2))
+        
+        incident = Incident.objects.only('id').get(pk=self.incidents[0].pk)
+        incident.status = 'in_progress'
+        incident.save()
+        self.assertEqual(self.workload(), (2, 2))
+        
+        self.teams[1].delete()
+        self.assertEqual(self.workload(), (1, 1))
+        self.incidents[0].delete()
+        self.assertEqual(self.workload(), (0, 0))
+    
+    def test_rebuild_matches_incremental(self):
+        """Test a rebuild produces the same counts."""
+        self.incidents[1].status = 'closed'
+        self.incidents[1].save()
+        incremental = self.workload()
+        rebuild_workloads()
+        self.assertEqual(self.workload(), incremental)
+    
+    def test_deleting_latest_assignment_moves_last_assigned_back(self):
+        """Test last_assigned_at falls back to the latest remaining assignment."""
+        self.teams[1].delete()
+        workload = ResponderWorkload.objects.get(responder=self.responder)
+        self.assertEqual(workload.last_assigned_at, self.teams[0].assigned_at)
+        
+        self.teams[0].delete()
+        workload.refresh_from_db()
+        self.assertIsNone(workload.last_assigned_at)
+    
+    def test_rebuild_command(self):
+        """Test the rebuild_workloads command restores drifted rows."""
+        ResponderWorkload.objects.filter(responder=self.responder).update(active_count=9, total_count=9)
+        out = StringIO()
+        call_command('rebuild_workloads', stdout=out)
+        self.assertIn('Rebuilt 1 responder workloads', out.getvalue())
+        self.assertEqual(self.workload(), (2, 2))
+    
+    def test_team_list(self):
+        """Test the team listing reads workloads and links the latest assignment."""
+        self.client.force_login(self.admin)
+        response = self.client.get('/teams/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['total_teams'], 1)
+        workload = response.context['teams'][0]
+        self.assertEqual(workload.total_count, 2)
+        self.assertEqual(workload.latest_team_id, self.teams[1].id)
@@ -20,6 +20,7 @@ class ResponseTeamViewSet(viewsets.ModelViewSet):
     queryset = ResponseTeam.objects.all()
     serializer_class = ResponseTeamSerializer
     permission_classes = [IsAuthenticated]
+    read_replica = True
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['incident', 'responder', 'is_lead']
     search_fields = ['incident__incident_id', 'incident__title', 'responder__username']
@@ -29,7 +30,9 @@ class ResponseTeamViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """Filter queryset based on user role."""
         user = self.request.user
-        queryset = ResponseTeam.objects.select_related('incident', 'responder', 'assigned_by').all()
+        queryset = ResponseTeam.objects.select_related(
+            'incident', 'incident__category', 'incident__reporter', 'responder', 'assigned_by'
+        ).all()
         
         if user.role == 'admin':
             return queryset
@@ -91,6 +94,7 @@ class ResponseLogViewSet(viewsets.ModelViewSet):
     queryset = ResponseLog.objects.all()
     serializer_class = ResponseLogSerializer
     permission_classes = [IsAuthenticated]
+    read_replica = True
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['incident', 'responder']
     search_fields = ['action', 'details', 'incident__incident_id']
@@ -100,7 +104,9 @@ class ResponseLogViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """Filter queryset based on user role."""
         user = self.request.user
-        queryset = ResponseLog.objects.select_related('incident', 'responder').all()
+        queryset = ResponseLog.objects.select_related(
+            'incident', 'incident__category', 'incident__reporter', 'responder'
+        ).all()
         
         if user.role == 'admin':
             return queryset
@@ -128,6 +134,7 @@ class ResponseLogViewSet(viewsets.ModelViewSet):
                 incident=incident,
                 notification_type='status_update',
                 title='Response Update',
-                message=f'New update on incident {incident.incident_id}: {serializer.instance.action}'
+                message=f'New update on incident {incident.incident_id}: {serializer.instance.action}',
+                coalesce=True
             )
 
@@ -0,0 +1,68 @@
+"""
+Responder workload maintenance for responses app.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Max, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+from incidents.models import Incident
+from .models import ResponderWorkload, ResponseTeam
+
+
+def adjust_workload(responder_id, active=0, total=0, assigned_at=None):
+    """Apply count deltas to a responder's workload row, creating it if needed."""
+    updates = {'active_count': F('active_count') + active, 'total_count': F('total_count') + total}
+    if assigned_at is not None:
+        updates['last_assigned_at'] = Greatest(Coalesce(F('last_assigned_at'), assigned_at), assigned_at)
+    if ResponderWorkload.objects.filter(responder_id=responder_id).update(**updates) or total <= 0:
+        # Removals never create a row - the responder itself may be mid-delete
+        return
+    try:
+        with transaction.atomic():
+            ResponderWorkload.objects.create(
+                responder_id=responder_id,
+                active_count=active,
+                total_count=total,
+                last_assigned_at=assigned_at
+            )
+    except IntegrityError:
+        # Created concurrently - apply the delta to that row instead
+        ResponderWorkload.objects.filter(responder_id=responder_id).update(**updates)
+
+
+def refresh_last_assigned(responder_id, removed_at):
+    """Recompute last_assigned_at after an assignment made at `removed_at` is deleted."""
+    latest = (
+        ResponseTeam.objects.filter(responder_id=OuterRef('responder_id'))
+        .order_by().values('responder_id')
+        .annotate(latest=Max('assigned_at'))
+        .values('latest')
+    )
+    # Only the latest assignment's removal moves the timestamp back
+    ResponderWorkload.objects.filter(
+        responder_id=responder_id, last_assigned_at__lte=removed_at
+    ).update(last_assigned_at=Subquery(latest))
+
+
+def adjust_incident_workloads(incident_id, delta):
+    """Move every responder on an incident into or out of the active count."""
+    responder_ids = ResponseTeam.objects.filter(incident_id=incident_id).values('responder_id')
+    ResponderWorkload.objects.filter(responder_id__in=responder_ids).update(
+        active_count=F('active_count') + delta
+    )
+
+
+def rebuild_workloads():
+    """Recompute every responder's workload row from the assignments table; return the row count."""
+    rows = (
+        ResponseTeam.objects.values('responder_id')
+        .annotate(
+            active_count=Count('id', filter=Q(incident__status__in=Incident.ACTIVE_STATUSES)),
+            total_count=Count('id'),
+            last_assigned_at=Max('assigned_at'),
+        )
+        .order_by()
+    )
+    with transaction.atomic():
+        ResponderWorkload.objects.all().delete()
+        return len(ResponderWorkload.objects.bulk_create([ResponderWorkload(**row) for row in rows]))